@@ -7,7 +7,13 @@ YOLO_CONF_THRESH = 0.5
 LANE_DETECTION_CONFIG = {
     'canny_thresh1': 50,
     'canny_thresh2': 150,
-    'hough_thresh': 50
+    'hough_thresh': 50,
+    'band_width': 40,          # pixels searched around the previous fit once locked
+    'lock_confidence': 0.6,    # switch to band search at or above this confidence
+    'min_confidence': 0.3,     # fall back to full search below this confidence
+    'smoothing': 0.5,          # weight of the previous fit in the coefficient average
+    'xm_per_pix': 0.005,       # meters per pixel, tune for the camera mounting
+    'ym_per_pix': 0.02
 }
 
 # Safety
@@ -20,4 +26,137 @@ PRIORITIES = {
     'obstacle_avoidance': 2,
     'lane_keeping': 1,
     'waypoint_navigation': 0
-}
\ No newline at end of file
+}
+
+# Vision pipeline (capture -> inference -> visualization threads)
+VISION_PIPELINE_CONFIG = {
+    'enabled': True,
+    'inference_queue_size': 1,  # frames waiting for inference; 1 = always newest
+    'result_queue_size': 2
+}
+
+# Preallocated buffers for the per-frame hot loop (see edison/helpers/buffer_pool.py)
+BUFFER_POOL_CONFIG = {
+    'enabled': True,
+    'max_free': 8  # recycled frame buffers kept per shape
+}
+
+# Camera calibration written by scripts/generate_camera_config.py
+CAMERA_CONFIG_PATH = 'camera_config.npz'
+
+# Local model artifacts (export once with scripts/export_models.py)
+MODEL_CONFIG = {
+    'model_dir': 'models',
+    'yolo_input_size': 320,
+    'depth_input_size': 256,
+    'mmap_weights': True,
+    'warmup_runs': 2,
+    # 'fp32', 'int8_dynamic' or 'int8_static'; set back to 'fp32' if int8 accuracy regresses
+    'precision': {
+        'yolov5n': 'fp32',
+        'midas_small': 'fp32'
+    },
+    'quantized_engine': 'qnnpack'  # ARM kernels; use 'fbgemm' on x86
+}
+
+# Depth estimation scheduling
+DEPTH_CONFIG = {
+    'interval': 3,           # refresh MiDaS at least every N frames
+    'crop_to_boxes': True,   # only run MiDaS on the region around detections
+    'crop_margin': 0.2,      # fraction of the box union added on each side
+    'asynchronous': True,    # never block detection on a depth refresh
+    'unknown_distance': 1.0, # meters reported until depth covers an obstacle; inside the safe distance on purpose
+    'calibration_path': 'depth_calibration.npz'  # written by scripts/calibrate_depth.py
+}
+
+# Obstacle tracking between YOLO keyframes
+TRACKING_CONFIG = {
+    'min_interval': 1,         # run YOLO at least every N frames...
+    'max_interval': 6,         # ...and at most this many frames apart
+    'match_iou': 0.3,
+    'max_keyframe_misses': 2,  # drop a track after this many keyframes without a match
+    'motion_high': 0.5,        # box sizes per second; faster -> detect more often
+    'motion_low': 0.15
+}
+
+# Adaptive quality governor: steps down the levels (cheaper) when over budget or hot
+GOVERNOR_CONFIG = {
+    'enabled': True,
+    'target_latency_ms': 150,
+    # (processing scale, min frames between YOLO keyframes, frames between depth refreshes)
+    'levels': [
+        (1.0, 1, 3),
+        (0.75, 2, 4),
+        (0.5, 3, 6),
+        (0.5, 5, 10)
+    ],
+    'cpu_high': 90, 'cpu_low': 70,      # percent
+    'temp_high': 75, 'temp_low': 68,    # degrees C, the Pi starts throttling at 80
+    'window': 30,                       # frames per evaluation
+    'cooldown': 90                      # frames before stepping back up
+}
+
+# MJPEG stream served by edison/components/streaming_server/streamer.py
+STREAM_CONFIG = {
+    'default_variant': 'preview',  # served at /video_feed, every variant at /video_feed/<name>
+    'keepalive': 1.0,  # seconds without a new frame before a client is re-sent the last one
+    'max_clients': 4,  # further /video_feed requests get 503
+    'send_buffer_bytes': 131072,  # per-client socket send buffer, about two 640x360 JPEGs
+    # Draw overlays into the streamed frames; False streams plain frames and leaves drawing
+    # to clients of the /telemetry event stream
+    'burn_in_overlay': True,
+    'max_telemetry_clients': 8  # an attached BlackBoxRecorder takes one of these
+}
+
+# Stream variants: 'size' is the (width, height) to encode at, None keeps the published size.
+# 'quality' lists JPEG qualities, best first; with several, each client steps down while
+# its socket drains slowly and back up once it keeps up. Overlays are drawn at the largest
+# size being watched when only stream clients are watching.
+STREAM_VARIANTS = {
+    'full': {'size': None, 'quality': [90]},
+    'preview': {'size': (640, 360), 'quality': [80, 60, 40]},
+    'thumbnail': {'size': (320, 180), 'quality': [50]}
+}
+
+# Always-on incident recorder (edison/helpers/blackbox.py)
+BLACKBOX_CONFIG = {
+    'path': 'recordings/blackbox.ring',  # memory-mapped ring file; None keeps it in anonymous memory
+    'ring_mb': 64,                       # hard cap on buffered frames and telemetry
+    'window_seconds': 60,                # history saved per incident
+    'output_dir': 'recordings/incidents',
+    'disk_budget_mb': 1024,              # the oldest incidents are deleted to stay below this
+    'variant': 'preview',                # stream variant whose JPEGs are recorded
+    'jpeg_quality': 70                   # when the recorder has to encode frames itself
+}
+
+# Several cameras sharing micro-batched models (edison/components/vision_processor/multi_camera.py)
+MULTI_CAMERA_CONFIG = {
+    'sources': {'front': 2, 'rear': 0},  # source id -> camera index, file or stream URL
+    'max_wait_ms': 10  # how long a forward pass waits for the other cameras' frames
+}
+
+# Thread budget and core assignment for the 4-core Pi (edison/helpers/resource_plan.py)
+RESOURCE_PLAN = {
+    'enabled': True,
+    'torch_intra_op_threads': 2,  # matches the number of inference cores
+    'torch_inter_op_threads': 1,
+    'opencv_threads': 1,
+    'cores': {
+        'control': [0],
+        'capture': [1],
+        'streaming': [1],
+        'inference': [2, 3]
+    },
+    # 'realtime' is a SCHED_FIFO priority (needs CAP_SYS_NICE), 'nice' the fallback
+    'priorities': {
+        'control': {'realtime': 10, 'nice': -10}
+    }
+}
+
+# DroidCam MJPEG stream, read directly over HTTP (edison/components/vision_processor/mjpeg_capture.py)
+DROIDCAM_CONFIG = {
+    'url': 'http://127.0.0.1:4747/video',  # reachable over USB after `adb forward tcp:4747 tcp:4747`
+    'port': 4747,
+    'timeout': 5.0,          # seconds without data before reconnecting
+    'reconnect_delay': 1.0
+}
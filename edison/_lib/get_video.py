@@ -2,6 +2,8 @@ import subprocess
 import os
 import time
 
+import config
+
 class GetWebcam:
     def __init__(self):
         self.droidcam_process = None
@@ -20,6 +22,18 @@ class GetWebcam:
             print(f"Error: {str(e)}")
             return None
 
+    def get_stream_url(self):
+        """Forward DroidCam's port over adb and return its MJPEG URL, without droidcam-cli"""
+        port = config.DROIDCAM_CONFIG['port']
+        try:
+            subprocess.run(["adb", "forward", f"tcp:{port}", f"tcp:{port}"],
+                           check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            return None
+        self.device_path = config.DROIDCAM_CONFIG['url']
+        return self.device_path
+
     def stop(self):
         """Stop DroidCam process"""
         if self.droidcam_process:
@@ -28,7 +42,7 @@ class GetWebcam:
 # Usage example
 if __name__ == "__main__":
     webcam = GetWebcam()
-    device = webcam.get_webcam()
+    device = webcam.get_stream_url()
     
     if device:
         print(f"DroidCam video stream at: {device}")
@@ -7,10 +7,12 @@ from dotenv import load_dotenv
 from multiprocessing import Process, Manager
 
 from edison.models.Car import Car
-from edison.helpers.data_communication import DataPacketBuilder
+from edison.helpers.command_writer import CommandWriter
+from edison.helpers.data_communication import AckFrame, DataPacketBuilder
 from edison.helpers.packet_communication import PacketCommuncation
 from edison._lib.device_location import DeviceLocationReader
 from edison._lib.get_video import GetWebcam
+from edison.helpers.resource_plan import configure_thread
 
 load_dotenv()  # Load environment variables from .env file
 
@@ -19,16 +21,29 @@ class CarController:
     
     def __init__(self):
         load_dotenv()
+        self._lock = threading.Lock()
         self.car = self._initialize_car()
         self.builder = DataPacketBuilder()
         self.sender = self._initialize_serial_communicatior()
+        # Packets are built and written on the writer's thread; callers only leave the newest state
+        self.writer = CommandWriter(send=self._send_packet, build=self._build_packet,
+                                    interval=float(os.getenv("SERIAL_WRITE_INTERVAL", 0.02)))
+        # Arduino responses are decoded on the sender's reader thread
+        self.last_acked_seq = None
+        self.sender.subscribe(self._on_ack, AckFrame)
+        self.sender.init_recieving_packet_process()
+        # Optional BlackBoxRecorder that receives every commanded state
+        self.recorder = None
+        # Optional StreamManager whose /telemetry clients see every commanded state
+        self.stream = None
 
     
         shared_location_state = Manager().dict()
         self.device_location = DeviceLocationReader(location_shared_state=shared_location_state)
 
+        # The phone camera is read over HTTP by the vision processor; only the adb port forward is set up here
         self.web_cam = GetWebcam()
-        self.web_cam.get_webcam()
+        self.stream_url = self.web_cam.get_stream_url()
         
         # Start the logcat reader in a separate thread
         location_reading_process = Process(target=self.device_location._update_attributes_from_line())
@@ -40,9 +55,6 @@ class CarController:
             print("Make sure to connect usb, Waiting for the signal..")
             time.sleep(1)
 
-        # self.arduino_code_reader = threading.Thread(target=self.sender.init_recieving_packet_process, daemon=True)
-        # self.arduino_code_reader.start()
-
     def _initialize_car(self) -> Car:
         """Initialize and return a Car instance with configuration from environment variables."""
         car_states = {
@@ -72,28 +84,41 @@ class CarController:
         )
     
     def update_car_state(self) -> None:
-        """Update the car's state and send the corresponding data packet."""
+        """Hand the car's current state to the serial writer; returns without waiting for the port."""
         with self._lock:
             current_state = self.car.car_states.copy()
-
-        try:
-            packet = self.builder.construct_data_packet(
-                direction=current_state['current_direction'],
-                speed=current_state['current_speed']
-            )
-            print(packet)
-            print(f"Constructed packet: {packet.hex(':')}")
-            self._send_packet(packet)
-
-        except (EnvironmentError, ValueError) as e:
-            print(f"Packet construction failed: {e}")
+            # Submitted under the lock, so a state copied before a stop() can never overwrite
+            # the stop in the writer's single-slot mailbox
+            self.writer.submit(direction=current_state['current_direction'], speed=current_state['current_speed'])
+        if self.recorder is not None:
+            self.recorder.record_telemetry(speed=current_state['current_speed'],
+                                           direction=current_state['current_direction'],
+                                           location=self.device_location.location_shared_state.get('location'))
+        if self.stream is not None:
+            # Tagged with the newest video frame, next to the vision fields of that frame
+            self.stream.update_telemetry(speed=current_state['current_speed'],
+                                         direction=current_state['current_direction'])
+
+    def _build_packet(self, direction: int, speed: int) -> bytes:
+        """Construct the data packet; runs on the writer thread, which owns the sequence number."""
+        return self.builder.construct_data_packet(direction=direction, speed=speed)
+
+    def _on_ack(self, frame: AckFrame) -> None:
+        """Remember the newest command packet the Arduino confirmed."""
+        self.last_acked_seq = frame.seq
 
     def _send_packet(self, packet: bytes) -> None:
         """Send the constructed packet using the serial sender."""
-        try:
-            self.sender.send_packet(packet)
-        except Exception as e:
-            print(f"Error sending the packet: {e}")
+        self.sender.send_packet(packet)
+
+    def serial_stats(self) -> Dict[str, Any]:
+        """Counters of the serial writer: packets sent, commands coalesced, write latency."""
+        return self.writer.stats()
+
+    def close(self) -> None:
+        """Send the last pending command and close the serial port."""
+        self.writer.stop()
+        self.sender.close_connection()
 
     def _reset_states(self) -> None:
         """Reset all control states to default values."""
@@ -206,6 +231,15 @@ class EdisonCar(CarController):
         """Immediately stop the car."""
         self.set_speed(0)
 
+    def emergency_stop(self, reason: str = "emergency_stop") -> None:
+        """Stop the car and save the black-box window leading up to it."""
+        self.stop_gradual_acceleration()
+        self.stop_gradual_deceleration()
+        self.stop()
+        if self.recorder is not None:
+            # Only queues the save; the disk write happens on the recorder's thread
+            self.recorder.trigger(reason)
+
     def start_gradual_acceleration(self) -> None:
         """Start continuous acceleration until MAX_SPEED is reached."""
         if not self.accelerating:
@@ -228,6 +262,7 @@ class EdisonCar(CarController):
 
     def _acceleration_loop(self) -> None:
         """Continuous acceleration loop with delay."""
+        configure_thread('control')
         self.stop_gradual_deceleration()
         while self.accelerating:
             with self._lock:
@@ -240,6 +275,7 @@ class EdisonCar(CarController):
 
     def _deceleration_loop(self) -> None:
         """Continuous deceleration loop with delay."""
+        configure_thread('control')
         self.stop_gradual_acceleration()
         while self.decelerating:
             with self._lock:
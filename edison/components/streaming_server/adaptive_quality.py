@@ -0,0 +1,55 @@
+from typing import Optional
+
+
+class AdaptiveQuality:
+    """
+    Picks a JPEG quality level for one stream client from how quickly its socket drains.
+
+    Sending a frame blocks while the client's socket buffer is full, so the share of the
+    client's time spent sending (its duty cycle) shows whether the link keeps up. Above
+    `slow` the client steps down to the next, cheaper level right away; it steps back up
+    only after `patience` consecutive frames below `fast`.
+    """
+
+    def __init__(self, levels: int, slow: float = 0.5, fast: float = 0.15, patience: int = 30,
+                 smoothing: float = 0.2):
+        self.levels = levels
+        self.slow = slow
+        self.fast = fast
+        self.patience = patience
+        self.smoothing = smoothing
+        self.level = 0  # 0 is the best quality
+        self._duty: Optional[float] = None
+        self._fast_frames = 0
+
+    def update(self, send_seconds: float, cycle_seconds: float) -> int:
+        """
+        Record one sent frame.
+
+        Args:
+            send_seconds: Time the frame took to hand to the socket
+            cycle_seconds: Time since the previous frame started sending
+
+        Returns:
+            The quality level to use for the next frame
+        """
+        duty = min(send_seconds / max(cycle_seconds, 1e-6), 1.0)
+        self._duty = duty if self._duty is None else (1 - self.smoothing) * self._duty + self.smoothing * duty
+
+        if self._duty > self.slow:
+            self._fast_frames = 0
+            if self.level < self.levels - 1:
+                self._change(self.level + 1)
+        elif self._duty < self.fast:
+            self._fast_frames += 1
+            if self._fast_frames >= self.patience and self.level > 0:
+                self._change(self.level - 1)
+        else:
+            self._fast_frames = 0
+        return self.level
+
+    def _change(self, level: int) -> None:
+        self.level = level
+        # Judge the new level on its own frames
+        self._duty = None
+        self._fast_frames = 0
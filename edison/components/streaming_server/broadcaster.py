@@ -0,0 +1,132 @@
+import time
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from edison.helpers.resource_plan import configure_thread
+
+logger = logging.getLogger("FrameBroadcaster")
+
+
+@dataclass(frozen=True)
+class EncodedFrame:
+    seq: int
+    data: bytes        # encoded payload exactly as sent, shared by every client
+    timestamp: float   # wall-clock time the source frame was published
+
+
+class FrameBroadcaster:
+    """
+    Encodes each published frame once and lets any number of clients read the result.
+
+    `publish()` only stores a reference to the newest frame. A single encoder thread turns
+    it into an immutable EncodedFrame carrying the frame's sequence number; clients read
+    `latest()` without consuming it, so they never steal frames from each other, or block in
+    `wait_newer()` until the encoder signals the next sequence number. While no client is
+    subscribed nothing is encoded at all.
+    """
+
+    def __init__(self, encode: Callable[[Any, float], Optional[bytes]], name: str = "stream"):
+        self.encode = encode
+        self.name = name
+        self.subscribers = 0
+        self.frames_published = 0
+        self.frames_encoded = 0
+
+        self._lock = threading.Lock()
+        self._work = threading.Condition(self._lock)       # encoder: a new frame or subscriber
+        self._delivered = threading.Condition(self._lock)  # clients: a new encoded frame
+        self._frame = None
+        self._frame_seq = 0
+        self._frame_time = 0.0
+        self._encoded: Optional[EncodedFrame] = None
+        self._attempted_seq = 0
+        self._running = True
+        self._thread = threading.Thread(target=self._encode_loop, name=f"stream-encoder-{name}", daemon=True)
+        self._thread.start()
+
+    def publish(self, frame: Any, timestamp: Optional[float] = None, seq: Optional[int] = None) -> int:
+        """
+        Hand over the newest frame; the caller must not modify it afterwards.
+
+        Args:
+            frame: The frame to encode
+            timestamp: Wall-clock time of the frame, defaults to now
+            seq: Sequence number to tag it with, so several broadcasters can share one
+                numbering; must increase. Defaults to the next number
+
+        Returns:
+            The frame's sequence number
+        """
+        with self._lock:
+            self._frame_seq = self._frame_seq + 1 if seq is None else seq
+            self._frame = frame
+            self._frame_time = time.time() if timestamp is None else timestamp
+            self.frames_published += 1
+            self._work.notify()
+            return self._frame_seq
+
+    def latest(self) -> Optional[EncodedFrame]:
+        """Newest encoded frame, or None before the first encode."""
+        with self._lock:
+            return self._encoded
+
+    def wait_newer(self, seq: int, timeout: Optional[float] = None) -> Optional[EncodedFrame]:
+        """
+        Block until a frame newer than `seq` has been encoded.
+
+        Returns:
+            The newest encoded frame, or None on timeout or once the broadcaster is stopped
+        """
+        def ready():
+            return not self._running or (self._encoded is not None and self._encoded.seq > seq)
+
+        with self._lock:
+            self._delivered.wait_for(ready, timeout)
+            if not self._running or self._encoded is None or self._encoded.seq <= seq:
+                return None
+            return self._encoded
+
+    def subscribe(self) -> None:
+        with self._lock:
+            self.subscribers += 1
+            self._work.notify()
+
+    def unsubscribe(self) -> None:
+        with self._lock:
+            self.subscribers = max(0, self.subscribers - 1)
+
+    def stop(self) -> None:
+        with self._lock:
+            self._running = False
+            self._work.notify_all()
+            self._delivered.notify_all()
+        self._thread.join(timeout=1.0)
+
+    def _has_work(self) -> bool:
+        return not self._running or (self.subscribers > 0 and self._frame_seq > self._attempted_seq)
+
+    def _encode_loop(self) -> None:
+        configure_thread('streaming')
+        while True:
+            with self._lock:
+                self._work.wait_for(self._has_work)
+                if not self._running:
+                    return
+                frame, seq, timestamp = self._frame, self._frame_seq, self._frame_time
+                self._attempted_seq = seq
+                # Drop the reference so the producer's frame can be freed sooner
+                self._frame = None
+
+            try:
+                data = self.encode(frame, timestamp)
+            except Exception as e:
+                logger.error(f"{self.name}: encoding frame {seq} failed: {str(e)}")
+                data = None
+
+            with self._lock:
+                if data is not None:
+                    self._encoded = EncodedFrame(seq=seq, data=data, timestamp=timestamp)
+                    self.frames_encoded += 1
+                    self._delivered.notify_all()
@@ -1,37 +1,252 @@
 # streaming_system.py
-from flask import Flask, Response
+from flask import Flask, Response, abort, request
+from werkzeug.serving import WSGIRequestHandler, make_server
 import cv2
+import itertools
+import json
+import socket
 import threading
 import time
-from queue import Queue
-from functools import wraps
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from functools import partial, wraps
+from typing import List, Optional, Tuple
+
+import config
+from edison.components.streaming_server.adaptive_quality import AdaptiveQuality
+from edison.components.streaming_server.broadcaster import FrameBroadcaster
+from edison.helpers.resource_plan import configure_thread
+from edison.helpers.serialization import json_safe
+
+
+@dataclass
+class StreamVariant:
+    name: str
+    size: Optional[Tuple[int, int]]  # (width, height), None keeps the published size
+    qualities: List[int]             # JPEG qualities, best first
+    # One broadcaster per quality, each encoding only while it has subscribers
+    broadcasters: List[FrameBroadcaster] = field(default_factory=list)
+
+
+@dataclass
+class StreamClient:
+    id: int
+    address: str
+    variant: str
+    level: int = 0  # index into the variant's qualities
+    connected_at: float = field(default_factory=time.time)
+    frames_sent: int = 0
+    frames_skipped: int = 0  # newer frames replaced these while the client was still busy
+    keepalives: int = 0
+    bytes_sent: int = 0
+
+
+class _StreamRequestHandler(WSGIRequestHandler):
+    # A small kernel send buffer makes a slow client block after a frame or two, so it skips
+    # to the newest frame instead of having seconds of old frames queued in the socket
+    send_buffer_bytes = config.STREAM_CONFIG['send_buffer_bytes']
+
+    def setup(self):
+        super().setup()
+        if self.send_buffer_bytes:
+            self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.send_buffer_bytes)
+
 
 class StreamManager:
-    def __init__(self, video_source="/dev/video0"):
+    def __init__(self, video_source="/dev/video0", frame_size=None):
         self.app = Flask(__name__)
         self.video_source = video_source
-        self.frame_queue = Queue(maxsize=2)
-        self.lock = threading.Lock()
+        # Fixed (width, height) for producers to render at; by default the largest watched variant
+        self._frame_size = frame_size
+        # Every frame is encoded once per watched variant and quality, and only while someone watches it
+        self.variants = {}
+        for name, variant in config.STREAM_VARIANTS.items():
+            size = tuple(variant['size']) if variant['size'] else None
+            self.variants[name] = StreamVariant(name, size, list(variant['quality']), [
+                FrameBroadcaster(partial(self._encode_part, size=size, quality=quality), name=f"{name}-q{quality}")
+                for quality in variant['quality']
+            ])
+        self.default_variant = config.STREAM_CONFIG['default_variant']
+        self._seq = 0
+        self._timestamp = 0.0
+        # Publish times of recent frames, so late telemetry carries its frame's X-Timestamp
+        self._frame_times = deque(maxlen=128)
+        self._publish_lock = threading.Lock()
+        # Structured per-frame data (obstacles, lanes, steering, speed) as server-sent events,
+        # so clients can draw overlays themselves and the car can ship plain frames
+        self.burn_in_overlay = config.STREAM_CONFIG['burn_in_overlay']
+        self.telemetry = FrameBroadcaster(self._encode_event, name="telemetry")
+        self.max_telemetry_clients = config.STREAM_CONFIG['max_telemetry_clients']
+        self._telemetry_state = {}
+        # Seconds a client may go without a new frame before the last one is re-sent
+        self.keepalive = config.STREAM_CONFIG['keepalive']
+        # Every client costs a server thread and socket writes on the car's CPU
+        self.max_clients = config.STREAM_CONFIG['max_clients']
+        self._clients = {}
+        self._client_ids = itertools.count(1)
+        self._clients_lock = threading.Lock()
+        self._server = None
         self._running = False
         self.app.add_url_rule('/video_feed', 'video_feed', self._video_feed)
+        self.app.add_url_rule('/video_feed/<variant>', 'video_feed_variant', self._video_feed)
+        self.app.add_url_rule('/telemetry', 'telemetry', self._telemetry_feed)
+
+    def _video_feed(self, variant=None):
+        variant = self.variants.get(variant or self.default_variant)
+        if variant is None:
+            abort(404)
+        client = self._add_client(request.remote_addr, variant)
+        if client is None:
+            return Response(f"Stream is limited to {self.max_clients} clients\n", status=503,
+                            headers={'Retry-After': '5'}, mimetype='text/plain')
+        response = Response(self._generate_frames(client, variant),
+                            mimetype='multipart/x-mixed-replace; boundary=frame')
+        # Runs when the response is closed, even if the client left before the first frame
+        response.call_on_close(lambda: self._remove_client(client))
+        return response
+
+    def _telemetry_feed(self):
+        with self._clients_lock:
+            if self.telemetry.subscribers >= self.max_telemetry_clients:
+                return Response(f"Telemetry is limited to {self.max_telemetry_clients} clients\n", status=503,
+                                headers={'Retry-After': '5'}, mimetype='text/plain')
+            self.telemetry.subscribe()
+        response = Response(self._generate_events(), mimetype='text/event-stream',
+                            headers={'Cache-Control': 'no-cache'})
+        response.call_on_close(self.telemetry.unsubscribe)
+        return response
+
+    def _add_client(self, address, variant):
+        with self._clients_lock:
+            if len(self._clients) >= self.max_clients:
+                return None
+            client = StreamClient(id=next(self._client_ids), address=address, variant=variant.name)
+            self._clients[client.id] = client
+        variant.broadcasters[client.level].subscribe()
+        return client
+
+    def _remove_client(self, client):
+        with self._clients_lock:
+            if self._clients.pop(client.id, None) is None:
+                return
+        self.variants[client.variant].broadcasters[client.level].unsubscribe()
+
+    def client_stats(self):
+        """Per-client delivery counters of the connected clients"""
+        with self._clients_lock:
+            clients = list(self._clients.values())
+        now = time.time()
+        stats = []
+        for client in clients:
+            entry = asdict(client)
+            entry['quality'] = self.variants[client.variant].qualities[client.level]
+            entry['fps'] = client.frames_sent / max(now - client.connected_at, 1e-6)
+            stats.append(entry)
+        return stats
 
-    def _video_feed(self):
-        return Response(self._generate_frames(),
-                        mimetype='multipart/x-mixed-replace; boundary=frame')
+    @property
+    def viewers(self):
+        with self._clients_lock:
+            return len(self._clients)
 
-    def _generate_frames(self):
+    def _watched_variants(self):
+        # Variants someone subscribes to: HTTP clients or in-process consumers like the black box
+        return [variant for variant in self.variants.values()
+                if any(broadcaster.subscribers for broadcaster in variant.broadcasters)]
+
+    @property
+    def has_viewers(self):
+        """True while any stream variant has a subscriber"""
+        return bool(self._watched_variants())
+
+    @property
+    def has_telemetry_clients(self):
+        """True while at least one client is connected to /telemetry"""
+        return self.telemetry.subscribers > 0
+
+    @property
+    def frame_size(self):
+        """(width, height) producers should render at, or None for their own size"""
+        if self._frame_size is not None:
+            return self._frame_size
+        sizes = [variant.size for variant in self._watched_variants()] or [self.variants[self.default_variant].size]
+        if None in sizes:
+            return None
+        return max(sizes, key=lambda size: size[0] * size[1])
+
+    @staticmethod
+    def _encode_part(frame, timestamp, size=None, quality=95):
+        """Encode a frame into a complete multipart chunk, shared as-is by every client"""
+        if size is not None and (frame.shape[1], frame.shape[0]) != size:
+            frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        if not ret:
+            return None
+        # X-Timestamp is the publish time, so clients can measure glass-to-browser latency
+        return (b'--frame\r\n'
+                b'Content-Type: image/jpeg\r\n'
+                b'Content-Length: ' + str(len(buffer)).encode() + b'\r\n'
+                b'X-Timestamp: ' + f"{timestamp:.6f}".encode() + b'\r\n\r\n' +
+                buffer.tobytes() + b'\r\n')
+
+    @staticmethod
+    def _encode_event(state, timestamp):
+        """Serialize a telemetry snapshot into one server-sent event, shared by every client"""
+        # Strict JSON: browsers' JSON.parse rejects Infinity, e.g. the ttc of a receding obstacle
+        data = json.dumps(json_safe(dict(state, timestamp=timestamp)), allow_nan=False, separators=(',', ':'))
+        # The event id is the video frame's sequence number
+        return f"id: {state['seq']}\nevent: telemetry\ndata: {data}\n\n".encode()
+
+    def _generate_events(self):
+        # Like the video: each client gets the newest snapshot and skips the ones it missed
+        last = None
         while self._running:
-            with self.lock:
-                if not self.frame_queue.empty():
-                    frame = self.frame_queue.get()
-                    ret, buffer = cv2.imencode('.jpg', frame)
-                    if ret:
-                        yield (b'--frame\r\n'
-                               b'Content-Type: image/jpeg\r\n\r\n' + 
-                               buffer.tobytes() + b'\r\n')
-            time.sleep(0.05)
+            event = self.telemetry.wait_newer(last.seq if last else 0, timeout=self.keepalive)
+            if event is not None:
+                last = event
+                yield event.data
+            elif self._running:
+                # SSE comment line, ignored by EventSource
+                yield b': keepalive\n\n'
+
+    def _generate_frames(self, client, variant):
+        # Each client runs in its own server thread. The yield blocks while its socket is
+        # full, and afterwards the client jumps to the newest frame: intermediate frames are
+        # dropped for that client only, and never queued.
+        adaptive = AdaptiveQuality(len(variant.qualities)) if len(variant.qualities) > 1 else None
+        last = None
+        cycle_start = None
+        while self._running:
+            # Sleep until the encoder signals a frame this client has not sent yet
+            broadcaster = variant.broadcasters[client.level]
+            encoded = broadcaster.wait_newer(last.seq if last else 0, timeout=self.keepalive)
+            if encoded is not None:
+                if last is not None:
+                    client.frames_skipped += encoded.seq - last.seq - 1
+                client.frames_sent += 1
+                last = encoded
+            elif last is None or not self._running:
+                continue
+            else:
+                # On timeout the last frame is repeated: it keeps the connection alive
+                # and lets the server notice a client that went away
+                client.keepalives += 1
+            client.bytes_sent += len(last.data)
+            send_start = time.perf_counter()
+            yield last.data
+
+            if adaptive is not None and encoded is not None:
+                now = time.perf_counter()
+                level = adaptive.update(now - send_start, now - (cycle_start or send_start))
+                cycle_start = send_start
+                if level != client.level:
+                    # Sequence numbers are shared by all qualities, so the switch is seamless
+                    variant.broadcasters[level].subscribe()
+                    broadcaster.unsubscribe()
+                    client.level = level
 
     def _capture_frames(self):
+        configure_thread('capture')
         cap = cv2.VideoCapture(self.video_source)
         if not cap.isOpened():
             print(f"Error: Could not open video source {self.video_source}.")
@@ -47,21 +262,68 @@ class StreamManager:
         self._running = True
         if use_internal_capture:
             threading.Thread(target=self._capture_frames, daemon=True).start()
-        # Start Flask in a daemon thread
-        flask_thread = threading.Thread(target=self.app.run, 
-                                     kwargs={'host': host, 'port': port, 'threaded': False},
-                                     daemon=True)
+        # Every request gets its own thread, so a slow or idle client never blocks the others
+        self._server = make_server(host, port, self.app, threaded=True,
+                                   request_handler=_StreamRequestHandler)
+        # Serve in a daemon thread
+        flask_thread = threading.Thread(target=self._serve, daemon=True)
         flask_thread.start()
 
+    def _serve(self):
+        # Request threads started by the server inherit the streaming cores
+        configure_thread('streaming')
+        self._server.serve_forever()
+
     def stop(self):
         self._running = False
+        for variant in self.variants.values():
+            for broadcaster in variant.broadcasters:
+                broadcaster.stop()
+        self.telemetry.stop()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def update_frame(self, frame, timestamp=None):
+        """Publish the newest frame; the caller must not draw into it afterwards. Returns its sequence number"""
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._publish_lock:
+            self._seq += 1
+            self._timestamp = timestamp
+            self._frame_times.append((self._seq, timestamp))
+            # Only stores a reference; variants without subscribers never encode it
+            for variant in self.variants.values():
+                for broadcaster in variant.broadcasters:
+                    broadcaster.publish(frame, timestamp, seq=self._seq)
+            return self._seq
+
+    def update_telemetry(self, seq=None, **fields):
+        """
+        Merge fields into the telemetry state and send a snapshot to /telemetry clients.
+
+        Fields keep their last value until updated, so vision (obstacles, lanes) and
+        CarController (direction, speed; set its `stream`) can each update their own. Values
+        must be JSON serializable; numpy values are converted and infinite or NaN floats are
+        sent as null.
 
-    def update_frame(self, frame):
-        with self.lock:
-            # Keep only the latest frame
-            while not self.frame_queue.empty():
-                self.frame_queue.get()
-            self.frame_queue.put(frame)
+        Args:
+            seq: Sequence number of the video frame the fields describe (from update_frame);
+                defaults to the last published frame. The event's timestamp is that frame's
+                publish time (its X-Timestamp), or the current time once the frame is older
+                than the last 128
+        """
+        with self._publish_lock:
+            if seq is None or seq == self._seq:
+                seq, timestamp = self._seq, self._timestamp
+            else:
+                timestamp = next((t for s, t in reversed(self._frame_times) if s == seq), None)
+                if timestamp is None:
+                    timestamp = time.time()
+            self._telemetry_state.update(fields)
+            self._telemetry_state['seq'] = seq
+            # Encoded on the telemetry thread, only while someone is subscribed
+            self.telemetry.publish(dict(self._telemetry_state), timestamp)
 
     def frame_decorator(self, func):
         @wraps(func)
@@ -0,0 +1,230 @@
+import os
+import re
+import hashlib
+import time
+import logging
+import numpy as np
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger("BatchAnalysis")
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mkv', '.mov', '.h264')
+STAGES = ('undistort_roi', 'detection', 'tracking', 'depth', 'lanes')
+
+# One VisionProcessor per worker process, created by the pool initializer
+_processor = None
+
+
+class ChunkWriter:
+    """
+    Buffers per-frame results and flushes them as columnar .npz chunks.
+
+    Frame-level columns have one row per frame; obstacle columns have one row per obstacle
+    and point back to their frame through `obstacle_frame`. Chunks are written atomically,
+    so after an interruption every chunk on disk is complete and the clip can be resumed
+    from the frame after the last one saved.
+    """
+
+    def __init__(self, output_dir: Path, clip_id: str, chunk_frames: int = 500):
+        self.output_dir = output_dir
+        self.clip_id = clip_id
+        self.chunk_frames = chunk_frames
+        self.next_chunk = len(self.chunk_paths(output_dir, clip_id))
+        self._reset()
+
+    @staticmethod
+    def chunk_paths(output_dir: Path, clip_id: str) -> List[Path]:
+        return sorted(output_dir.glob(f"{clip_id}.chunk-*.npz"))
+
+    @staticmethod
+    def done_path(output_dir: Path, clip_id: str) -> Path:
+        return output_dir / f"{clip_id}.done"
+
+    @classmethod
+    def resume_frame(cls, output_dir: Path, clip_id: str) -> int:
+        """First frame index that has not been saved yet."""
+        chunks = cls.chunk_paths(output_dir, clip_id)
+        if not chunks:
+            return 0
+        with np.load(chunks[-1]) as data:
+            return int(data['frame_index'][-1]) + 1 if len(data['frame_index']) else 0
+
+    def _reset(self) -> None:
+        self.frames: Dict[str, List] = {name: [] for name in (
+            'frame_index', 'timestamp_ms', 'obstacle_count', 'lane_center', 'lane_curvature',
+            'lane_confidence', 'latency_ms', *[f"stage_{stage}_ms" for stage in STAGES]
+        )}
+        self.obstacles: Dict[str, List] = {name: [] for name in (
+            'obstacle_frame', 'obstacle_class', 'obstacle_track', 'obstacle_bbox',
+            'obstacle_confidence', 'obstacle_distance', 'obstacle_ttc'
+        )}
+
+    def add(self, frame_index: int, timestamp_ms: float, obstacles: List[Dict], lanes: Dict,
+            latency_ms: float, stage_ms: Dict[str, float]) -> None:
+        lanes = lanes or {}
+        self.frames['frame_index'].append(frame_index)
+        self.frames['timestamp_ms'].append(timestamp_ms)
+        self.frames['obstacle_count'].append(len(obstacles))
+        self.frames['lane_center'].append(lanes.get('center', np.nan))
+        self.frames['lane_curvature'].append(lanes.get('curvature', np.nan))
+        self.frames['lane_confidence'].append(lanes.get('confidence', np.nan))
+        self.frames['latency_ms'].append(latency_ms)
+        for stage in STAGES:
+            self.frames[f"stage_{stage}_ms"].append(stage_ms.get(stage, np.nan))
+
+        for obstacle in obstacles:
+            self.obstacles['obstacle_frame'].append(frame_index)
+            self.obstacles['obstacle_class'].append(obstacle['class_id'])
+            self.obstacles['obstacle_track'].append(obstacle.get('track_id', -1))
+            self.obstacles['obstacle_bbox'].append(obstacle['bbox'])
+            self.obstacles['obstacle_confidence'].append(obstacle.get('confidence', np.nan))
+            self.obstacles['obstacle_distance'].append(obstacle.get('distance', np.inf)
+                                                       if obstacle.get('distance_known', True) else np.nan)
+            self.obstacles['obstacle_ttc'].append(obstacle.get('ttc', np.inf))
+
+        if len(self.frames['frame_index']) >= self.chunk_frames:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.frames['frame_index']:
+            return
+        columns = {
+            'frame_index': np.array(self.frames['frame_index'], dtype=np.int32),
+            'obstacle_count': np.array(self.frames['obstacle_count'], dtype=np.int16),
+            'obstacle_frame': np.array(self.obstacles['obstacle_frame'], dtype=np.int32),
+            'obstacle_class': np.array(self.obstacles['obstacle_class'], dtype=np.int16),
+            'obstacle_track': np.array(self.obstacles['obstacle_track'], dtype=np.int32),
+            'obstacle_bbox': np.array(self.obstacles['obstacle_bbox'], dtype=np.float32).reshape(-1, 4),
+        }
+        for name, values in list(self.frames.items()) + list(self.obstacles.items()):
+            if name not in columns:
+                columns[name] = np.array(values, dtype=np.float32)
+
+        path = self.output_dir / f"{self.clip_id}.chunk-{self.next_chunk:05d}.npz"
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(f, **columns)
+        os.replace(tmp_path, path)
+        self.next_chunk += 1
+        self._reset()
+
+
+def clip_id(video: Path, root: Path) -> str:
+    """
+    Output file prefix unique within the input directory.
+
+    The readable part flattens the relative path and drops the extension, so different
+    paths can map to the same name (a_b/c.mp4 and a/b_c.mp4, or c.mp4 and c.avi); a short
+    hash of the full relative path keeps them apart.
+    """
+    relative = video.relative_to(root).as_posix()
+    readable = re.sub(r'[^A-Za-z0-9_.-]', '_', str(Path(relative).with_suffix('')))
+    return f"{readable}-{hashlib.sha1(relative.encode()).hexdigest()[:8]}"
+
+
+def find_videos(root: Union[str, Path]) -> List[Path]:
+    root = Path(root)
+    return sorted(p for p in root.rglob('*') if p.suffix.lower() in VIDEO_EXTENSIONS)
+
+
+def _init_worker(torch_threads: int) -> None:
+    global _processor
+    import cv2
+    import torch
+    import config
+    from edison.components.vision_processor.vision_processor import VisionProcessor
+
+    torch.set_num_threads(torch_threads)
+    cv2.setNumThreads(1)
+    # Synchronous depth keeps results reproducible between runs. The live resource plan would
+    # resize the pools set above and pin every worker to the same inference cores
+    _processor = VisionProcessor(camera_index=None, asynchronous_depth=False,
+                                 resource_plan={**config.RESOURCE_PLAN, 'enabled': False})
+    # Offline results should not depend on how loaded the machine was
+    _processor.governor = None
+
+
+def analyze_clip(video: str, output_dir: str, clip: str, chunk_frames: int = 500) -> Tuple[str, int, float]:
+    """
+    Run the perception stack over one clip as fast as the CPU allows.
+
+    Returns:
+        (clip id, frames processed in this run, seconds taken)
+    """
+    import cv2
+
+    output_dir = Path(output_dir)
+    start_frame = ChunkWriter.resume_frame(output_dir, clip)
+    writer = ChunkWriter(output_dir, clip, chunk_frames)
+
+    _processor.open_source(video)
+    if start_frame:
+        _processor.cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+        logger.info(f"{clip}: resuming at frame {start_frame}")
+
+    started = time.perf_counter()
+    frame_index = start_frame
+    frame = None
+    while True:
+        ret, frame = _processor.cap.read(frame)
+        if not ret:
+            break
+        timestamp_ms = _processor.cap.get(cv2.CAP_PROP_POS_MSEC)
+        frame_start = time.perf_counter()
+        _, obstacles, lanes = _processor.analyze_frame(frame)
+        latency_ms = (time.perf_counter() - frame_start) * 1000
+        writer.add(frame_index, timestamp_ms, obstacles, lanes, latency_ms, _processor.stage_timer.last)
+        frame_index += 1
+
+    writer.flush()
+    _processor.cap.release()
+    ChunkWriter.done_path(output_dir, clip).write_text(f"{frame_index}\n")
+    return clip, frame_index - start_frame, time.perf_counter() - started
+
+
+def analyze_directory(input_dir: Union[str, Path], output_dir: Union[str, Path], workers: Optional[int] = None,
+                      chunk_frames: int = 500, videos: Optional[Sequence[Path]] = None) -> Dict[str, int]:
+    """
+    Fan the clips of a directory out over a process pool, skipping clips already finished.
+
+    Returns:
+        Frames processed per clip in this run
+    """
+    input_dir, output_dir = Path(input_dir), Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    workers = workers or max(1, (os.cpu_count() or 1) // 2)
+    torch_threads = max(1, (os.cpu_count() or 1) // workers)
+
+    pending = []
+    for video in videos if videos is not None else find_videos(input_dir):
+        clip = clip_id(video, input_dir)
+        if ChunkWriter.done_path(output_dir, clip).exists():
+            logger.info(f"{clip}: already analyzed, skipping")
+            continue
+        pending.append((str(video), clip))
+
+    processed = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(torch_threads,)) as pool:
+        futures = {pool.submit(analyze_clip, video, str(output_dir), clip, chunk_frames): clip
+                   for video, clip in pending}
+        for future in as_completed(futures):
+            try:
+                clip, frames, seconds = future.result()
+            except Exception as e:
+                logger.error(f"{futures[future]}: analysis failed: {str(e)}")
+                continue
+            processed[clip] = frames
+            logger.info(f"{clip}: {frames} frames in {seconds:.1f} s ({frames / max(seconds, 1e-9):.1f} FPS)")
+    return processed
+
+
+def load_results(output_dir: Union[str, Path], clip: str) -> Dict[str, np.ndarray]:
+    """Concatenate all chunks of a clip back into one set of columns."""
+    columns: Dict[str, List[np.ndarray]] = {}
+    for path in ChunkWriter.chunk_paths(Path(output_dir), clip):
+        with np.load(path) as data:
+            for name in data.files:
+                columns.setdefault(name, []).append(data[name])
+    return {name: np.concatenate(parts) for name, parts in columns.items()}
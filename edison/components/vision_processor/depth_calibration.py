@@ -0,0 +1,112 @@
+import logging
+import numpy as np
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+logger = logging.getLogger("DepthCalibration")
+
+
+def box_features(boxes: np.ndarray, roi_height: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Geometric cues for each box, normalized by the ROI height.
+
+    Returns:
+        (bottom row, box height). On a flat road the bottom row of an object is a strong
+        distance cue on its own, and box height covers objects of roughly known size.
+    """
+    boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+    return boxes[:, 3] / roi_height, (boxes[:, 3] - boxes[:, 1]) / roi_height
+
+
+class DistanceCalibration:
+    """
+    Lookup table from MiDaS relative inverse depth plus box geometry to meters.
+
+    MiDaS inverse depth is only correct up to an affine transform, and that transform drifts
+    with where the object sits in the image. The table is keyed by the box's bottom row; each
+    row bin stores coefficients (s, t, u) of
+
+        1 / meters = s * inverse_depth + t + u * box_height
+
+    Coefficients are linearly interpolated between bin centers, so a lookup is a handful
+    of vectorized numpy operations for all boxes of a frame.
+    """
+
+    def __init__(self, row_centers: np.ndarray, coeffs: np.ndarray, max_distance: float = 50.0):
+        self.row_centers = np.asarray(row_centers, dtype=np.float32)
+        self.coeffs = np.asarray(coeffs, dtype=np.float32).reshape(-1, 3)
+        self.max_distance = max_distance
+
+    @classmethod
+    def fit(cls, inverse_depth: np.ndarray, bottom_rows: np.ndarray, box_heights: np.ndarray,
+            distances: np.ndarray, n_bins: int = 6, min_samples: int = 8,
+            outlier_mad: float = 3.0) -> "DistanceCalibration":
+        """
+        Fit the table from samples with known distances.
+
+        Each bin is solved by least squares, then refit once without samples whose residual
+        exceeds `outlier_mad` median absolute deviations. Bins with too few samples use the
+        global fit.
+        """
+        inverse_depth = np.asarray(inverse_depth, dtype=np.float64)
+        bottom_rows = np.asarray(bottom_rows, dtype=np.float64)
+        box_heights = np.asarray(box_heights, dtype=np.float64)
+        target = 1.0 / np.asarray(distances, dtype=np.float64)
+
+        valid = np.isfinite(inverse_depth) & np.isfinite(target)
+        if valid.sum() < 3:
+            raise ValueError(f"Need at least 3 valid samples to calibrate. Got: {int(valid.sum())}")
+        inverse_depth, bottom_rows, box_heights, target = (
+            inverse_depth[valid], bottom_rows[valid], box_heights[valid], target[valid]
+        )
+        features = np.stack([inverse_depth, np.ones_like(inverse_depth), box_heights], axis=1)
+
+        global_coeffs = cls._robust_lstsq(features, target, outlier_mad)
+        edges = np.unique(np.quantile(bottom_rows, np.linspace(0, 1, n_bins + 1)))
+        bins = np.clip(np.searchsorted(edges, bottom_rows, side='right') - 1, 0, max(len(edges) - 2, 0))
+
+        centers, coeffs = [], []
+        for b in range(max(len(edges) - 1, 1)):
+            mask = bins == b
+            centers.append(float(np.median(bottom_rows[mask])) if mask.any() else float(edges[b]))
+            if mask.sum() >= min_samples:
+                coeffs.append(cls._robust_lstsq(features[mask], target[mask], outlier_mad))
+            else:
+                coeffs.append(global_coeffs)
+
+        logger.info(f"Fitted distance calibration on {len(target)} samples, {len(centers)} row bins")
+        return cls(np.array(centers), np.array(coeffs))
+
+    @staticmethod
+    def _robust_lstsq(features: np.ndarray, target: np.ndarray, outlier_mad: float) -> np.ndarray:
+        coeffs = np.linalg.lstsq(features, target, rcond=None)[0]
+        residuals = target - features @ coeffs
+        mad = np.median(np.abs(residuals - np.median(residuals)))
+        inliers = np.abs(residuals) <= outlier_mad * max(mad, 1e-9) * 1.4826
+        if 3 <= inliers.sum() < len(target):
+            coeffs = np.linalg.lstsq(features[inliers], target[inliers], rcond=None)[0]
+        return coeffs
+
+    def to_meters(self, inverse_depth: np.ndarray, bottom_rows: np.ndarray, box_heights: np.ndarray) -> np.ndarray:
+        """Vectorized conversion; NaN inputs map to infinity (unknown distance)."""
+        inverse_depth = np.asarray(inverse_depth, dtype=np.float32)
+        s = np.interp(bottom_rows, self.row_centers, self.coeffs[:, 0])
+        t = np.interp(bottom_rows, self.row_centers, self.coeffs[:, 1])
+        u = np.interp(bottom_rows, self.row_centers, self.coeffs[:, 2])
+        inverse_meters = s * inverse_depth + t + u * np.asarray(box_heights, dtype=np.float32)
+
+        meters = 1.0 / np.maximum(inverse_meters, 1.0 / self.max_distance)
+        return np.where(np.isfinite(inverse_depth), meters, np.inf)
+
+    def save(self, path: Union[str, Path]) -> None:
+        np.savez(path, row_centers=self.row_centers, coeffs=self.coeffs, max_distance=self.max_distance)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> Optional["DistanceCalibration"]:
+        """Load a saved table, or return None if the file does not exist."""
+        path = Path(path)
+        if not path.exists():
+            logger.warning(f"Depth calibration {path} not found, falling back to the scalar depth_scale")
+            return None
+        with np.load(path) as data:
+            return cls(data['row_centers'], data['coeffs'], float(data['max_distance']))
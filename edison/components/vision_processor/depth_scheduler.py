@@ -0,0 +1,202 @@
+import logging
+import warnings
+import threading
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+from edison.components.vision_processor.pipeline import DropQueue
+from edison.helpers.bbox import box_iou
+from edison.helpers.buffer_pool import BufferPool
+from edison.helpers.resource_plan import configure_thread
+
+logger = logging.getLogger("DepthScheduler")
+
+def boxes_inverse_depth(depth_map: np.ndarray, boxes: np.ndarray, offset: Tuple[int, int] = (0, 0),
+                        grid: int = 8, inner: float = 0.6) -> np.ndarray:
+    """
+    Robust relative inverse depth for every box at once.
+
+    Each box is sampled on a grid x grid lattice over its central `inner` fraction, which
+    keeps road and background pixels at the box edges out of the estimate, and the median
+    of the samples is taken. All boxes are gathered with a single fancy-indexing call.
+
+    Args:
+        depth_map: Inverse depth covering the region that starts at `offset` (x, y) in ROI coordinates
+        boxes: (N, 4) boxes in ROI coordinates
+
+    Returns:
+        (N,) medians; NaN for boxes that do not overlap the map
+    """
+    boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+    if len(boxes) == 0:
+        return np.zeros(0, dtype=np.float32)
+    height, width = depth_map.shape[:2]
+
+    centers_x = (boxes[:, 0] + boxes[:, 2]) / 2 - offset[0]
+    centers_y = (boxes[:, 1] + boxes[:, 3]) / 2 - offset[1]
+    steps = ((np.arange(grid) + 0.5) / grid - 0.5) * inner
+    xs = np.rint(centers_x[:, None] + steps[None, :] * (boxes[:, 2] - boxes[:, 0])[:, None]).astype(np.int64)
+    ys = np.rint(centers_y[:, None] + steps[None, :] * (boxes[:, 3] - boxes[:, 1])[:, None]).astype(np.int64)
+
+    inside = ((ys >= 0) & (ys < height))[:, :, None] & ((xs >= 0) & (xs < width))[:, None, :]
+    samples = depth_map[np.clip(ys, 0, height - 1)[:, :, None], np.clip(xs, 0, width - 1)[:, None, :]]
+    samples = np.where(inside, samples, np.nan).reshape(len(boxes), -1)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN rows are expected
+        return np.nanmedian(samples, axis=1).astype(np.float32)
+
+
+@dataclass
+class DepthSnapshot:
+    depth_map: np.ndarray
+    offset: Tuple[int, int]  # (x, y) of the map's top-left corner in ROI coordinates
+    boxes: np.ndarray = field(default_factory=lambda: np.zeros((0, 4), dtype=np.float32))
+    values: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.float32))
+    frame_index: int = 0
+
+
+class DepthScheduler:
+    """
+    Runs the depth model at a reduced rate and serves per-obstacle inverse depth lookups.
+
+    A refresh runs every `interval` frames, or sooner when a detection appears that cannot
+    be matched to a box from the last refresh. It can be restricted to the union of the
+    detected boxes. Between refreshes, each box reuses the value of its matched box from the
+    last depth map, rescaled by the change in box height (apparent size grows as 1/distance).
+
+    With `asynchronous=True` refreshes run on a background thread and `update` never waits
+    for the depth model; lookups use the newest completed snapshot. At most one refresh is
+    in flight; frames arriving meanwhile do not copy the ROI or queue another request.
+    """
+
+    def __init__(self, estimate_fn: Callable[[np.ndarray], np.ndarray], interval: int = 3,
+                 crop_to_boxes: bool = True, crop_margin: float = 0.2, match_iou: float = 0.3,
+                 asynchronous: bool = False):
+        self.estimate_fn = estimate_fn
+        self.interval = max(1, interval)
+        self.crop_to_boxes = crop_to_boxes
+        self.crop_margin = crop_margin
+        self.match_iou = match_iou
+        self.asynchronous = asynchronous
+
+        self._snapshot: Optional[DepthSnapshot] = None
+        self._snapshot_lock = threading.Lock()
+        self._frame_index = 0
+        self._pending_frame: Optional[int] = None  # frame index of the refresh in flight
+        self._invalidated_frame = 0  # refreshes requested up to this frame are discarded
+        self.refreshes = 0
+
+        self._requests: Optional[DropQueue] = None
+        self._worker: Optional[threading.Thread] = None
+        if asynchronous:
+            # ROI copies handed to the worker are recycled once refreshed or dropped
+            self._roi_pool = BufferPool(max_free=2)
+            self._requests = DropQueue(1, on_drop=lambda request: self._roi_pool.release(request[1]))
+            self._worker = threading.Thread(target=self._worker_loop, name="depth-scheduler", daemon=True)
+            self._worker.start()
+
+    @property
+    def snapshot(self) -> Optional[DepthSnapshot]:
+        with self._snapshot_lock:
+            return self._snapshot
+
+    def update(self, roi: np.ndarray, obstacles: Sequence[Dict]) -> np.ndarray:
+        """
+        Advance one frame and return the relative inverse depth for each obstacle.
+
+        Values are NaN for obstacles that no depth estimate covers yet.
+        """
+        self._frame_index += 1
+        boxes = np.array([o['bbox'] for o in obstacles], dtype=np.float32).reshape(-1, 4)
+
+        values, unmatched = self._lookup(boxes)
+        snapshot = self.snapshot
+        due = snapshot is None or self._frame_index - snapshot.frame_index >= self.interval
+        if len(boxes) and (due or unmatched):
+            if self.asynchronous:
+                with self._snapshot_lock:
+                    if self._pending_frame is not None:
+                        return values
+                    self._pending_frame = self._frame_index
+                roi_copy = self._roi_pool.acquire(roi.shape, roi.dtype)
+                np.copyto(roi_copy, roi)
+                self._requests.put((self._frame_index, roi_copy, boxes))
+            else:
+                self._refresh(self._frame_index, roi, boxes)
+                values, _ = self._lookup(boxes)
+        return values
+
+    def invalidate(self) -> None:
+        """Drop the current snapshot so the next frame with detections refreshes depth."""
+        with self._snapshot_lock:
+            self._snapshot = None
+            self._invalidated_frame = self._frame_index
+
+    def stop(self) -> None:
+        if self._requests is not None:
+            self._requests.close()
+        if self._worker is not None:
+            self._worker.join(timeout=1.0)
+
+    def _lookup(self, boxes: np.ndarray) -> Tuple[np.ndarray, bool]:
+        """Per-box inverse depth from the last snapshot, and whether any box was unmatched."""
+        snapshot = self.snapshot
+        values = np.full(len(boxes), np.nan, dtype=np.float32)
+        if snapshot is None or len(boxes) == 0:
+            return values, len(boxes) > 0
+
+        iou = box_iou(boxes, snapshot.boxes)
+        if iou.shape[1]:
+            best = iou.argmax(axis=1)
+            matched = iou[np.arange(len(boxes)), best] >= self.match_iou
+        else:
+            best = np.zeros(len(boxes), dtype=np.int64)
+            matched = np.zeros(len(boxes), dtype=bool)
+
+        if matched.any():
+            prev = snapshot.boxes[best[matched]]
+            prev_heights = np.maximum(prev[:, 3] - prev[:, 1], 1.0)
+            heights = np.maximum(boxes[matched, 3] - boxes[matched, 1], 1.0)
+            values[matched] = snapshot.values[best[matched]] * heights / prev_heights
+        if not matched.all():
+            values[~matched] = boxes_inverse_depth(snapshot.depth_map, boxes[~matched], snapshot.offset)
+        return values, not matched.all()
+
+    def _crop_region(self, roi_shape: Tuple[int, ...], boxes: np.ndarray) -> Tuple[int, int, int, int]:
+        height, width = roi_shape[:2]
+        if not self.crop_to_boxes or len(boxes) == 0:
+            return 0, 0, width, height
+        x1, y1 = boxes[:, 0].min(), boxes[:, 1].min()
+        x2, y2 = boxes[:, 2].max(), boxes[:, 3].max()
+        margin_x, margin_y = (x2 - x1) * self.crop_margin, (y2 - y1) * self.crop_margin
+        return (int(max(0, x1 - margin_x)), int(max(0, y1 - margin_y)),
+                int(min(width, x2 + margin_x)), int(min(height, y2 + margin_y)))
+
+    def _refresh(self, frame_index: int, roi: np.ndarray, boxes: np.ndarray) -> None:
+        x1, y1, x2, y2 = self._crop_region(roi.shape, boxes)
+        depth_map = self.estimate_fn(roi[y1:y2, x1:x2])
+        values = boxes_inverse_depth(depth_map, boxes, (x1, y1))
+
+        with self._snapshot_lock:
+            if frame_index <= self._invalidated_frame:
+                return  # requested before invalidate(), e.g. at another resolution
+            self._snapshot = DepthSnapshot(depth_map=depth_map, offset=(x1, y1), boxes=boxes,
+                                           values=values, frame_index=frame_index)
+        self.refreshes += 1
+
+    def _worker_loop(self) -> None:
+        configure_thread('inference')
+        while True:
+            request = self._requests.get()
+            if request is None:
+                return
+            try:
+                self._refresh(*request)
+            except Exception as e:
+                logger.error(f"Depth refresh failed: {str(e)}")
+            finally:
+                self._roi_pool.release(request[1])
+                with self._snapshot_lock:
+                    self._pending_frame = None
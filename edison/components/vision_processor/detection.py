@@ -0,0 +1,129 @@
+import cv2
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# COCO ids of the classes treated as obstacles
+OBSTACLE_LABELS = {0: 'person', 1: 'bicycle', 2: 'car', 3: 'motorcycle', 5: 'bus', 7: 'truck'}
+
+IMAGENET_MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32)
+IMAGENET_STD = np.array([0.229, 0.224, 0.225], dtype=np.float32)
+
+
+def letterbox(image: np.ndarray, size: int, pad_value: int = 114, out: Optional[np.ndarray] = None,
+              resized: Optional[np.ndarray] = None) -> Tuple[np.ndarray, float, Tuple[int, int]]:
+    """
+    Resize keeping aspect ratio and pad to a size x size square.
+
+    Args:
+        out: optional preallocated (size, size, 3) uint8 output
+        resized: optional preallocated buffer for the resized image, see letterbox_shape()
+
+    Returns:
+        (padded image, scale factor, (pad_x, pad_y))
+    """
+    (new_h, new_w), scale = letterbox_shape(image.shape, size)
+    if resized is not None and resized.shape[:2] == (new_h, new_w):
+        resized = cv2.resize(image, (new_w, new_h), dst=resized, interpolation=cv2.INTER_LINEAR)
+    else:
+        resized = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+
+    pad_x, pad_y = (size - new_w) // 2, (size - new_h) // 2
+    if out is None:
+        padded = np.full((size, size, 3), pad_value, dtype=np.uint8)
+    else:
+        # Only the borders need refilling, the inside is overwritten below
+        padded = out
+        padded[:pad_y] = pad_value
+        padded[pad_y + new_h:] = pad_value
+        padded[:, :pad_x] = pad_value
+        padded[:, pad_x + new_w:] = pad_value
+    padded[pad_y:pad_y + new_h, pad_x:pad_x + new_w] = resized
+    return padded, scale, (pad_x, pad_y)
+
+
+def letterbox_shape(image_shape: Tuple[int, ...], size: int) -> Tuple[Tuple[int, int], float]:
+    """((height, width) of the resized image inside the letterbox, scale factor)"""
+    height, width = image_shape[:2]
+    scale = min(size / width, size / height)
+    return (int(round(height * scale)), int(round(width * scale))), scale
+
+
+def to_yolo_input(image: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    BGR uint8 HWC -> RGB float32 NCHW in [0, 1]
+
+    Args:
+        out: optional preallocated (1, 3, H, W) float32 array to write into
+    """
+    if out is None:
+        rgb = image[:, :, ::-1].transpose(2, 0, 1)
+        return np.ascontiguousarray(rgb, dtype=np.float32)[None] / 255.0
+    for channel in range(3):
+        np.multiply(image[:, :, 2 - channel], np.float32(1 / 255.0), out=out[0, channel], dtype=np.float32)
+    return out
+
+
+def to_depth_input(image: np.ndarray, size: int, out: Optional[np.ndarray] = None,
+                   resized: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    BGR uint8 HWC -> ImageNet-normalized RGB float32 NCHW at size x size
+
+    Args:
+        out: optional preallocated (1, 3, size, size) float32 array to write into
+        resized: optional preallocated (size, size, 3) uint8 buffer for the resize
+    """
+    if out is None:
+        resized = cv2.resize(image, (size, size), interpolation=cv2.INTER_AREA)
+        rgb = resized[:, :, ::-1].astype(np.float32) / 255.0
+        normalized = (rgb - IMAGENET_MEAN) / IMAGENET_STD
+        return np.ascontiguousarray(normalized.transpose(2, 0, 1))[None]
+
+    resized = cv2.resize(image, (size, size), dst=resized, interpolation=cv2.INTER_AREA)
+    # (x / 255 - mean) / std == (x - 255 * mean) / (255 * std), computed in place per channel
+    for channel in range(3):
+        plane = out[0, channel]
+        np.subtract(resized[:, :, 2 - channel], np.float32(IMAGENET_MEAN[channel] * 255.0), out=plane,
+                    dtype=np.float32)
+        plane *= np.float32(1.0 / (IMAGENET_STD[channel] * 255.0))
+    return out
+
+
+def decode_yolo_output(pred: np.ndarray, scale: float, pad: Tuple[int, int], image_shape: Tuple[int, ...],
+                       conf_thresh: float, classes: Iterable[int], iou_thresh: float = 0.45) -> List[Dict]:
+    """
+    Turn raw yolov5 output rows (cx, cy, w, h, obj, cls...) into obstacle dicts.
+
+    Boxes are mapped back to the coordinates of the image that was letterboxed.
+    """
+    class_scores = pred[:, 5:] * pred[:, 4:5]
+    class_ids = class_scores.argmax(axis=1)
+    scores = class_scores[np.arange(len(pred)), class_ids]
+
+    keep = (scores >= conf_thresh) & np.isin(class_ids, list(classes))
+    if not np.any(keep):
+        return []
+    boxes, scores, class_ids = pred[keep, :4], scores[keep], class_ids[keep]
+
+    height, width = image_shape[:2]
+    x1 = np.clip((boxes[:, 0] - boxes[:, 2] / 2 - pad[0]) / scale, 0, width)
+    y1 = np.clip((boxes[:, 1] - boxes[:, 3] / 2 - pad[1]) / scale, 0, height)
+    x2 = np.clip((boxes[:, 0] + boxes[:, 2] / 2 - pad[0]) / scale, 0, width)
+    y2 = np.clip((boxes[:, 1] + boxes[:, 3] / 2 - pad[1]) / scale, 0, height)
+
+    # Offset boxes per class so NMS only suppresses within a class
+    offset = class_ids * 4096.0
+    nms_boxes = np.stack([x1 + offset, y1, x2 - x1, y2 - y1], axis=1).tolist()
+    indices = cv2.dnn.NMSBoxes(nms_boxes, scores.tolist(), conf_thresh, iou_thresh)
+
+    obstacles = []
+    for i in np.array(indices).reshape(-1):
+        center_x = (x1[i] + x2[i]) / 2
+        obstacles.append({
+            'bbox': (float(x1[i]), float(y1[i]), float(x2[i]), float(y2[i])),
+            'class_id': int(class_ids[i]),
+            'label': OBSTACLE_LABELS.get(int(class_ids[i]), str(class_ids[i])),
+            'confidence': float(scores[i]),
+            'position': float(center_x / width * 2 - 1),  # -1 (left) .. 1 (right)
+            'distance': float('inf')
+        })
+    return obstacles
@@ -0,0 +1,146 @@
+import os
+import time
+import logging
+import numpy as np
+from collections import deque
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Callable, Deque, Dict, List, Optional, Sequence
+
+logger = logging.getLogger("VisionGovernor")
+
+THERMAL_ZONE = Path("/sys/class/thermal/thermal_zone0/temp")
+
+
+@dataclass(frozen=True)
+class QualityLevel:
+    scale: float               # processing resolution relative to the camera frame
+    detection_interval: int    # minimum frames between YOLO keyframes
+    depth_interval: int        # frames between MiDaS refreshes
+
+
+def read_cpu_percent() -> float:
+    """System-wide CPU load in percent since the previous call; the load average without psutil."""
+    try:
+        import psutil
+    except ImportError:
+        return min(100.0, os.getloadavg()[0] / (os.cpu_count() or 1) * 100.0)
+    return psutil.cpu_percent(interval=None)
+
+
+def read_soc_temperature() -> Optional[float]:
+    """SoC temperature in degrees C, or None if no sensor is available."""
+    try:
+        import psutil
+        sensors = psutil.sensors_temperatures()
+    except (ImportError, AttributeError, OSError):
+        sensors = {}
+    for name in ('cpu_thermal', 'soc_thermal', 'coretemp', 'k10temp'):
+        if sensors.get(name):
+            return float(sensors[name][0].current)
+    try:
+        return int(THERMAL_ZONE.read_text().strip()) / 1000.0
+    except (OSError, ValueError):
+        return None
+
+
+class PerformanceGovernor:
+    """
+    Steps vision quality down and up to hold a per-frame latency budget.
+
+    Every `window` frames the p90 latency, CPU load and SoC temperature are checked:
+
+    - any of them above its high threshold steps one level down (cheaper) immediately
+    - all of them below their low thresholds, for at least `cooldown` frames since the last
+      change, steps one level up
+
+    The gap between the high and low thresholds plus the cooldown is the hysteresis that
+    keeps the governor from oscillating. Every decision is logged with its inputs.
+    """
+
+    def __init__(self, levels: Sequence[QualityLevel], apply: Callable[[QualityLevel], None],
+                 target_latency_ms: float = 150.0, degrade_ratio: float = 1.1, upgrade_ratio: float = 0.7,
+                 cpu_high: float = 90.0, cpu_low: float = 70.0, temp_high: float = 75.0, temp_low: float = 68.0,
+                 window: int = 30, cooldown: int = 90, start_level: int = 0,
+                 read_cpu: Callable[[], float] = read_cpu_percent,
+                 read_temperature: Callable[[], Optional[float]] = read_soc_temperature):
+        if not levels:
+            raise ValueError("The governor needs at least one quality level")
+        self.levels = list(levels)
+        self.apply = apply
+        self.target_latency_ms = target_latency_ms
+        self.degrade_ratio = degrade_ratio
+        self.upgrade_ratio = upgrade_ratio
+        self.cpu_high, self.cpu_low = cpu_high, cpu_low
+        self.temp_high, self.temp_low = temp_high, temp_low
+        self.window = window
+        self.cooldown = cooldown
+        self.read_cpu = read_cpu
+        self.read_temperature = read_temperature
+
+        self.level = min(max(start_level, 0), len(self.levels) - 1)
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._frames = 0
+        self._frames_since_change = 0
+        self.decisions: Deque[Dict] = deque(maxlen=200)
+        self.apply(self.levels[self.level])
+
+    @property
+    def current(self) -> QualityLevel:
+        return self.levels[self.level]
+
+    def observe(self, latency_ms: float) -> None:
+        """Record one frame's latency and re-evaluate at the end of each window."""
+        self._latencies.append(latency_ms)
+        self._frames += 1
+        self._frames_since_change += 1
+        if self._frames % self.window == 0:
+            self.evaluate()
+
+    def evaluate(self) -> Optional[str]:
+        """
+        Decide whether to change level.
+
+        Returns:
+            'degrade', 'upgrade' or None when the level is held
+        """
+        latency = float(np.percentile(self._latencies, 90)) if self._latencies else 0.0
+        cpu = self.read_cpu()
+        temperature = self.read_temperature()
+
+        reasons: List[str] = []
+        if latency > self.target_latency_ms * self.degrade_ratio:
+            reasons.append(f"p90 latency {latency:.0f} ms > {self.target_latency_ms * self.degrade_ratio:.0f} ms")
+        if cpu >= self.cpu_high:
+            reasons.append(f"cpu {cpu:.0f}% >= {self.cpu_high:.0f}%")
+        if temperature is not None and temperature >= self.temp_high:
+            reasons.append(f"soc {temperature:.1f}C >= {self.temp_high:.1f}C")
+
+        action = None
+        if reasons and self.level < len(self.levels) - 1:
+            action = 'degrade'
+            self._set_level(self.level + 1)
+        elif (not reasons and self.level > 0
+              and self._frames_since_change >= self.cooldown
+              and latency < self.target_latency_ms * self.upgrade_ratio
+              and cpu < self.cpu_low
+              and (temperature is None or temperature < self.temp_low)):
+            action = 'upgrade'
+            reasons.append(f"p90 latency {latency:.0f} ms, cpu {cpu:.0f}%, soc {temperature}C all below low marks")
+            self._set_level(self.level - 1)
+
+        decision = {
+            'time': time.time(), 'action': action or 'hold', 'level': self.level,
+            'latency_p90_ms': latency, 'cpu_percent': cpu, 'soc_temp_c': temperature,
+            'reasons': reasons, **asdict(self.current)
+        }
+        self.decisions.append(decision)
+        log = logger.info if action else logger.debug
+        log(f"Governor {decision['action']}: level {self.level} {asdict(self.current)} "
+            f"(p90 {latency:.0f} ms, cpu {cpu:.0f}%, soc {temperature}C) {'; '.join(reasons)}")
+        return action
+
+    def _set_level(self, level: int) -> None:
+        self.level = level
+        self._frames_since_change = 0
+        self.apply(self.levels[level])
@@ -0,0 +1,205 @@
+import cv2
+import time
+import numpy as np
+from typing import Dict, Optional, Tuple
+
+
+class LaneDetector:
+    """
+    Lane finder producing the normalized center/curvature Traverser consumes.
+
+    Each side is modelled as x = a*y^2 + b*y + c in ROI pixels. Without a lock the full ROI
+    is searched with probabilistic Hough segments, which are split into left/right by slope.
+    Once a frame's confidence reaches `lock_confidence`, the next frames only fit the Canny
+    edge pixels inside a band of +-`band_width` pixels around the previous fit. If the band
+    result drops below `min_confidence`, the same frame is searched again in full.
+    """
+
+    def __init__(self, canny_thresh1: int = 50, canny_thresh2: int = 150, hough_thresh: int = 50,
+                 band_width: int = 40, lock_confidence: float = 0.6, min_confidence: float = 0.3,
+                 min_slope: float = 0.3, smoothing: float = 0.5,
+                 xm_per_pix: float = 0.005, ym_per_pix: float = 0.02):
+        self.canny_thresh1 = canny_thresh1
+        self.canny_thresh2 = canny_thresh2
+        self.hough_thresh = hough_thresh
+        self.band_width = band_width
+        self.lock_confidence = lock_confidence
+        self.min_confidence = min_confidence
+        self.min_slope = min_slope
+        self.smoothing = smoothing
+        self.xm_per_pix = xm_per_pix
+        self.ym_per_pix = ym_per_pix
+
+        self.left_fit: Optional[np.ndarray] = None
+        self.right_fit: Optional[np.ndarray] = None
+        self.locked = False
+        self.lane_width_px: Optional[float] = None
+
+    def reset(self) -> None:
+        self.left_fit = self.right_fit = None
+        self.locked = False
+
+    def detect(self, roi: np.ndarray) -> Dict:
+        """
+        Find lanes in the ROI.
+
+        Returns:
+            Dict with center and boundaries normalized to -1 (left edge) .. 1 (right edge),
+            curvature in 1/m, confidence in 0..1, the search mode used, the line segments
+            to draw, and per-stage timings in milliseconds
+        """
+        timings = {}
+        start = time.perf_counter()
+        gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY) if roi.ndim == 3 else roi
+        blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+        timings['preprocess'] = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        edges = cv2.Canny(blurred, self.canny_thresh1, self.canny_thresh2)
+        timings['edges'] = (time.perf_counter() - start) * 1000
+
+        height, width = edges.shape
+        start = time.perf_counter()
+        mode = 'band' if self.locked else 'full'
+        fits = self._band_search(edges) if self.locked else None
+        if fits is None or min(fits[2], fits[3]) < self.min_confidence:
+            mode = 'full'
+            fits = self._full_search(edges)
+        timings['search'] = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        result = self._update_state(*fits, height=height, width=width)
+        timings['fit'] = (time.perf_counter() - start) * 1000
+
+        result['mode'] = mode
+        result['timings'] = timings
+        return result
+
+    def _full_search(self, edges: np.ndarray) -> Tuple[Optional[np.ndarray], Optional[np.ndarray], float, float]:
+        segments = cv2.HoughLinesP(edges, 1, np.pi / 180, self.hough_thresh,
+                                   minLineLength=edges.shape[0] // 8, maxLineGap=edges.shape[0] // 10)
+        if segments is None:
+            return None, None, 0.0, 0.0
+        segments = segments.reshape(-1, 4).astype(np.float32)
+        x1, y1, x2, y2 = segments.T
+        dx = np.where(np.abs(x2 - x1) < 1e-6, 1e-6, x2 - x1)
+        slopes = (y2 - y1) / dx
+        mid_x = (x1 + x2) / 2
+        center_x = edges.shape[1] / 2
+
+        # Image y grows downward: left lane lines have negative slope, right ones positive
+        steep = np.abs(slopes) >= self.min_slope
+        left = steep & (slopes < 0) & (mid_x < center_x)
+        right = steep & (slopes > 0) & (mid_x > center_x)
+
+        left_fit, left_conf = self._fit_points(*self._segment_points(segments[left]), edges.shape[0])
+        right_fit, right_conf = self._fit_points(*self._segment_points(segments[right]), edges.shape[0])
+        return left_fit, right_fit, left_conf, right_conf
+
+    @staticmethod
+    def _segment_points(segments: np.ndarray, samples: int = 8) -> Tuple[np.ndarray, np.ndarray]:
+        """Sample points along every segment at once, weighted toward longer segments."""
+        if len(segments) == 0:
+            return np.zeros(0), np.zeros(0)
+        t = np.linspace(0, 1, samples)
+        xs = segments[:, 0:1] + (segments[:, 2:3] - segments[:, 0:1]) * t
+        ys = segments[:, 1:2] + (segments[:, 3:4] - segments[:, 1:2]) * t
+        return xs.ravel(), ys.ravel()
+
+    def _band_search(self, edges: np.ndarray) -> Tuple[Optional[np.ndarray], Optional[np.ndarray], float, float]:
+        ys, xs = np.nonzero(edges)
+        if len(xs) == 0:
+            return None, None, 0.0, 0.0
+        ys_f = ys.astype(np.float32)
+
+        fits, confs = [], []
+        for previous in (self.left_fit, self.right_fit):
+            if previous is None:
+                fits.append(None)
+                confs.append(0.0)
+                continue
+            in_band = np.abs(xs - np.polyval(previous, ys_f)) < self.band_width
+            fit, conf = self._fit_points(xs[in_band], ys[in_band], edges.shape[0])
+            fits.append(fit)
+            confs.append(conf)
+        return fits[0], fits[1], confs[0], confs[1]
+
+    @staticmethod
+    def _fit_points(xs: np.ndarray, ys: np.ndarray, height: int) -> Tuple[Optional[np.ndarray], float]:
+        """
+        Second-order fit x(y) and a confidence from row coverage and residual spread.
+
+        Returns:
+            (coefficients or None, confidence)
+        """
+        if len(xs) < 6:
+            return None, 0.0
+        ys = np.asarray(ys, dtype=np.float32)
+        xs = np.asarray(xs, dtype=np.float32)
+        coverage = len(np.unique((ys * 10 / max(height, 1)).astype(np.int32))) / 10
+        degree = 2 if coverage >= 0.5 else 1
+        fit = np.polyfit(ys, xs, degree)
+        if degree == 1:
+            fit = np.concatenate([[0.0], fit])
+
+        residual = np.std(xs - np.polyval(fit, ys))
+        confidence = float(np.clip(coverage, 0, 1) / (1.0 + residual / 10.0))
+        return fit, confidence
+
+    def _update_state(self, left_fit, right_fit, left_conf, right_conf, height, width) -> Dict:
+        y_eval = float(height - 1)
+
+        # Infer a missing side from the last known lane width
+        if left_fit is None and right_fit is not None and self.lane_width_px:
+            left_fit = right_fit - np.array([0.0, 0.0, self.lane_width_px])
+            left_conf = right_conf * 0.5
+        elif right_fit is None and left_fit is not None and self.lane_width_px:
+            right_fit = left_fit + np.array([0.0, 0.0, self.lane_width_px])
+            right_conf = left_conf * 0.5
+
+        confidence = (left_conf + right_conf) / 2
+        if left_fit is None or right_fit is None:
+            # Lanes lost: forget the old fits so they neither get searched around nor blended in later
+            self.reset()
+            return {'center': 0.0, 'curvature': 0.0, 'left_boundary': -1.0, 'right_boundary': 1.0,
+                    'confidence': 0.0, 'lines': []}
+
+        # Exponential smoothing of the coefficients keeps frame-to-frame jitter out of steering
+        if self.left_fit is not None and self.right_fit is not None:
+            left_fit = self.smoothing * self.left_fit + (1 - self.smoothing) * left_fit
+            right_fit = self.smoothing * self.right_fit + (1 - self.smoothing) * right_fit
+        if confidence >= self.min_confidence:
+            self.left_fit, self.right_fit = left_fit, right_fit
+        else:
+            # Too weak to build on; the next frame starts from its own fits
+            self.left_fit = self.right_fit = None
+        self.locked = confidence >= self.lock_confidence
+
+        left_x, right_x = np.polyval(left_fit, y_eval), np.polyval(right_fit, y_eval)
+        if right_x > left_x:
+            self.lane_width_px = float(right_x - left_x)
+        half_width = width / 2
+
+        return {
+            'center': float(((left_x + right_x) / 2 - half_width) / half_width),
+            'curvature': float((self._curvature(left_fit, y_eval) + self._curvature(right_fit, y_eval)) / 2),
+            'left_boundary': float((left_x - half_width) / half_width),
+            'right_boundary': float((right_x - half_width) / half_width),
+            'confidence': float(confidence),
+            'left_fit': left_fit.tolist(),
+            'right_fit': right_fit.tolist(),
+            'lines': self._fit_segments(left_fit, height) + self._fit_segments(right_fit, height),
+        }
+
+    def _curvature(self, fit: np.ndarray, y_eval: float) -> float:
+        """Signed curvature in 1/m of x(y) at row y_eval."""
+        a = fit[0] * self.xm_per_pix / (self.ym_per_pix ** 2)
+        b = fit[1] * self.xm_per_pix / self.ym_per_pix
+        y = y_eval * self.ym_per_pix
+        return float(2 * a / (1 + (2 * a * y + b) ** 2) ** 1.5)
+
+    @staticmethod
+    def _fit_segments(fit: np.ndarray, height: int, pieces: int = 4) -> list:
+        ys = np.linspace(0, height - 1, pieces + 1)
+        xs = np.polyval(fit, ys)
+        return [(xs[i], ys[i], xs[i + 1], ys[i + 1]) for i in range(pieces)]
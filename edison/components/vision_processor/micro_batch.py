@@ -0,0 +1,165 @@
+import time
+import logging
+import threading
+import numpy as np
+from typing import Any, Callable, Dict, List, Optional
+
+from edison.helpers.buffer_pool import Allocator, BufferPool
+from edison.helpers.resource_plan import configure_thread
+
+logger = logging.getLogger("MicroBatcher")
+
+
+class _Request:
+    __slots__ = ('inputs', 'output', 'error', 'done')
+
+    def __init__(self, inputs: np.ndarray):
+        self.inputs = inputs
+        self.output: Any = None
+        self.error: Optional[BaseException] = None
+        self.done = threading.Event()
+
+
+class MicroBatcher:
+    """
+    Collects single-item inference requests from several threads into one forward pass.
+
+    `infer()` blocks the caller until its result is ready. The batching thread takes the
+    first pending request, waits up to `max_wait` seconds for more (stopping early once
+    `max_batch` are queued), stacks their inputs along axis 0 and calls `forward` once. Each
+    caller gets back its own slice of the output, still with a batch dimension of 1.
+
+    If `forward` fails on a batch larger than one, or returns a different number of items
+    (e.g. a model traced with a fixed batch size), batching is switched off and requests
+    are run one by one from then on.
+    """
+
+    def __init__(self, forward: Callable[[np.ndarray], Any], max_batch: int = 2, max_wait: float = 0.01,
+                 name: str = "batch", allocator: Optional[Allocator] = None):
+        if max_batch < 1:
+            raise ValueError(f"max_batch must be at least 1. Got: {max_batch}")
+        self.forward = forward
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.name = name
+        self.allocator = allocator
+        self.batching = True
+
+        self.batches = 0
+        self.items = 0
+        self.batch_sizes: Dict[int, int] = {}
+
+        self._buffers = BufferPool()
+        self._pending: List[_Request] = []
+        self._cond = threading.Condition()
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, name=f"micro-batch-{name}", daemon=True)
+        self._thread.start()
+
+    def infer(self, inputs: np.ndarray, timeout: Optional[float] = None) -> Any:
+        """
+        Run one item (with a leading batch dimension of 1) as part of the next batch.
+
+        The input array must not be modified until this returns.
+        """
+        request = _Request(inputs)
+        with self._cond:
+            if not self._running:
+                raise RuntimeError(f"Micro-batcher '{self.name}' is stopped")
+            self._pending.append(request)
+            self._cond.notify_all()
+        if not request.done.wait(timeout):
+            raise TimeoutError(f"Micro-batcher '{self.name}' did not answer within {timeout} s")
+        if request.error is not None:
+            raise request.error
+        return request.output
+
+    def stop(self) -> None:
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        self._thread.join(timeout=1.0)
+
+    def stats(self) -> Dict[str, Any]:
+        """Forward calls, items served and how many calls ran at each batch size."""
+        return {
+            'batches': self.batches,
+            'items': self.items,
+            'mean_batch_size': self.items / self.batches if self.batches else 0.0,
+            'batch_sizes': dict(sorted(self.batch_sizes.items())),
+            'batching': self.batching,
+        }
+
+    def _next_batch(self) -> List[_Request]:
+        with self._cond:
+            self._cond.wait_for(lambda: self._pending or not self._running)
+            if not self._pending:
+                return []
+            deadline = time.monotonic() + self.max_wait
+            while self._running and len(self._pending) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            # Only inputs of the same shape can be stacked
+            shape = self._pending[0].inputs.shape
+            batch = [r for r in self._pending if r.inputs.shape == shape][:self.max_batch]
+            self._pending = [r for r in self._pending if all(r is not b for b in batch)]
+            return batch
+
+    def _loop(self) -> None:
+        configure_thread('inference')
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                with self._cond:
+                    if not self._running:
+                        break
+                continue
+            if len(batch) > 1 and self.batching:
+                self._run_batched(batch)
+            else:
+                for request in batch:
+                    self._run_single(request)
+
+        with self._cond:
+            pending, self._pending = self._pending, []
+        for request in pending:
+            request.error = RuntimeError(f"Micro-batcher '{self.name}' stopped")
+            request.done.set()
+
+    def _run_batched(self, batch: List[_Request]) -> None:
+        first = batch[0].inputs
+        stacked = self._buffers.get(f"batch{len(batch)}", (len(batch),) + first.shape[1:], first.dtype,
+                                    allocator=self.allocator)
+        np.concatenate([r.inputs for r in batch], axis=0, out=stacked)
+        try:
+            output = self.forward(stacked)
+            # A graph traced with batch size 1 may also return one item without failing
+            size = getattr(output, 'shape', (None,))[0]
+            if size != len(batch):
+                raise ValueError(f"output batch size {size} does not match {len(batch)} inputs")
+        except Exception as e:
+            logger.warning(f"{self.name}: batched forward failed ({str(e)}), running items one by one")
+            self.batching = False
+            for request in batch:
+                self._run_single(request)
+            return
+        self._count(len(batch))
+        for i, request in enumerate(batch):
+            request.output = output[i:i + 1]
+            request.done.set()
+
+    def _run_single(self, request: _Request) -> None:
+        try:
+            request.output = self.forward(request.inputs)
+        except Exception as e:
+            request.error = e
+        self._count(1)
+        request.done.set()
+
+    def _count(self, size: int) -> None:
+        self.batches += 1
+        self.items += size
+        self.batch_sizes[size] = self.batch_sizes.get(size, 0) + 1
@@ -0,0 +1,250 @@
+import time
+import logging
+import threading
+import http.client
+import numpy as np
+from urllib.parse import urlsplit
+from typing import Callable, Dict, Optional, Tuple
+
+from edison.helpers.resource_plan import configure_thread
+
+logger = logging.getLogger("MJPEGCapture")
+
+SOI = b'\xff\xd8'  # JPEG start of image
+EOI = b'\xff\xd9'  # JPEG end of image
+
+# Same ids as cv2.CAP_PROP_*, so MJPEGCapture can stand in for a cv2.VideoCapture
+CAP_PROP_POS_MSEC = 0
+CAP_PROP_FRAME_WIDTH = 3
+CAP_PROP_FRAME_HEIGHT = 4
+CAP_PROP_FPS = 5
+
+
+def _default_decode(data: bytearray) -> Optional[np.ndarray]:
+    import cv2
+    return cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+
+class JPEGFrameParser:
+    """
+    Finds complete JPEG images in an MJPEG byte stream, fed in arbitrary chunks.
+
+    Frames are delimited by their SOI/EOI markers, so multipart headers and boundaries in
+    between are skipped without parsing them. Scanning resumes where the previous chunk
+    stopped instead of starting over, and consumed bytes are dropped from the front of one
+    reusable bytearray.
+    """
+
+    def __init__(self, max_buffer: int = 8 * 1024 * 1024):
+        self.max_buffer = max_buffer
+        self.buffer = bytearray()
+        self._start = -1  # offset of the SOI of the frame being received, -1 if none
+        self._scan = 0    # offset to resume searching from
+
+    def reset(self) -> None:
+        self.buffer.clear()
+        self._start = -1
+        self._scan = 0
+
+    def feed(self, data, out: bytearray) -> int:
+        """
+        Append a chunk and copy the newest complete JPEG in the buffer into `out`.
+
+        Returns:
+            How many complete frames were found; all but the last one are skipped
+        """
+        self.buffer += data
+        newest = None
+        found = 0
+        while True:
+            if self._start < 0:
+                start = self.buffer.find(SOI, self._scan)
+                if start < 0:
+                    # The last byte may be the first half of a marker
+                    self._scan = max(len(self.buffer) - 1, 0)
+                    break
+                self._start, self._scan = start, start + 2
+            end = self.buffer.find(EOI, self._scan)
+            if end < 0:
+                self._scan = max(len(self.buffer) - 1, self._start + 2)
+                break
+            newest = (self._start, end + 2)
+            found += 1
+            self._start, self._scan = -1, end + 2
+
+        if newest is not None:
+            with memoryview(self.buffer) as view:
+                out[:] = view[newest[0]:newest[1]]
+
+        consumed = self._start if self._start >= 0 else self._scan
+        if consumed:
+            del self.buffer[:consumed]
+            self._scan -= consumed
+            if self._start >= 0:
+                self._start -= consumed
+        if len(self.buffer) > self.max_buffer:
+            logger.warning(f"No complete JPEG in {len(self.buffer)} bytes, dropping the buffer")
+            self.reset()
+        return found
+
+
+class MJPEGCapture:
+    """
+    Reads an MJPEG-over-HTTP stream (e.g. DroidCam's /video) on a persistent connection.
+
+    A background thread receives and splits the stream and keeps only the newest complete
+    JPEG; `read()` decodes that one, so frames that arrive while the caller is busy are never
+    decoded. The interface mirrors the parts of cv2.VideoCapture the vision code uses.
+    """
+
+    def __init__(self, url: str, timeout: float = 5.0, reconnect_delay: float = 1.0, chunk_size: int = 65536,
+                 decode: Optional[Callable[[bytearray], Optional[np.ndarray]]] = None):
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError(f"Expected an http(s) URL. Got: {url}")
+        self.url = url
+        self._connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        self._host = parts.hostname
+        self._port = parts.port
+        self._path = (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+        self.timeout = timeout
+        self.reconnect_delay = reconnect_delay
+        self.chunk_size = chunk_size
+        self.decode = decode or _default_decode
+
+        self._parser = JPEGFrameParser()
+        self._incoming = bytearray()  # written by the reader thread
+        self._latest = bytearray()    # newest complete frame, swapped with _incoming under the lock
+        self._decoding = bytearray()  # copy read() decodes from, outside the lock
+        self._cond = threading.Condition()
+        self._seq = 0
+        self._read_seq = 0
+        self._latest_time = 0.0
+        self._opened_at = time.monotonic()
+        self._fps = 0.0
+        self._pending: Optional[np.ndarray] = None
+
+        self.frames_received = 0
+        self.frames_decoded = 0
+        self.frames_skipped = 0
+        self.reconnects = 0
+
+        self.frame_width = 0
+        self.frame_height = 0
+        self._running = True
+        self._thread = threading.Thread(target=self._reader_loop, name="mjpeg-reader", daemon=True)
+        self._thread.start()
+
+        # Block until the first frame so isOpened() and the frame size mean the same as for OpenCV
+        ret, frame = self.read(timeout=timeout)
+        if ret:
+            self.frame_height, self.frame_width = frame.shape[:2]
+            self._pending = frame
+        else:
+            logger.error(f"No frame from {url} within {timeout} s")
+            self.release()
+
+    def isOpened(self) -> bool:
+        return self._running
+
+    def read(self, image: Optional[np.ndarray] = None, timeout: Optional[float] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        Decode the newest frame that has not been returned yet, waiting for one if needed.
+
+        `image` is accepted for cv2.VideoCapture compatibility; decoding always produces a
+        new array.
+        """
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            return True, pending
+
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._seq > self._read_seq or not self._running,
+                                       self.timeout if timeout is None else timeout):
+                return False, None
+            if self._seq <= self._read_seq:
+                return False, None
+            self.frames_skipped += self._seq - self._read_seq - 1
+            self._read_seq = self._seq
+            self._decoding[:] = self._latest
+
+        frame = self.decode(self._decoding)
+        if frame is None:
+            logger.warning("Failed to decode a JPEG frame")
+            return False, None
+        self.frames_decoded += 1
+        return True, frame
+
+    def get(self, prop: int) -> float:
+        if prop == CAP_PROP_FRAME_WIDTH:
+            return float(self.frame_width)
+        if prop == CAP_PROP_FRAME_HEIGHT:
+            return float(self.frame_height)
+        if prop == CAP_PROP_FPS:
+            return self._fps
+        if prop == CAP_PROP_POS_MSEC:
+            return (self._latest_time - self._opened_at) * 1000
+        return 0.0
+
+    def set(self, prop: int, value: float) -> bool:
+        # Buffering is already "newest frame only"; nothing else is configurable
+        return False
+
+    def release(self) -> None:
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.timeout + 1)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            'received': self.frames_received,
+            'decoded': self.frames_decoded,
+            'skipped': self.frames_skipped,
+            'reconnects': self.reconnects,
+            'fps': self._fps,
+        }
+
+    def _reader_loop(self) -> None:
+        configure_thread('capture')
+        while self._running:
+            connection = None
+            try:
+                connection = self._connection_class(self._host, self._port, timeout=self.timeout)
+                connection.request('GET', self._path, headers={'Connection': 'keep-alive'})
+                response = connection.getresponse()
+                if response.status != 200:
+                    raise ConnectionError(f"HTTP {response.status} {response.reason}")
+                self._parser.reset()
+                self._receive(response)
+            except (OSError, http.client.HTTPException) as e:
+                if self._running:
+                    logger.warning(f"MJPEG stream {self.url} interrupted: {str(e)}")
+            finally:
+                if connection is not None:
+                    connection.close()
+            with self._cond:
+                if self._cond.wait_for(lambda: not self._running, self.reconnect_delay):
+                    break
+            self.reconnects += 1
+
+    def _receive(self, response: http.client.HTTPResponse) -> None:
+        while self._running:
+            data = response.read1(self.chunk_size)
+            if not data:
+                raise ConnectionError("stream closed by the server")
+            found = self._parser.feed(data, self._incoming)
+            if not found:
+                continue
+
+            now = time.monotonic()
+            with self._cond:
+                if self._latest_time:
+                    rate = found / max(now - self._latest_time, 1e-6)
+                    self._fps = rate if not self._fps else 0.9 * self._fps + 0.1 * rate
+                self._latest, self._incoming = self._incoming, self._latest
+                self._latest_time = now
+                self._seq += found
+                self.frames_received += found
+                self._cond.notify_all()
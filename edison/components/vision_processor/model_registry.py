@@ -0,0 +1,167 @@
+import time
+import logging
+import torch
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+
+from edison.components.vision_processor.quantization import (
+    iter_clip_rois, model_input, quantize, set_quantized_engine
+)
+
+logger = logging.getLogger("ModelRegistry")
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    hub_repo: str
+    hub_name: str
+    input_shape: Tuple[int, int, int, int]  # NCHW shape the artifact is traced with
+    hub_kwargs: Dict[str, Any] = field(default_factory=dict)
+
+
+def default_specs(yolo_input_size: int = 320, depth_input_size: int = 256) -> Dict[str, ModelSpec]:
+    """Specs for the models the vision processor uses."""
+    return {
+        'yolov5n': ModelSpec(
+            hub_repo='ultralytics/yolov5',
+            hub_name='yolov5n',
+            input_shape=(1, 3, yolo_input_size, yolo_input_size),
+            hub_kwargs={'pretrained': True, 'autoshape': False}
+        ),
+        'midas_small': ModelSpec(
+            hub_repo='intel-isl/MiDaS',
+            hub_name='MiDaS_small',
+            input_shape=(1, 3, depth_input_size, depth_input_size)
+        ),
+    }
+
+
+class ModelRegistry:
+    """
+    Exports hub models once to local TorchScript artifacts and loads them offline.
+
+    Each model is stored as `<name>[.<precision>].torchscript.pt` plus a matching
+    `.weights.pt` state dict. On load the scripted module's parameters are rebound to the
+    memory-mapped state dict, so weight pages are read lazily and shared between processes
+    using the same artifact. int8 variants are exported side by side with the fp32 ones.
+    """
+
+    def __init__(self, model_dir: Union[str, Path], specs: Optional[Dict[str, ModelSpec]] = None,
+                 mmap_weights: bool = True, warmup_runs: int = 2, quantized_engine: str = 'qnnpack'):
+        self.model_dir = Path(model_dir)
+        self.specs = specs if specs is not None else default_specs()
+        self.mmap_weights = mmap_weights
+        self.warmup_runs = warmup_runs
+        self.quantized_engine = quantized_engine
+        self.timings: Dict[str, Dict[str, Any]] = {}
+
+    def _stem(self, name: str, precision: str) -> str:
+        return name if precision == 'fp32' else f"{name}.{precision}"
+
+    def artifact_path(self, name: str, precision: str = 'fp32') -> Path:
+        return self.model_dir / f"{self._stem(name, precision)}.torchscript.pt"
+
+    def weights_path(self, name: str, precision: str = 'fp32') -> Path:
+        return self.model_dir / f"{self._stem(name, precision)}.weights.pt"
+
+    def _spec(self, name: str) -> ModelSpec:
+        if name not in self.specs:
+            raise KeyError(f"Unknown model '{name}'. Known models: {sorted(self.specs)}")
+        return self.specs[name]
+
+    def export(self, name: str, force: bool = False, precision: str = 'fp32',
+               calibration_clips: Sequence[str] = (), roi_ratio: Tuple[float, float] = (0.4, 0.8),
+               calibration_frames: int = 200) -> Path:
+        """
+        Download the model through torch.hub (needs network once) and trace it to disk.
+
+        Args:
+            precision: 'fp32', 'int8_dynamic' or 'int8_static'
+            calibration_clips: Recorded videos whose ROI crops calibrate int8_static
+
+        Returns:
+            Path of the TorchScript artifact
+        """
+        spec = self._spec(name)
+        artifact = self.artifact_path(name, precision)
+        if artifact.exists() and not force:
+            return artifact
+
+        self.model_dir.mkdir(parents=True, exist_ok=True)
+        model = torch.hub.load(spec.hub_repo, spec.hub_name, **spec.hub_kwargs)
+        # yolov5 without AutoShape comes wrapped in DetectMultiBackend
+        if type(model).__name__ == 'DetectMultiBackend':
+            model = model.model
+        model = model.float().eval()
+
+        example = torch.zeros(spec.input_shape)
+
+        def calibration_inputs():
+            for roi in iter_clip_rois(calibration_clips, roi_ratio, calibration_frames):
+                yield model_input(name, roi, spec.input_shape)
+
+        model, applied = quantize(model, precision, example, calibration_inputs, self.quantized_engine)
+        # Artifacts are named after what was applied, so load() never picks up a mislabeled model
+        artifact = self.artifact_path(name, applied)
+
+        with torch.no_grad():
+            traced = torch.jit.trace(model, example, strict=False)
+        traced.save(str(artifact))
+        torch.save(traced.state_dict(), self.weights_path(name, applied))
+        logger.info(f"Exported {spec.hub_repo}:{spec.hub_name} ({applied}) to {artifact}")
+        return artifact
+
+    def load(self, name: str, warmup: bool = True, precision: str = 'fp32') -> torch.jit.ScriptModule:
+        """Load a model from its local artifact without touching the network."""
+        self._spec(name)
+        artifact = self.artifact_path(name, precision)
+        if not artifact.exists():
+            raise FileNotFoundError(
+                f"No {precision} artifact for '{name}' at {artifact}. "
+                "Run scripts/export_models.py once with network access."
+            )
+        if precision != 'fp32':
+            set_quantized_engine(self.quantized_engine)
+
+        start = time.perf_counter()
+        module = torch.jit.load(str(artifact), map_location='cpu')
+        # Packed int8 weights live in opaque objects, only fp32 tensors can be rebound
+        if self.mmap_weights and precision == 'fp32' and self.weights_path(name).exists():
+            self._rebind_to_mmap(module, self.weights_path(name))
+        module.eval()
+        load_time = time.perf_counter() - start
+        self.timings[name] = {'load_s': load_time, 'precision': precision}
+
+        if warmup:
+            self.warmup(name, module)
+        logger.info(f"Loaded {name} in {load_time * 1000:.1f} ms")
+        return module
+
+    def warmup(self, name: str, module: torch.nn.Module) -> None:
+        """Run dummy inferences so the first real frame doesn't pay JIT/allocation cost."""
+        example = torch.zeros(self._spec(name).input_shape)
+        timings = self.timings.setdefault(name, {})
+        with torch.inference_mode():
+            for i in range(self.warmup_runs):
+                start = time.perf_counter()
+                module(example)
+                elapsed = time.perf_counter() - start
+                if i == 0:
+                    timings['first_run_s'] = elapsed
+                timings['last_warmup_s'] = elapsed
+
+    @staticmethod
+    def _rebind_to_mmap(module: torch.nn.Module, weights_path: Path) -> None:
+        try:
+            state = torch.load(str(weights_path), map_location='cpu', mmap=True, weights_only=True)
+        except TypeError:
+            logger.warning("This torch version cannot memory-map weights, keeping in-memory copy")
+            return
+
+        tensors = dict(module.named_parameters())
+        tensors.update(module.named_buffers())
+        for tensor_name, tensor in tensors.items():
+            mapped = state.get(tensor_name)
+            if mapped is not None and mapped.shape == tensor.shape:
+                tensor.data = mapped
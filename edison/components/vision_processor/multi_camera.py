@@ -0,0 +1,129 @@
+import logging
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Union
+
+import config
+from edison.components.vision_processor.micro_batch import MicroBatcher
+from edison.components.vision_processor.pipeline import FrameResult, VisionPipeline
+from edison.components.vision_processor.vision_processor import VisionProcessor
+from edison.helpers.buffer_pool import pinned_allocator
+
+logger = logging.getLogger("MultiCameraVision")
+
+ALL_SOURCES = "*"
+
+
+class MultiCameraVision:
+    """
+    Runs the vision stack on several cameras at once with shared, micro-batched models.
+
+    Every source gets its own VisionProcessor (calibration, tracks, lane lock, depth schedule)
+    and VisionPipeline (capture, inference and post threads), but all of them share one copy
+    of the models. YOLO and MiDaS calls from the per-camera inference threads go through a
+    MicroBatcher each, so frames that arrive close together run in one forward pass.
+
+    Results are FrameResults tagged with `source_id` and capture timestamps, delivered to the
+    callbacks registered with `subscribe(source_id, callback)`.
+    """
+
+    def __init__(self, sources: Dict[str, Union[int, str]], max_wait_ms: float = 10.0,
+                 asynchronous_depth: Optional[bool] = None):
+        if not sources:
+            raise ValueError("At least one camera source is required")
+        self.sources = dict(sources)
+        self._subscribers: Dict[str, List[Callable[[FrameResult], None]]] = defaultdict(list)
+        self._latest: Dict[str, FrameResult] = {}
+        self._lock = threading.Lock()
+
+        self.processors: Dict[str, VisionProcessor] = {}
+        self.pipelines: Dict[str, VisionPipeline] = {}
+        primary = None
+        for source_id, source in self.sources.items():
+            processor = VisionProcessor(camera_index=source, asynchronous_depth=asynchronous_depth,
+                                        shared_models=primary)
+            primary = primary or processor
+            self.processors[source_id] = processor
+
+        batch_size = len(self.sources)
+        self.yolo_batcher = MicroBatcher(lambda batch: VisionProcessor.run_model(primary.obj_model, batch),
+                                         max_batch=batch_size, max_wait=max_wait_ms / 1000, name="yolo",
+                                         allocator=pinned_allocator)
+        self.depth_batcher = MicroBatcher(lambda batch: VisionProcessor.run_model(primary.depth_model, batch),
+                                          max_batch=batch_size, max_wait=max_wait_ms / 1000, name="depth",
+                                          allocator=pinned_allocator)
+
+        for source_id, processor in self.processors.items():
+            processor.yolo_batcher = self.yolo_batcher
+            processor.depth_batcher = self.depth_batcher
+            self.pipelines[source_id] = VisionPipeline(
+                processor,
+                inference_queue_size=config.VISION_PIPELINE_CONFIG['inference_queue_size'],
+                result_queue_size=config.VISION_PIPELINE_CONFIG['result_queue_size'],
+                on_result=self._route,
+                source_id=source_id
+            )
+        logger.info(f"Multi-camera vision ready: {self.sources}")
+
+    def subscribe(self, source_id: str, callback: Callable[[FrameResult], None]) -> None:
+        """
+        Deliver every completed result of one camera (or of all, with "*") to `callback`.
+
+        Callbacks run on that camera's post-processing thread and must copy any frame data
+        they keep.
+        """
+        if source_id != ALL_SOURCES and source_id not in self.sources:
+            raise KeyError(f"Unknown camera source: {source_id}")
+        with self._lock:
+            self._subscribers[source_id].append(callback)
+
+    def latest(self, source_id: str) -> Optional[FrameResult]:
+        """Newest completed result of one camera (its frame buffers may already be recycled)."""
+        with self._lock:
+            return self._latest.get(source_id)
+
+    def start(self) -> None:
+        for pipeline in self.pipelines.values():
+            pipeline.start()
+
+    def stop(self) -> None:
+        for pipeline in self.pipelines.values():
+            pipeline.stop()
+        self.yolo_batcher.stop()
+        self.depth_batcher.stop()
+        for processor in self.processors.values():
+            processor.release()
+
+    def stats(self) -> Dict[str, Dict]:
+        stats = {source_id: pipeline.stats() for source_id, pipeline in self.pipelines.items()}
+        stats['batching'] = {'yolo': self.yolo_batcher.stats(), 'depth': self.depth_batcher.stats()}
+        return stats
+
+    def _route(self, result: FrameResult) -> None:
+        with self._lock:
+            self._latest[result.source_id] = result
+            callbacks = self._subscribers[result.source_id] + self._subscribers[ALL_SOURCES]
+        for callback in callbacks:
+            try:
+                callback(result)
+            except Exception as e:
+                logger.error(f"Subscriber for camera '{result.source_id}' failed: {str(e)}")
+
+
+if __name__ == "__main__":
+    import time
+
+    logging.basicConfig(level=logging.INFO)
+    cameras = MultiCameraVision(config.MULTI_CAMERA_CONFIG['sources'],
+                                max_wait_ms=config.MULTI_CAMERA_CONFIG['max_wait_ms'])
+    cameras.subscribe(ALL_SOURCES, lambda result: print(
+        f"[{result.source_id}] #{result.seq} @ {result.timestamp:.3f}: {len(result.obstacles)} obstacles"))
+    cameras.start()
+    try:
+        while True:
+            time.sleep(5)
+            logger.info(f"Stats: {cameras.stats()}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        cameras.stop()
@@ -0,0 +1,219 @@
+import time
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from edison.helpers.buffer_pool import BufferPool
+from edison.helpers.resource_plan import configure_thread
+
+logger = logging.getLogger("VisionPipeline")
+
+
+class DropQueue:
+    """
+    Bounded queue that drops the oldest item instead of blocking the producer.
+
+    `on_drop` is called with every discarded item, e.g. to return its buffers to a pool.
+    """
+
+    def __init__(self, maxsize: int = 1, on_drop: Optional[Callable[[Any], None]] = None):
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be at least 1. Got: {maxsize}")
+        self._items: Deque[Any] = deque(maxlen=maxsize)
+        self._cond = threading.Condition()
+        self._closed = False
+        self.on_drop = on_drop
+        self.dropped = 0
+
+    def put(self, item: Any) -> None:
+        """Push an item, discarding the oldest one if the queue is full."""
+        dropped = None
+        with self._cond:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+                dropped = self._items[0]
+            self._items.append(item)
+            self._cond.notify()
+        if dropped is not None and self.on_drop is not None:
+            self.on_drop(dropped)
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """
+        Pop the oldest queued item.
+
+        Returns:
+            The item, or None if the timeout expired or the queue was closed
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items or self._closed, timeout):
+                return None
+            if not self._items:
+                return None
+            return self._items.popleft()
+
+    def close(self) -> None:
+        """Wake up every waiting consumer; subsequent gets return None once drained."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._items)
+
+
+@dataclass
+class FrameResult:
+    seq: int
+    captured_at: float  # time.monotonic() at capture
+    frame: Any
+    source_id: str = ""
+    timestamp: float = 0.0  # wall-clock capture time
+    obstacles: List[Dict] = field(default_factory=list)
+    lanes: Optional[Dict] = None
+    visualized: Any = None
+    inferred_at: float = 0.0
+    completed_at: float = 0.0
+
+    @property
+    def latency(self) -> float:
+        """Capture-to-completion latency in seconds."""
+        return self.completed_at - self.captured_at
+
+
+class VisionPipeline:
+    """
+    Three-stage capture -> inference -> post-processing pipeline around a VisionProcessor.
+
+    The capture thread keeps reading so the camera buffer never fills with stale frames,
+    and only the newest frame is handed to inference. Every hand-off is a DropQueue, so a
+    slow stage makes the pipeline skip frames instead of falling behind.
+
+    Captured frames and overlays are read and drawn into buffers from `buffers`. Frames
+    dropped inside the pipeline are recycled automatically; consumers of `results` should
+    call `recycle(result)` when done with a result. `on_result` callbacks must copy anything
+    they keep, because the result's buffers can be reused once it leaves the pipeline.
+    """
+
+    def __init__(self, processor, inference_queue_size: int = 1, result_queue_size: int = 2,
+                 on_result: Optional[Callable[[FrameResult], None]] = None,
+                 buffers: Optional[BufferPool] = None, source_id: str = ""):
+        self.processor = processor
+        self.on_result = on_result
+        self.source_id = source_id
+        self.buffers = buffers or BufferPool()
+
+        self.inference_queue = DropQueue(inference_queue_size, on_drop=self.recycle)
+        self.post_queue = DropQueue(result_queue_size, on_drop=self.recycle)
+        self.results = DropQueue(result_queue_size, on_drop=self.recycle)
+
+        self._running = False
+        self._threads: List[threading.Thread] = []
+        self.frames_captured = 0
+        self.frames_completed = 0
+
+    def start(self) -> None:
+        """Start the capture, inference and post-processing threads."""
+        if self._running:
+            return
+        self._running = True
+        suffix = f"-{self.source_id}" if self.source_id else ""
+        self._threads = [
+            threading.Thread(target=self._capture_loop, name=f"vision-capture{suffix}", daemon=True),
+            threading.Thread(target=self._inference_loop, name=f"vision-inference{suffix}", daemon=True),
+            threading.Thread(target=self._post_loop, name=f"vision-post{suffix}", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Stop all stages and wait for their threads to exit."""
+        self._running = False
+        for stage_queue in (self.inference_queue, self.post_queue, self.results):
+            stage_queue.close()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout)
+        self._threads = []
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def stats(self) -> Dict[str, int]:
+        """Frame counters for each stage, including frames dropped at each hand-off."""
+        return {
+            "captured": self.frames_captured,
+            "completed": self.frames_completed,
+            "dropped_before_inference": self.inference_queue.dropped,
+            "dropped_before_post": self.post_queue.dropped,
+            "dropped_results": self.results.dropped,
+        }
+
+    def recycle(self, result: FrameResult) -> None:
+        """Return a result's frame and overlay buffers to the pool."""
+        if result.visualized is not None and result.visualized is not result.frame:
+            self.buffers.release(result.visualized)
+        self.buffers.release(result.frame)
+        result.frame = result.visualized = None
+
+    def _capture_loop(self) -> None:
+        configure_thread('capture')
+        cap = self.processor.cap
+        seq = 0
+        frame_spec = None  # (shape, dtype) of the last frame, to read the next one in place
+        while self._running and cap.isOpened():
+            target = self.buffers.acquire(*frame_spec) if frame_spec else None
+            ret, frame = cap.read(target)
+            if not ret or frame is not target:
+                self.buffers.release(target)
+            if not ret:
+                logger.warning("Failed to capture frame")
+                time.sleep(0.01)
+                continue
+            if getattr(frame, 'shape', None) is not None:
+                frame_spec = (frame.shape, frame.dtype)
+            seq += 1
+            self.frames_captured += 1
+            self.inference_queue.put(FrameResult(seq=seq, captured_at=time.monotonic(), frame=frame,
+                                                 source_id=self.source_id, timestamp=time.time()))
+        self._running = False
+        self.inference_queue.close()
+
+    def _inference_loop(self) -> None:
+        configure_thread('inference')
+        while self._running:
+            result = self.inference_queue.get(timeout=0.5)
+            if result is None:
+                continue
+            try:
+                result.frame, result.obstacles, result.lanes = self.processor.analyze_frame(result.frame)
+            except Exception as e:
+                logger.error(f"Inference stage error: {str(e)}")
+                self.recycle(result)
+                continue
+            result.inferred_at = time.monotonic()
+            self.post_queue.put(result)
+
+    def _post_loop(self) -> None:
+        # Post-processing feeds the display and the stream
+        configure_thread('streaming')
+        while self._running:
+            result = self.post_queue.get(timeout=0.5)
+            if result is None:
+                continue
+            try:
+                # None when nobody is watching; detections stay structured data only
+                result.visualized = self.processor.render_overlay(result.frame, result.obstacles,
+                                                                  result.lanes, pool=self.buffers)
+            except Exception as e:
+                logger.error(f"Post-processing stage error: {str(e)}")
+                result.visualized = result.frame
+            result.completed_at = time.monotonic()
+            self.frames_completed += 1
+
+            if self.on_result is not None:
+                self.on_result(result)
+            self.results.put(result)
@@ -0,0 +1,39 @@
+import time
+import numpy as np
+from contextlib import contextmanager
+from typing import Dict, Iterable
+
+
+class StageTimer:
+    """Wall-clock time of each named stage for the most recent frame, in milliseconds."""
+
+    def __init__(self):
+        self.last: Dict[str, float] = {}
+
+    def reset(self) -> None:
+        self.last = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            # Stages can run more than once per frame (e.g. per camera), so accumulate
+            self.last[name] = self.last.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+
+def summarize(samples_ms: Iterable[float]) -> Dict[str, float]:
+    """Mean and tail percentiles of a list of millisecond samples."""
+    samples = np.asarray(list(samples_ms), dtype=np.float64)
+    if samples.size == 0:
+        return {'count': 0}
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+    return {
+        'count': int(samples.size),
+        'mean_ms': float(samples.mean()),
+        'p50_ms': float(p50),
+        'p95_ms': float(p95),
+        'p99_ms': float(p99),
+        'max_ms': float(samples.max()),
+    }
@@ -0,0 +1,146 @@
+import cv2
+import logging
+import torch
+import numpy as np
+from typing import Callable, Iterable, Iterator, List, Sequence, Tuple
+
+from edison.components.vision_processor.detection import letterbox, to_depth_input, to_yolo_input
+from edison.helpers.bbox import box_iou
+
+logger = logging.getLogger("ModelRegistry")
+
+PRECISIONS = ('fp32', 'int8_dynamic', 'int8_static')
+
+
+def set_quantized_engine(engine: str) -> None:
+    """Select the int8 kernel backend (qnnpack on the Pi's ARM cores, fbgemm on x86)."""
+    if engine not in torch.backends.quantized.supported_engines:
+        raise ValueError(f"Quantized engine '{engine}' not supported here: "
+                         f"{torch.backends.quantized.supported_engines}")
+    torch.backends.quantized.engine = engine
+
+
+def model_input(name: str, roi: np.ndarray, input_shape: Tuple[int, int, int, int]) -> torch.Tensor:
+    """Preprocess an ROI crop exactly like VisionProcessor does for the given model."""
+    size = input_shape[-1]
+    if name == 'yolov5n':
+        image, _, _ = letterbox(roi, size)
+        return torch.from_numpy(to_yolo_input(image))
+    return torch.from_numpy(to_depth_input(roi, size))
+
+
+def iter_clip_rois(video_paths: Sequence[str], roi_ratio: Tuple[float, float],
+                   max_frames: int = 200, stride: int = 10) -> Iterator[np.ndarray]:
+    """Yield ROI crops of every `stride`-th frame of the given recordings."""
+    emitted = 0
+    for path in video_paths:
+        cap = cv2.VideoCapture(path)
+        index = 0
+        while cap.isOpened() and emitted < max_frames:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            if index % stride == 0:
+                height = frame.shape[0]
+                yield frame[int(height * roi_ratio[0]):int(height * roi_ratio[1])]
+                emitted += 1
+            index += 1
+        cap.release()
+        if emitted >= max_frames:
+            return
+
+
+def quantize_dynamic(model: torch.nn.Module) -> torch.nn.Module:
+    """
+    int8 weights for Linear layers, activations quantized on the fly.
+
+    PyTorch's dynamic quantization does not cover convolutions, so a purely convolutional
+    network comes out unchanged; that raises instead of producing a mislabeled fp32 model.
+    """
+    linear_layers = sum(isinstance(module, torch.nn.Linear) for module in model.modules())
+    if linear_layers == 0:
+        raise ValueError("int8_dynamic only quantizes Linear layers and this model has none; "
+                         "use int8_static or fp32")
+    quantized = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    logger.info(f"int8_dynamic quantized {linear_layers} Linear layers; convolutions stay fp32")
+    return quantized
+
+
+def quantize_static(model: torch.nn.Module, example: torch.Tensor,
+                    calibration_inputs: Iterable[torch.Tensor], engine: str) -> torch.nn.Module:
+    """
+    Post-training static int8 quantization with FX graph mode.
+
+    Observers are calibrated on recorded frames so activation ranges match what the car sees.
+    """
+    from torch.ao.quantization import get_default_qconfig_mapping
+    from torch.ao.quantization.quantize_fx import convert_fx, prepare_fx
+
+    prepared = prepare_fx(model, get_default_qconfig_mapping(engine), (example,))
+    calibrated = 0
+    with torch.no_grad():
+        for tensor in calibration_inputs:
+            prepared(tensor)
+            calibrated += 1
+    if calibrated == 0:
+        raise ValueError("Static quantization needs at least one calibration frame")
+    logger.info(f"Calibrated static quantization on {calibrated} frames")
+    return convert_fx(prepared)
+
+
+def quantize(model: torch.nn.Module, precision: str, example: torch.Tensor,
+             calibration_inputs: Callable[[], Iterable[torch.Tensor]], engine: str) -> Tuple[torch.nn.Module, str]:
+    """
+    Quantize an eager model to the requested precision.
+
+    Returns:
+        (quantized model, precision actually applied)
+
+    Raises:
+        RuntimeError: If static quantization fails (e.g. the model cannot be traced by FX);
+            there is no silent fallback, so an artifact is never labeled with a precision
+            it does not have
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision '{precision}'. Use one of {PRECISIONS}")
+    if precision == 'fp32':
+        return model, precision
+
+    set_quantized_engine(engine)
+    if precision == 'int8_static':
+        try:
+            return quantize_static(model, example, calibration_inputs(), engine), precision
+        except Exception as e:
+            raise RuntimeError(f"Static int8 quantization failed: {e}") from e
+    return quantize_dynamic(model), precision
+
+
+def detection_agreement(reference: List[dict], candidate: List[dict], iou_thresh: float = 0.5) -> Tuple[int, int, int]:
+    """
+    Greedy same-class matching of candidate detections against the fp32 reference.
+
+    Returns:
+        (matched, reference count, candidate count)
+    """
+    ref_boxes = np.array([o['bbox'] for o in reference], dtype=np.float32).reshape(-1, 4)
+    cand_boxes = np.array([o['bbox'] for o in candidate], dtype=np.float32).reshape(-1, 4)
+    iou = box_iou(ref_boxes, cand_boxes)
+    same_class = np.array([[r['class_id'] == c['class_id'] for c in candidate] for r in reference],
+                          dtype=bool).reshape(iou.shape)
+    iou = np.where(same_class, iou, 0)
+
+    matched = 0
+    while iou.size and iou.max() >= iou_thresh:
+        i, j = np.unravel_index(iou.argmax(), iou.shape)
+        iou[i, :] = 0
+        iou[:, j] = 0
+        matched += 1
+    return matched, len(reference), len(candidate)
+
+
+def depth_error(reference: np.ndarray, candidate: np.ndarray) -> float:
+    """Mean absolute relative error after median alignment (MiDaS depth is scale-free)."""
+    ref = reference.astype(np.float32).ravel()
+    cand = candidate.astype(np.float32).ravel()
+    cand = cand * (np.median(ref) / max(float(np.median(cand)), 1e-9))
+    return float(np.mean(np.abs(cand - ref) / np.maximum(np.abs(ref), 1e-6)))
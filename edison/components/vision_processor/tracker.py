@@ -0,0 +1,239 @@
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+from edison.helpers.bbox import box_iou
+
+
+def _to_state(bbox: Sequence[float]) -> np.ndarray:
+    x1, y1, x2, y2 = bbox
+    return np.array([(x1 + x2) / 2, (y1 + y2) / 2, x2 - x1, y2 - y1, 0, 0, 0, 0], dtype=np.float64)
+
+
+def _to_bbox(state: np.ndarray) -> np.ndarray:
+    cx, cy, w, h = state[:4]
+    w, h = max(w, 1.0), max(h, 1.0)
+    return np.array([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2])
+
+
+@dataclass
+class Track:
+    track_id: int
+    class_id: int
+    label: str
+    detection_confidence: float
+    state: np.ndarray  # cx, cy, w, h and their velocities in px/s
+    cov: np.ndarray
+    last_time: float
+    hits: int = 1
+    frames_since_detection: int = 0
+    keyframe_misses: int = 0
+    distance: float = float('inf')
+    distance_rate: float = 0.0  # m/s, negative when closing in
+    distance_time: Optional[float] = None
+
+    @property
+    def bbox(self) -> np.ndarray:
+        return _to_bbox(self.state)
+
+
+class ObstacleTracker:
+    """
+    Keeps obstacle tracks alive between YOLO keyframes.
+
+    On keyframes, detections are associated to tracks by greedy same-class IoU and used as
+    measurements for a constant-velocity Kalman filter over (cx, cy, w, h). Between keyframes
+    every track is predicted forward, so obstacle positions stay available at control rate.
+
+    The keyframe interval adapts between `min_interval` and `max_interval`. It is halved when
+    boxes move fast relative to their size, tracks lose confidence, or tracks appear or
+    disappear. It grows by one frame when the scene is calm and all tracks are confident.
+    """
+
+    def __init__(self, min_interval: int = 1, max_interval: int = 6, match_iou: float = 0.3,
+                 max_keyframe_misses: int = 2, confidence_decay: float = 0.9,
+                 motion_high: float = 0.5, motion_low: float = 0.15,
+                 confidence_low: float = 0.35, confidence_high: float = 0.6,
+                 process_noise: float = 50.0, measurement_noise: float = 10.0):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self.match_iou = match_iou
+        self.max_keyframe_misses = max_keyframe_misses
+        self.confidence_decay = confidence_decay
+        self.motion_high = motion_high
+        self.motion_low = motion_low
+        self.confidence_low = confidence_low
+        self.confidence_high = confidence_high
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+
+        self.tracks: List[Track] = []
+        self.frames_since_keyframe = 0
+        self._next_id = 1
+        self._frame_width = 1.0
+        self._H = np.hstack([np.eye(4), np.zeros((4, 4))])
+
+    def needs_detection(self) -> bool:
+        """True when the current frame should run the detector."""
+        return not self.tracks or self.frames_since_keyframe + 1 >= self.interval
+
+    def rescale(self, ratio: float) -> None:
+        """Convert every track to a new image scale (e.g. after the processing resolution changed)."""
+        self._frame_width *= ratio
+        for track in self.tracks:
+            track.state = track.state * ratio
+            track.cov = track.cov * ratio ** 2
+
+    def track_confidence(self, track: Track) -> float:
+        return track.detection_confidence * self.confidence_decay ** track.frames_since_detection
+
+    def predict(self, now: float) -> List[Dict]:
+        """Advance every track to `now` without a detection (non-keyframe)."""
+        self.frames_since_keyframe += 1
+        for track in self.tracks:
+            self._predict_track(track, now)
+            track.frames_since_detection += 1
+        return self.obstacles()
+
+    def update(self, detections: Sequence[Dict], now: float, frame_width: Optional[int] = None) -> List[Dict]:
+        """Correct the tracks with a keyframe's detections and adapt the keyframe interval."""
+        if frame_width:
+            self._frame_width = float(frame_width)
+        for track in self.tracks:
+            self._predict_track(track, now)
+
+        det_boxes = np.array([d['bbox'] for d in detections], dtype=np.float64).reshape(-1, 4)
+        track_boxes = np.array([t.bbox for t in self.tracks], dtype=np.float64).reshape(-1, 4)
+        iou = box_iou(track_boxes, det_boxes)
+        if iou.size:
+            same_class = np.array([[t.class_id == d['class_id'] for d in detections] for t in self.tracks])
+            iou = np.where(same_class, iou, 0)
+
+        matched_tracks, matched_dets = set(), set()
+        while iou.size and iou.max() >= self.match_iou:
+            ti, di = np.unravel_index(iou.argmax(), iou.shape)
+            iou[ti, :] = 0
+            iou[:, di] = 0
+            self._correct_track(self.tracks[ti], detections[di])
+            matched_tracks.add(ti)
+            matched_dets.add(di)
+
+        for ti, track in enumerate(self.tracks):
+            if ti not in matched_tracks:
+                track.keyframe_misses += 1
+                track.frames_since_detection += 1
+        lost = sum(t.keyframe_misses > self.max_keyframe_misses for t in self.tracks)
+        self.tracks = [t for t in self.tracks if t.keyframe_misses <= self.max_keyframe_misses]
+
+        new = 0
+        for di, detection in enumerate(detections):
+            if di not in matched_dets:
+                self._start_track(detection, now)
+                new += 1
+
+        self._adapt_interval(changed=bool(new or lost))
+        self.frames_since_keyframe = 0
+        return self.obstacles()
+
+    def observe_distances(self, obstacles: Sequence[Dict], now: float, smoothing: float = 0.5) -> None:
+        """
+        Feed per-obstacle metric distances back into the tracks and fill in time-to-collision.
+
+        TTC comes from the smoothed distance rate when distances are known, otherwise from
+        the box's scale expansion rate (h / dh/dt).
+        """
+        tracks = {t.track_id: t for t in self.tracks}
+        for obstacle in obstacles:
+            track = tracks.get(obstacle.get('track_id'))
+            if track is None:
+                continue
+            distance = obstacle.get('distance', float('inf'))
+            if np.isfinite(distance) and obstacle.get('distance_known', True):
+                if track.distance_time is not None and np.isfinite(track.distance) and now > track.distance_time:
+                    rate = (distance - track.distance) / (now - track.distance_time)
+                    track.distance_rate = smoothing * track.distance_rate + (1 - smoothing) * rate
+                track.distance = distance
+                track.distance_time = now
+            obstacle['ttc'] = self._time_to_collision(track)
+
+    def obstacles(self) -> List[Dict]:
+        """Current tracks in the obstacle dict format ObstacleAvoidance consumes."""
+        obstacles = []
+        for track in self.tracks:
+            bbox = track.bbox
+            center_x = (bbox[0] + bbox[2]) / 2
+            obstacles.append({
+                'bbox': tuple(float(v) for v in bbox),
+                'class_id': track.class_id,
+                'label': track.label,
+                'confidence': self.track_confidence(track),
+                'position': float(center_x / self._frame_width * 2 - 1),
+                'distance': track.distance,
+                'track_id': track.track_id,
+                'velocity': (float(track.state[4]), float(track.state[5])),
+                'ttc': self._time_to_collision(track),
+            })
+        return obstacles
+
+    def _time_to_collision(self, track: Track) -> float:
+        if np.isfinite(track.distance) and track.distance_rate < -1e-3:
+            return float(track.distance / -track.distance_rate)
+        height, height_rate = track.state[3], track.state[7]
+        if not np.isfinite(track.distance) and height_rate > 1e-3:
+            return float(height / height_rate)
+        return float('inf')
+
+    def _start_track(self, detection: Dict, now: float) -> None:
+        cov = np.diag([self.measurement_noise] * 4 + [1000.0] * 4)
+        self.tracks.append(Track(
+            track_id=self._next_id,
+            class_id=detection['class_id'],
+            label=detection.get('label', str(detection['class_id'])),
+            detection_confidence=detection.get('confidence', 1.0),
+            state=_to_state(detection['bbox']),
+            cov=cov,
+            last_time=now,
+        ))
+        self._next_id += 1
+
+    def _predict_track(self, track: Track, now: float) -> None:
+        dt = max(now - track.last_time, 0.0)
+        track.last_time = now
+        if dt == 0:
+            return
+        F = np.eye(8)
+        F[:4, 4:] = np.eye(4) * dt
+        Q = np.eye(8) * self.process_noise * dt
+        track.state = F @ track.state
+        track.cov = F @ track.cov @ F.T + Q
+
+    def _correct_track(self, track: Track, detection: Dict) -> None:
+        H = self._H
+        measurement = _to_state(detection['bbox'])[:4]
+        S = H @ track.cov @ H.T + np.eye(4) * self.measurement_noise
+        K = track.cov @ H.T @ np.linalg.inv(S)
+        track.state = track.state + K @ (measurement - H @ track.state)
+        track.cov = (np.eye(8) - K @ H) @ track.cov
+
+        track.detection_confidence = detection.get('confidence', track.detection_confidence)
+        track.hits += 1
+        track.frames_since_detection = 0
+        track.keyframe_misses = 0
+
+    def _adapt_interval(self, changed: bool) -> None:
+        if not self.tracks:
+            self.interval = self.min_interval
+            return
+
+        # Box speed relative to box size, i.e. the fraction of its own size a box moves per second
+        motion = max(
+            float(np.hypot(t.state[4], t.state[5]) / max(t.state[2], t.state[3], 1.0))
+            for t in self.tracks
+        )
+        confidence = min(self.track_confidence(t) for t in self.tracks)
+
+        if changed or motion > self.motion_high or confidence < self.confidence_low:
+            self.interval = max(self.min_interval, self.interval // 2)
+        elif motion < self.motion_low and confidence > self.confidence_high:
+            self.interval = min(self.max_interval, self.interval + 1)
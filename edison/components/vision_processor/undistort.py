@@ -0,0 +1,121 @@
+import cv2
+import hashlib
+import logging
+import threading
+import numpy as np
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+logger = logging.getLogger("VisionProcessor")
+
+# Fallback used when no camera_config.npz is available (same values generate_camera_config.py writes)
+DEFAULT_FRAME_SIZE = (1280, 720)
+DEFAULT_CAMERA_MATRIX = np.array([[1000, 0, 640], [0, 1000, 360], [0, 0, 1]], dtype=np.float32)
+
+# (calibration hash, (width, height), (top, bottom)) -> (map1, map2)
+_REMAP_CACHE: Dict[Tuple[str, Tuple[int, int], Tuple[int, int]], Tuple[np.ndarray, np.ndarray]] = {}
+_REMAP_CACHE_LOCK = threading.Lock()
+
+
+def load_camera_config(path: Union[str, Path]) -> Tuple[np.ndarray, np.ndarray, Tuple[int, int]]:
+    """
+    Load the camera matrix, distortion coefficients and calibration resolution.
+
+    Args:
+        path: .npz file written by scripts/generate_camera_config.py
+
+    Returns:
+        (mtx, dist, (frame_width, frame_height)); falls back to the default pinhole
+        calibration with zero distortion if the file does not exist
+    """
+    path = Path(path)
+    if not path.exists():
+        logger.warning(f"Camera config {path} not found, using default calibration")
+        return DEFAULT_CAMERA_MATRIX.copy(), np.zeros((1, 5), dtype=np.float32), DEFAULT_FRAME_SIZE
+
+    with np.load(path) as data:
+        mtx = data['mtx'].astype(np.float32)
+        dist = data['dist'].astype(np.float32).reshape(1, -1)
+        size = (int(data['frame_width']), int(data['frame_height']))
+    logger.info(f"Loaded camera calibration from {path} ({size[0]}x{size[1]})")
+    return mtx, dist, size
+
+
+def calibration_hash(mtx: np.ndarray, dist: np.ndarray) -> str:
+    """Stable short hash identifying a calibration."""
+    digest = hashlib.sha1()
+    digest.update(np.ascontiguousarray(mtx, dtype=np.float32).tobytes())
+    digest.update(np.ascontiguousarray(dist, dtype=np.float32).tobytes())
+    return digest.hexdigest()[:16]
+
+
+class Undistorter:
+    """
+    Undistorts frames with cached remap tables instead of calling cv2.undistort per frame.
+
+    Tables are built once per (calibration, resolution, ROI rows) and can be restricted to
+    the ROI band so only the rows the detectors look at are remapped.
+    """
+
+    def __init__(self, mtx: np.ndarray, dist: np.ndarray, calibration_size: Tuple[int, int]):
+        self.mtx = mtx
+        self.dist = dist
+        self.calibration_size = calibration_size
+        self.key = calibration_hash(mtx, dist)
+        # With zero distortion and the same output matrix the remap is the identity
+        self.is_identity = not np.any(dist)
+
+    def _scaled_matrix(self, size: Tuple[int, int]) -> np.ndarray:
+        """Rescale the camera matrix when the stream resolution differs from the calibration."""
+        sx = size[0] / self.calibration_size[0]
+        sy = size[1] / self.calibration_size[1]
+        if sx == 1 and sy == 1:
+            return self.mtx
+        scaled = self.mtx.copy()
+        scaled[0, 0] *= sx
+        scaled[0, 2] *= sx
+        scaled[1, 1] *= sy
+        scaled[1, 2] *= sy
+        return scaled
+
+    def _get_maps(self, size: Tuple[int, int], rows: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray]:
+        cache_key = (self.key, size, rows)
+        with _REMAP_CACHE_LOCK:
+            maps = _REMAP_CACHE.get(cache_key)
+        if maps is not None:
+            return maps
+
+        mtx = self._scaled_matrix(size)
+        map1, map2 = cv2.initUndistortRectifyMap(mtx, self.dist, None, mtx, size, cv2.CV_16SC2)
+        top, bottom = rows
+        maps = (np.ascontiguousarray(map1[top:bottom]), np.ascontiguousarray(map2[top:bottom]))
+        logger.info(f"Built undistortion maps for {size[0]}x{size[1]} rows {top}:{bottom}")
+
+        with _REMAP_CACHE_LOCK:
+            _REMAP_CACHE[cache_key] = maps
+        return maps
+
+    def undistort_rows(self, frame: np.ndarray, top: int, bottom: int,
+                       dst: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Return rows top:bottom of the undistorted frame.
+
+        On the identity fast path this is a view of the input frame.
+        """
+        if self.is_identity:
+            return frame[top:bottom]
+        height, width = frame.shape[:2]
+        map1, map2 = self._get_maps((width, height), (top, bottom))
+        return cv2.remap(frame, map1, map2, cv2.INTER_LINEAR, dst=dst)
+
+    def undistort(self, frame: np.ndarray, dst: Optional[np.ndarray] = None) -> np.ndarray:
+        """Undistort the full frame."""
+        return self.undistort_rows(frame, 0, frame.shape[0], dst=dst)
+
+    def undistort_points(self, points: np.ndarray, size: Tuple[int, int]) -> np.ndarray:
+        """Map (N, 2) pixel coordinates of a distorted frame of `size` to the undistorted frame."""
+        points = np.asarray(points, dtype=np.float32).reshape(-1, 2)
+        if self.is_identity:
+            return points
+        mtx = self._scaled_matrix(size)
+        return cv2.undistortPoints(points.reshape(-1, 1, 2), mtx, self.dist, P=mtx).reshape(-1, 2)
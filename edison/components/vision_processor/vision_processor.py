@@ -1,64 +1,213 @@
 import cv2
+import time
+import logging
 import numpy as np
 import torch
 from pathlib import Path
-from typing import Tuple, Dict, List, Union
+from typing import Tuple, Dict, List, Optional, Union
+
+import config
+from edison._lib.get_video import GetWebcam
+from edison.components.vision_processor.depth_calibration import DistanceCalibration, box_features
+from edison.components.vision_processor.depth_scheduler import DepthScheduler
+from edison.components.vision_processor.detection import (
+    OBSTACLE_LABELS, decode_yolo_output, letterbox, letterbox_shape, to_depth_input, to_yolo_input
+)
+from edison.components.vision_processor.governor import PerformanceGovernor, QualityLevel
+from edison.components.vision_processor.lane_detector import LaneDetector
+from edison.components.vision_processor.mjpeg_capture import MJPEGCapture
+from edison.components.vision_processor.model_registry import ModelRegistry, default_specs
+from edison.components.vision_processor.pipeline import VisionPipeline
+from edison.components.vision_processor.profiling import StageTimer
+from edison.components.vision_processor.tracker import ObstacleTracker
+from edison.components.vision_processor.undistort import Undistorter, load_camera_config
+from edison.helpers.buffer_pool import BufferPool, pinned_allocator
+from edison.helpers.resource_plan import apply_library_threads, configure_thread, pinned_as
 
 class VisionProcessor:
-    def __init__(self, camera_index: Union[int, str] = 0):  # Accept both camera index and file path
-        self._load_calibration()
-        self._init_models()
-        self._init_video(camera_index)  # Initialize video source here
-        
+    def __init__(self, camera_index: Optional[Union[int, str]] = 0,  # Accept both camera index and file path
+                 asynchronous_depth: Optional[bool] = None, shared_models: Optional['VisionProcessor'] = None,
+                 resource_plan: Optional[Dict] = None):
+        self.logger = logging.getLogger("VisionProcessor")
+        self.stage_timer = StageTimer()
+        # Scratch buffers reused by every frame (ROI, letterbox, model inputs, overlay)
+        self.buffers = BufferPool(**config.BUFFER_POOL_CONFIG)
+        self.cap = None
+        # Overlays are only drawn while one of these is watching
+        self.stream = None
+        self.display_active = False
+        # Optional MicroBatchers shared with other cameras (see multi_camera.py)
+        self.yolo_batcher = None
+        self.depth_batcher = None
+        self.asynchronous_depth = (config.DEPTH_CONFIG['asynchronous']
+                                   if asynchronous_depth is None else asynchronous_depth)
+        # Defaults to config.RESOURCE_PLAN; batch workers size their own pools and pass a disabled plan
+        self.resource_plan = resource_plan
+        # Thread pools must be sized before the models run for the first time. The warm-up runs
+        # on the inference cores, so the torch/OpenMP workers it starts stay there, and the
+        # caller's own affinity is restored afterwards
+        with pinned_as('inference', resource_plan):
+            if shared_models is None:
+                apply_library_threads(resource_plan)
+            self._load_calibration()
+            self._init_models(shared_models)
+        self.reset_state()
+
         # ROI parameters
         self.roi_ratio = (0.4, 0.8)
         self.depth_scale = 0.1
+        self.processing_scale = 1.0
+        self.governor = self._init_governor()
+
+        self.undistorter = Undistorter(self.mtx, self.dist, self.calibration_size)
+        if self.undistorter.is_identity:
+            self.logger.info("Distortion coefficients are zero, skipping undistortion")
+        # None defers opening a source, e.g. for batch workers that call open_source per clip
+        if camera_index is not None:
+            self._init_video(camera_index)  # Initialize video source here
+
+    def _init_governor(self) -> Optional[PerformanceGovernor]:
+        governor_config = config.GOVERNOR_CONFIG
+        if not governor_config['enabled']:
+            return None
+        return PerformanceGovernor(
+            [QualityLevel(*level) for level in governor_config['levels']],
+            apply=self.set_quality,
+            target_latency_ms=governor_config['target_latency_ms'],
+            cpu_high=governor_config['cpu_high'],
+            cpu_low=governor_config['cpu_low'],
+            temp_high=governor_config['temp_high'],
+            temp_low=governor_config['temp_low'],
+            window=governor_config['window'],
+            cooldown=governor_config['cooldown']
+        )
+
+    def set_quality(self, level: QualityLevel) -> None:
+        """Apply a processing resolution, detection interval and depth rate"""
+        if level.scale != self.processing_scale:
+            ratio = level.scale / self.processing_scale
+            self.obstacle_tracker.rescale(ratio)
+            self.depth_scheduler.invalidate()
+            self.lane_detector.reset()
+            self.lane_detector.xm_per_pix = config.LANE_DETECTION_CONFIG['xm_per_pix'] / level.scale
+            self.lane_detector.ym_per_pix = config.LANE_DETECTION_CONFIG['ym_per_pix'] / level.scale
+            self.processing_scale = level.scale
+
+        tracker = self.obstacle_tracker
+        tracker.min_interval = level.detection_interval
+        tracker.max_interval = max(config.TRACKING_CONFIG['max_interval'], level.detection_interval)
+        tracker.interval = max(tracker.interval, tracker.min_interval)
+        self.depth_scheduler.interval = level.depth_interval
+
+    def reset_state(self) -> None:
+        """Forget per-stream state (tracks, lane lock, depth snapshot) before switching sources"""
+        if getattr(self, 'depth_scheduler', None) is not None:
+            self.depth_scheduler.stop()
+        self.depth_scheduler = DepthScheduler(
+            self._estimate_depth,
+            interval=config.DEPTH_CONFIG['interval'],
+            crop_to_boxes=config.DEPTH_CONFIG['crop_to_boxes'],
+            crop_margin=config.DEPTH_CONFIG['crop_margin'],
+            asynchronous=self.asynchronous_depth
+        )
+        self.lane_detector = LaneDetector(**config.LANE_DETECTION_CONFIG)
+        self.obstacle_tracker = ObstacleTracker(**config.TRACKING_CONFIG)
+        if getattr(self, 'governor', None) is not None:
+            self.processing_scale = 1.0
+            self.set_quality(self.governor.current)
+
+    def open_source(self, video_source: Union[str, int]) -> None:
+        """Switch to another camera or video file, keeping the loaded models"""
+        if self.cap is not None:
+            self.cap.release()
+        self.reset_state()
+        self._init_video(video_source)
+
+    def attach_stream(self, stream) -> None:
+        """Send overlays to a StreamManager whenever it has connected clients"""
+        self.stream = stream
 
     def _load_calibration(self) -> None:
         try:
-            # Replace with actual calibration data for your camera
-            self.mtx = np.array([[1000, 0, 640], [0, 1000, 360], [0, 0, 1]], dtype=np.float32)
-            self.dist = np.zeros((1, 5), dtype=np.float32)
+            self.mtx, self.dist, self.calibration_size = load_camera_config(config.CAMERA_CONFIG_PATH)
         except Exception as e:
+            self.logger.error(f"Calibration loading failed: {str(e)}")
             raise
 
-    def _init_models(self) -> None:
+    def _init_models(self, shared_models: Optional['VisionProcessor'] = None) -> None:
+        if shared_models is not None:
+            # Another camera's processor already loaded the models, reuse them
+            for name in ('yolo_input_size', 'depth_input_size', 'obstacle_classes', 'model_registry',
+                         'obj_model', 'depth_model', 'distance_calibration'):
+                setattr(self, name, getattr(shared_models, name))
+            return
         try:
+            model_config = config.MODEL_CONFIG
+            self.yolo_input_size = model_config['yolo_input_size']
+            self.depth_input_size = model_config['depth_input_size']
+            self.obstacle_classes = list(OBSTACLE_LABELS)  # Person, vehicles
+
+            # Models are loaded from local TorchScript artifacts, never from the network
+            self.model_registry = ModelRegistry(
+                model_config['model_dir'],
+                specs=default_specs(self.yolo_input_size, self.depth_input_size),
+                mmap_weights=model_config['mmap_weights'],
+                warmup_runs=model_config['warmup_runs'],
+                quantized_engine=model_config['quantized_engine']
+            )
             # Use smaller YOLOv5n model for faster inference
-            self.obj_model = torch.hub.load('ultralytics/yolov5', 'yolov5n', 
-                                          pretrained=True, force_reload=False)
-            self.obj_model.classes = [0, 1, 2, 3, 5, 7]  # Person, vehicles
-            self.obj_model.conf = 0.45
-            
+            self.obj_model = self.model_registry.load('yolov5n', precision=model_config['precision']['yolov5n'])
             # Initialize depth estimation
-            self.depth_model = torch.hub.load('intel-isl/MiDaS', 'MiDaS_small')
-            self.depth_model.eval()
-            
-            self.logger.info("Models initialized")
+            self.depth_model = self.model_registry.load('midas_small',
+                                                        precision=model_config['precision']['midas_small'])
+            self.distance_calibration = DistanceCalibration.load(config.DEPTH_CONFIG['calibration_path'])
+
+            self.logger.info(f"Models initialized: {self.model_registry.timings}")
         except Exception as e:
             self.logger.error(f"Model initialization failed: {str(e)}")
             raise
 
     def _init_video(self, video_source: Union[str, int]) -> None:
-        self.cap = cv2.VideoCapture(video_source)
+        if isinstance(video_source, str) and video_source.startswith(('http://', 'https://')):
+            # MJPEG over HTTP (DroidCam) is read directly instead of through a V4L2 device
+            self.cap = MJPEGCapture(video_source, timeout=config.DROIDCAM_CONFIG['timeout'],
+                                    reconnect_delay=config.DROIDCAM_CONFIG['reconnect_delay'])
+        else:
+            self.cap = cv2.VideoCapture(video_source)
         if not self.cap.isOpened():
             self.logger.error(f"Failed to open video source: {video_source}")
             raise RuntimeError("Video initialization failed")
 
+        # Keep the driver-side queue short so reads return the newest frame
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
         self.frame_width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         self.frame_height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
         self.fps = self.cap.get(cv2.CAP_PROP_FPS)
         self.logger.info(f"Video initialized: {self.frame_width}x{self.frame_height} @ {self.fps:.2f} FPS")
 
-    def process_webcam(self) -> None:
+    def process_webcam(self, pipelined: Optional[bool] = None, show_window: bool = True) -> None:
         """Process real-time webcam feed"""
+        if pipelined is None:
+            pipelined = config.VISION_PIPELINE_CONFIG['enabled']
+        self.display_active = show_window
+        if pipelined:
+            self._process_webcam_pipelined()
+            return
+
+        # Capture, inference and display all run on this thread
+        configure_thread('inference', self.resource_plan)
+        frame = None
         while self.cap.isOpened():
-            ret, frame = self.cap.read()
+            # Passing the previous frame back makes the capture decode into the same buffer
+            ret, frame = self.cap.read(frame)
             if not ret:
                 self.logger.warning("Failed to capture frame")
                 continue
 
-            processed_frame, _ = self.process_frame(frame)
+            processed_frame, _, _ = self.process_frame(frame)
+            if not self.display_active:
+                continue
             cv2.imshow("Real-time Processing", processed_frame)
             
             if cv2.waitKey(1) & 0xFF == ord('q'):
@@ -66,6 +215,32 @@ class VisionProcessor:
 
         self.release()
 
+    def _process_webcam_pipelined(self) -> None:
+        """Process the webcam feed with capture, inference and visualization on separate threads"""
+        pipeline = VisionPipeline(
+            self,
+            inference_queue_size=config.VISION_PIPELINE_CONFIG['inference_queue_size'],
+            result_queue_size=config.VISION_PIPELINE_CONFIG['result_queue_size']
+        )
+        pipeline.start()
+        try:
+            # imshow/waitKey must stay on the main thread
+            while pipeline.running:
+                result = pipeline.results.get(timeout=0.5)
+                if result is None:
+                    continue
+                if not self.display_active:
+                    pipeline.recycle(result)
+                    continue
+                cv2.imshow("Real-time Processing", result.visualized)
+                pipeline.recycle(result)
+                if cv2.waitKey(1) & 0xFF == ord('q'):
+                    break
+        finally:
+            pipeline.stop()
+            self.logger.info(f"Pipeline stopped: {pipeline.stats()}")
+            self.release()
+
     def catch_frame(self):
         if self.cap.isOpened():
             ret, frame = self.cap.read()
@@ -73,27 +248,267 @@ class VisionProcessor:
                 print("Faled to parse frame")
             return frame
         
-    def process_frame(self, frame: np.ndarray) -> Tuple[np.ndarray, List[Dict]]:
-        try:
-            frame_undist = cv2.undistort(frame, self.mtx, self.dist)
-            roi = self._apply_roi(frame_undist)
-            
-            obstacle_data = self._detect_obstacles(roi)
+    def analyze_frame(self, frame: np.ndarray) -> Tuple[np.ndarray, List[Dict], Dict]:
+        """
+        Run undistortion, detection and lane finding without drawing anything.
+
+        Only the ROI band is undistorted here; the returned frame is the raw frame, and
+        render_overlay() undistorts it before drawing, only when someone is watching.
+        Detections are ROI-relative and in undistorted pixels.
+        """
+        start = time.perf_counter()
+        self.stage_timer.reset()
+        with self.stage_timer.stage('undistort_roi'):
+            top, bottom = self._roi_rows(frame.shape[0])
+            dst = None
+            if not self.undistorter.is_identity:
+                dst = self.buffers.get('roi', (bottom - top,) + frame.shape[1:], frame.dtype)
+            roi = self.undistorter.undistort_rows(frame, top, bottom, dst=dst)
+            scale = self.processing_scale
+            if scale != 1.0:
+                size = (int(round(roi.shape[1] * scale)), int(round(roi.shape[0] * scale)))
+                dst = self.buffers.get('roi_scaled', (size[1], size[0]) + roi.shape[2:], roi.dtype)
+                roi = cv2.resize(roi, size, dst=dst, interpolation=cv2.INTER_AREA)
+
+        obstacle_data = self._track_obstacles(roi)
+        with self.stage_timer.stage('lanes'):
             lane_data = self._detect_lanes(roi)
-            
-            visualized = self._visualize_results(frame_undist, obstacle_data, lane_data)
+
+        if scale != 1.0:
+            obstacle_data, lane_data = self._to_full_resolution(obstacle_data, lane_data, scale)
+        if self.governor is not None:
+            self.governor.observe((time.perf_counter() - start) * 1000)
+        return frame, obstacle_data, lane_data
+
+    @staticmethod
+    def _to_full_resolution(obstacle_data: List[Dict], lane_data: Dict, scale: float) -> Tuple[List[Dict], Dict]:
+        """Map pixel coordinates from the downscaled ROI back to the camera resolution"""
+        obstacle_data = [dict(o, bbox=tuple(v / scale for v in o['bbox'])) for o in obstacle_data]
+        if lane_data:
+            lane_data = dict(lane_data)
+            if lane_data.get('lines'):
+                lane_data['lines'] = [tuple(v / scale for v in line) for line in lane_data['lines']]
+            # x = sum(c_k * y^k) with x and y both divided by scale: c_k is multiplied by scale^(k-1)
+            for key in ('left_fit', 'right_fit'):
+                if lane_data.get(key) is not None:
+                    fit = lane_data[key]
+                    degree = len(fit) - 1
+                    lane_data[key] = [c * scale ** (degree - i - 1) for i, c in enumerate(fit)]
+        return obstacle_data, lane_data
+
+    def process_frame(self, frame: np.ndarray) -> Tuple[Optional[np.ndarray], List[Dict], Dict]:
+        """
+        Analyze one frame and draw the overlay if anyone is watching.
+
+        Returns:
+            (overlay or None when nobody is watching, obstacles, lanes); the overlay is only
+            valid until the next call
+        """
+        try:
+            frame_undist, obstacle_data, lane_data = self.analyze_frame(frame)
+            with self.stage_timer.stage('visualization'):
+                visualized = self.render_overlay(frame_undist, obstacle_data, lane_data)
             return visualized, obstacle_data, lane_data
             
         except Exception as e:
             self.logger.error(f"Frame processing error: {str(e)}")
-            return frame, []
+            return None, [], {}
+
+    def _apply_roi(self, frame: np.ndarray) -> np.ndarray:
+        """Crop the horizontal road band described by roi_ratio (returns a view)"""
+        top, bottom = self._roi_rows(frame.shape[0])
+        return frame[top:bottom]
+
+    def _roi_rows(self, frame_height: int) -> Tuple[int, int]:
+        """First and last (exclusive) rows of the ROI band in the full frame"""
+        return int(frame_height * self.roi_ratio[0]), int(frame_height * self.roi_ratio[1])
+
+    def _roi_offset(self, frame_height: int) -> int:
+        """Row in the full frame where the ROI starts"""
+        return self._roi_rows(frame_height)[0]
+
+    def _track_obstacles(self, roi: np.ndarray) -> List[Dict]:
+        """Detect on keyframes, predict tracks in between, then attach distances and time-to-collision"""
+        now = time.monotonic()
+        if self.obstacle_tracker.needs_detection():
+            with self.stage_timer.stage('detection'):
+                detections = self._detect_obstacles(roi)
+            with self.stage_timer.stage('tracking'):
+                obstacles = self.obstacle_tracker.update(detections, now, frame_width=roi.shape[1])
+        else:
+            with self.stage_timer.stage('tracking'):
+                obstacles = self.obstacle_tracker.predict(now)
+
+        # Depth runs at a reduced rate; in between, distances come from the last depth map
+        with self.stage_timer.stage('depth'):
+            inverse_depth = self.depth_scheduler.update(roi, obstacles)
+            distances = self._inverse_depth_to_distance(inverse_depth, [o['bbox'] for o in obstacles], roi.shape[0])
+        # An obstacle no depth map covers yet (e.g. just detected, refresh in flight) is
+        # treated as close rather than infinitely far away
+        known = np.isfinite(distances)
+        distances = np.where(known, distances, config.DEPTH_CONFIG['unknown_distance'])
+        for obstacle, distance, distance_known in zip(obstacles, distances, known):
+            obstacle['distance'] = float(distance)
+            obstacle['distance_known'] = bool(distance_known)
+        self.obstacle_tracker.observe_distances(obstacles, now)
+        return obstacles
+
+    def _detect_obstacles(self, roi: np.ndarray) -> List[Dict]:
+        """Run YOLO on the ROI"""
+        size = self.yolo_input_size
+        (resized_h, resized_w), _ = letterbox_shape(roi.shape, size)
+        image, scale, pad = letterbox(roi, size,
+                                      out=self.buffers.get('yolo_letterbox', (size, size, 3)),
+                                      resized=self.buffers.get('yolo_resized', (resized_h, resized_w, 3)))
+        inputs = self.buffers.get('yolo_input', (1, 3, size, size), np.float32, allocator=pinned_allocator)
+        pred = self._infer(self.obj_model, self.yolo_batcher, to_yolo_input(image, out=inputs))
+
+        return decode_yolo_output(pred[0].numpy(), scale, pad, roi.shape,
+                                  conf_thresh=config.YOLO_CONF_THRESH,
+                                  classes=self.obstacle_classes)
+
+    def _estimate_depth(self, roi: np.ndarray) -> np.ndarray:
+        """MiDaS relative inverse depth, resized to the ROI"""
+        size = self.depth_input_size
+        inputs = self.buffers.get('depth_input', (1, 3, size, size), np.float32, allocator=pinned_allocator)
+        resized = self.buffers.get('depth_resized', (size, size, 3))
+        inputs = to_depth_input(roi, size, out=inputs, resized=resized)
+        depth = self._infer(self.depth_model, self.depth_batcher, inputs)
+        depth = depth.squeeze().numpy()
+        return cv2.resize(depth, (roi.shape[1], roi.shape[0]), interpolation=cv2.INTER_LINEAR)
+
+    @staticmethod
+    def run_model(model, inputs: np.ndarray) -> torch.Tensor:
+        """Forward a float32 NCHW batch; detection heads that return tuples yield their first output"""
+        with torch.inference_mode():
+            output = model(torch.from_numpy(inputs))
+        return output[0] if isinstance(output, (tuple, list)) else output
+
+    def _infer(self, model, batcher, inputs: np.ndarray) -> torch.Tensor:
+        """Run a single-item batch directly, or through the shared micro-batcher when there is one"""
+        if batcher is not None:
+            return batcher.infer(inputs)
+        return self.run_model(model, inputs)
+
+    def _detect_lanes(self, roi: np.ndarray) -> Dict:
+        """Lane center/curvature/boundaries for Traverser and ObstacleAvoidance"""
+        return self.lane_detector.detect(roi)
+
+    def _inverse_depth_to_distance(self, inverse_depth: np.ndarray, bboxes: List, roi_height: int) -> np.ndarray:
+        """Convert relative inverse depth to meters, using the calibration table when one is available"""
+        if self.distance_calibration is not None:
+            bottom_rows, box_heights = box_features(bboxes, roi_height)
+            return self.distance_calibration.to_meters(inverse_depth, bottom_rows, box_heights)
+
+        # Uncalibrated fallback: single scalar scale
+        inverse_depth = np.asarray(inverse_depth, dtype=np.float32)
+        distances = 1.0 / np.maximum(inverse_depth * self.depth_scale, 1e-6)
+        return np.where(np.isfinite(inverse_depth), distances, np.inf)
+
+    def overlay_needed(self) -> bool:
+        """True while the debug window, a stream client or a telemetry client is watching"""
+        return self.display_active or (self.stream is not None and
+                                       (self.stream.has_viewers or self.stream.has_telemetry_clients))
+
+    def render_overlay(self, frame: np.ndarray, obstacle_data: List[Dict], lane_data: Dict,
+                       pool: Optional[BufferPool] = None) -> Optional[np.ndarray]:
+        """
+        Draw the overlay for whoever is watching, or nothing if nobody is.
+
+        The overlay is drawn at camera resolution for the debug window and at the largest
+        resolution the stream clients watch when only they are connected. When the stream
+        does not burn overlays in, it gets the plain frame instead and the detections go to
+        its telemetry channel, tagged with that frame's sequence number.
+
+        Args:
+            pool: free-list pool to take the overlay buffer from (pipelined mode); by default
+                a scratch buffer is reused, valid until the next call
+
+        Returns:
+            The overlay, or None when nothing was drawn
+        """
+        if not self.overlay_needed():
+            return None
+        streaming = self.stream is not None and self.stream.has_viewers
+        telemetry = self.stream is not None and self.stream.has_telemetry_clients
+
+        if not self.undistorter.is_identity and (self.display_active or streaming):
+            # Detections are in undistorted pixels, so everything is shown on the undistorted frame
+            frame = self.undistorter.undistort(frame, dst=self.buffers.get('display', frame.shape, frame.dtype))
+
+        stream_size = self.stream.frame_size if streaming else None
+        burn_in = streaming and self.stream.burn_in_overlay
+        seq = None
+        if streaming and not burn_in:
+            # Plain frame: clients draw the overlay from the telemetry channel
+            seq = self._stream_frame(frame, stream_size)
+
+        overlay = None
+        if self.display_active or burn_in:
+            width, height = (frame.shape[1], frame.shape[0]) if self.display_active or stream_size is None else stream_size
+            shape = (height, width) + frame.shape[2:]
+            out = pool.acquire(shape, frame.dtype) if pool is not None else self.buffers.get('overlay', shape, frame.dtype)
+            overlay = self._visualize_results(frame, obstacle_data, lane_data, out=out)
+            if burn_in:
+                seq = self._stream_frame(overlay, stream_size)
+
+        if telemetry:
+            # Boxes and lines are in camera pixels; frame_size lets clients scale them to any variant
+            self.stream.update_telemetry(seq, obstacles=obstacle_data, lanes=lane_data,
+                                         frame_size=(frame.shape[1], frame.shape[0]))
+        return overlay
+
+    def _stream_frame(self, image: np.ndarray, size: Optional[Tuple[int, int]]) -> int:
+        # The stream encodes on its own thread, so it gets a frame nobody will draw into again
+        if size is None or (image.shape[1], image.shape[0]) == size:
+            return self.stream.update_frame(image.copy())
+        return self.stream.update_frame(cv2.resize(image, size, interpolation=cv2.INTER_AREA))
+
+    def _visualize_results(self, frame: np.ndarray, obstacle_data: List[Dict], lane_data: Dict,
+                           out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Draw obstacle boxes and lane info onto a copy of the frame.
+
+        When `out` is given the overlay is drawn into it, resized to its shape if needed.
+        """
+        if out is None:
+            output = frame.copy()
+        elif out.shape == frame.shape:
+            output = out
+            np.copyto(output, frame)
+        else:
+            output = cv2.resize(frame, (out.shape[1], out.shape[0]), dst=out, interpolation=cv2.INTER_AREA)
+        sx, sy = output.shape[1] / frame.shape[1], output.shape[0] / frame.shape[0]
+        y_offset = self._roi_offset(frame.shape[0])
+
+        for obstacle in obstacle_data:
+            x1, y1, x2, y2 = obstacle['bbox']
+            top_left = (int(x1 * sx), int((y1 + y_offset) * sy))
+            cv2.rectangle(output, top_left, (int(x2 * sx), int((y2 + y_offset) * sy)), (0, 0, 255), 2)
+            distance = f"{obstacle.get('distance', 0):.1f}m" if obstacle.get('distance_known', True) else "?"
+            label = f"{obstacle.get('label', 'obj')} {distance}"
+            cv2.putText(output, label, (top_left[0], max(0, top_left[1] - 5)),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1)
+
+        for line in (lane_data or {}).get('lines', []):
+            x1, y1, x2, y2 = line
+            cv2.line(output, (int(x1 * sx), int((y1 + y_offset) * sy)),
+                     (int(x2 * sx), int((y2 + y_offset) * sy)), (0, 255, 0), 2)
+
+        return output
 
-    # Keep other helper methods the same (_apply_roi, _detect_obstacles, etc.)
+    def release(self) -> None:
+        """Release the video source and any display windows"""
+        self.depth_scheduler.stop()
+        if self.cap is not None:
+            self.cap.release()
+        cv2.destroyAllWindows()
 
 if __name__ == "__main__":
     try:
-        # For webcam use (default camera)
-        processor = VisionProcessor(camera_index=2)
+        # DroidCam's MJPEG stream over USB; falls back to the V4L2 device if adb is unavailable
+        stream_url = GetWebcam().get_stream_url()
+        processor = VisionProcessor(camera_index=stream_url if stream_url else 2)
         processor.process_webcam()
     except Exception as e:
         print(f"Fatal error: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,315 @@
+import os
+import json
+import mmap
+import queue
+import shutil
+import struct
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, NamedTuple, Optional
+
+import config
+from edison.helpers.resource_plan import configure_thread
+from edison.helpers.serialization import to_json
+
+logger = logging.getLogger("BlackBox")
+
+FRAME = 1
+TELEMETRY = 2
+
+# magic, kind, seq, timestamp, payload length; written in front of every payload so the
+# ring file can be scanned for records even without the in-memory index
+_RECORD = struct.Struct('<IBqdI')
+_MAGIC = 0xB1AC0B0E
+
+
+class _Entry(NamedTuple):
+    position: int  # absolute byte position of the record header, ever increasing
+    kind: int
+    seq: int
+    timestamp: float
+    length: int
+
+
+def _multipart_body(part: bytes) -> memoryview:
+    """JPEG inside one multipart chunk from StreamManager, without copying it"""
+    start = part.index(b'\r\n\r\n') + 4
+    return memoryview(part)[start:len(part) - 2]
+
+
+def _event_data(event: bytes) -> memoryview:
+    """JSON payload of one server-sent event from StreamManager, without copying it"""
+    start = event.index(b'\ndata: ') + 7
+    return memoryview(event)[start:event.index(b'\n', start)]
+
+
+class BlackBoxRecorder:
+    """
+    Always-on flight recorder: the last `window_seconds` of JPEG frames and telemetry.
+
+    Records are appended to a fixed-size memory-mapped ring (a file, so the data survives a
+    crash, or anonymous memory with `path=None`); the newest data overwrites the oldest, so
+    memory use never exceeds `ring_bytes`. An in-memory index tracks which records are still
+    intact.
+
+    `trigger()` only queues a request. A background thread copies the window out of the ring
+    without holding the writers' lock and writes it to `output_dir` as an incident
+    (frames.mjpeg plus index.jsonl), deleting the oldest incidents to stay within
+    `disk_budget_bytes`. Writers therefore never wait for the disk.
+    """
+
+    def __init__(self, ring_bytes: int, window_seconds: float, output_dir: str, disk_budget_bytes: int,
+                 path: Optional[str] = None, jpeg_quality: int = 70):
+        self.capacity = ring_bytes
+        self.window_seconds = window_seconds
+        self.output_dir = output_dir
+        self.disk_budget_bytes = disk_budget_bytes
+        self.path = path
+        self.jpeg_quality = jpeg_quality
+
+        self._file = None
+        if path:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            self._file = open(path, 'w+b')
+            self._file.truncate(ring_bytes)
+            self._ring = mmap.mmap(self._file.fileno(), ring_bytes)
+        else:
+            self._ring = mmap.mmap(-1, ring_bytes)
+
+        self._lock = threading.Lock()
+        self._index: Deque[_Entry] = deque()
+        self._write_pos = 0
+        self._frame_seq = 0
+
+        self.records_written = 0
+        self.records_dropped = 0  # larger than a quarter of the ring
+        self.records_torn = 0     # overwritten while an incident was being copied out
+        self.incidents: List[str] = []
+
+        self._triggers: "queue.Queue" = queue.Queue()
+        self._running = True
+        self._followers: List[threading.Thread] = []
+        self._flusher = threading.Thread(target=self._flush_loop, name="blackbox-flush", daemon=True)
+        self._flusher.start()
+
+    @classmethod
+    def from_config(cls, settings: Optional[Dict] = None) -> "BlackBoxRecorder":
+        settings = config.BLACKBOX_CONFIG if settings is None else settings
+        return cls(ring_bytes=settings['ring_mb'] * 1024 * 1024,
+                   window_seconds=settings['window_seconds'],
+                   output_dir=settings['output_dir'],
+                   disk_budget_bytes=settings['disk_budget_mb'] * 1024 * 1024,
+                   path=settings['path'],
+                   jpeg_quality=settings['jpeg_quality'])
+
+    def record_jpeg(self, jpeg, timestamp: Optional[float] = None, seq: Optional[int] = None) -> bool:
+        """Store an already encoded JPEG (bytes or memoryview)."""
+        if seq is None:
+            self._frame_seq += 1
+            seq = self._frame_seq
+        return self._append(FRAME, seq, timestamp, jpeg)
+
+    def record_frame(self, image, timestamp: Optional[float] = None, seq: Optional[int] = None) -> bool:
+        """Encode and store a BGR frame; prefer record_jpeg() or attach_stream() when JPEGs exist already."""
+        import cv2
+        ret, buffer = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+        return ret and self.record_jpeg(buffer.data, timestamp, seq)
+
+    def record_telemetry(self, timestamp: Optional[float] = None, seq: int = 0, **fields: Any) -> bool:
+        """Store telemetry (e.g. location, commanded speed and direction, detections)."""
+        return self._append(TELEMETRY, seq, timestamp, json.dumps(fields, default=to_json).encode())
+
+    def attach_stream(self, stream, variant: Optional[str] = None) -> None:
+        """
+        Record the JPEGs and telemetry events a StreamManager already encodes.
+
+        Subscribes to one quality of `variant` and to the telemetry channel, so both keep being
+        produced while no browser is connected; frames shared with live clients are encoded
+        only once. The telemetry subscription counts against `max_telemetry_clients`. Also adds
+        POST /blackbox to the stream's server, so call this before `start_stream()`.
+        """
+        frames = stream.variants[variant or config.BLACKBOX_CONFIG['variant']].broadcasters[0]
+        self._follow(frames, lambda encoded: self.record_jpeg(_multipart_body(encoded.data),
+                                                              encoded.timestamp, encoded.seq))
+        self._follow(stream.telemetry, lambda encoded: self._append(TELEMETRY, encoded.seq, encoded.timestamp,
+                                                                    _event_data(encoded.data)))
+
+        def trigger_endpoint():
+            self.trigger("api")
+            return "Recording incident\n", 202
+
+        stream.app.add_url_rule('/blackbox', 'blackbox', trigger_endpoint, methods=['POST'])
+
+    def trigger(self, reason: str = "manual") -> None:
+        """Save the last `window_seconds` to disk in the background; returns immediately."""
+        self._triggers.put((reason, time.time()))
+
+    def stop(self) -> None:
+        self._running = False
+        for thread in self._followers:
+            thread.join(timeout=2)
+        self._triggers.put(None)
+        self._flusher.join(timeout=30)
+        with self._lock:
+            self._index.clear()
+            self._ring.close()
+        if self._file is not None:
+            self._file.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            used = min(self._write_pos, self.capacity)
+            records = len(self._index)
+        return {
+            'records': records,
+            'ring_used_bytes': used,
+            'written': self.records_written,
+            'dropped': self.records_dropped,
+            'torn': self.records_torn,
+            'incidents': len(self.incidents),
+        }
+
+    def _append(self, kind: int, seq: int, timestamp: Optional[float], payload) -> bool:
+        timestamp = time.time() if timestamp is None else timestamp
+        length = len(payload)
+        total = _RECORD.size + length
+        if total > self.capacity // 4:
+            self.records_dropped += 1
+            return False
+
+        with self._lock:
+            if not self._running:
+                return False
+            start = self._write_pos
+            offset = start % self.capacity
+            if offset + total > self.capacity:
+                # Records never wrap; skip to the start of the ring
+                start += self.capacity - offset
+                offset = 0
+            # The space is reserved before it is written, so readers copying without the
+            # lock can tell afterwards whether their record was overwritten
+            self._write_pos = start + total
+            oldest = self._write_pos - self.capacity
+            while self._index and self._index[0].position < oldest:
+                self._index.popleft()
+
+            _RECORD.pack_into(self._ring, offset, _MAGIC, kind, seq, timestamp, length)
+            self._ring[offset + _RECORD.size:offset + total] = payload
+            self._index.append(_Entry(start, kind, seq, timestamp, length))
+            self.records_written += 1
+        return True
+
+    def _read(self, entry: _Entry) -> Optional[bytes]:
+        offset = entry.position % self.capacity + _RECORD.size
+        data = self._ring[offset:offset + entry.length]
+        # Still intact if the writers have not come back around to it during the copy
+        if entry.position < self._write_pos - self.capacity:
+            self.records_torn += 1
+            return None
+        return data
+
+    def _follow(self, broadcaster, record) -> None:
+        def loop():
+            configure_thread('streaming')
+            broadcaster.subscribe()
+            try:
+                last = 0
+                while self._running:
+                    encoded = broadcaster.wait_newer(last, timeout=1.0)
+                    if encoded is None:
+                        continue
+                    last = encoded.seq
+                    try:
+                        record(encoded)
+                    except ValueError as e:
+                        logger.warning(f"Skipping a malformed record: {str(e)}")
+            finally:
+                broadcaster.unsubscribe()
+
+        thread = threading.Thread(target=loop, name="blackbox-follow", daemon=True)
+        thread.start()
+        self._followers.append(thread)
+
+    def _flush_loop(self) -> None:
+        while True:
+            request = self._triggers.get()
+            if request is None:
+                return
+            reason, triggered_at = request
+            try:
+                self.flush(reason, triggered_at)
+            except OSError as e:
+                logger.error(f"Failed to save black-box incident '{reason}': {str(e)}")
+
+    def flush(self, reason: str = "manual", until: Optional[float] = None) -> Optional[str]:
+        """
+        Write the records of the last `window_seconds` before `until` to a new incident directory.
+
+        Runs on the flush thread for trigger(); only the index snapshot takes the writers' lock.
+
+        Returns:
+            The incident directory, or None if there was nothing to save
+        """
+        with self._lock:
+            entries = list(self._index)
+        if until is None:
+            until = entries[-1].timestamp if entries else 0.0
+        entries = [e for e in entries if until - self.window_seconds <= e.timestamp <= until]
+
+        records = []
+        for entry in entries:
+            data = self._read(entry)
+            if data is not None:
+                records.append((entry, data))
+        # Stay within the disk budget even if the window alone would exceed it
+        size = sum(len(data) + 128 for _, data in records)
+        while records and size > self.disk_budget_bytes:
+            size -= len(records.pop(0)[1]) + 128
+        if not records:
+            return None
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._make_room(size)
+        # Names sort chronologically, which is the order _make_room deletes in
+        name = f"{datetime.fromtimestamp(until).strftime('%Y-%m-%d_%H-%M-%S_%f')}_{reason}"
+        target = os.path.join(self.output_dir, name)
+        partial = target + ".partial"
+        os.makedirs(partial, exist_ok=True)
+
+        offset = 0
+        with open(os.path.join(partial, "frames.mjpeg"), 'wb') as frames, \
+                open(os.path.join(partial, "index.jsonl"), 'w') as index:
+            for entry, data in records:
+                line = {'seq': entry.seq, 'timestamp': entry.timestamp}
+                if entry.kind == FRAME:
+                    frames.write(data)
+                    line.update(kind='frame', offset=offset, length=len(data))
+                    offset += len(data)
+                else:
+                    line.update(kind='telemetry', data=json.loads(data))
+                index.write(json.dumps(line) + "\n")
+        # Incidents appear complete or not at all
+        os.replace(partial, target)
+        self.incidents.append(target)
+        logger.info(f"Saved black-box incident '{reason}': {len(records)} records in {target}")
+        return target
+
+    def _make_room(self, needed: int) -> None:
+        incidents = sorted(os.path.join(self.output_dir, name) for name in os.listdir(self.output_dir))
+        sizes = {path: _directory_size(path) for path in incidents}
+        used = sum(sizes.values())
+        while incidents and used + needed > self.disk_budget_bytes:
+            oldest = incidents.pop(0)
+            shutil.rmtree(oldest, ignore_errors=True)
+            used -= sizes[oldest]
+            logger.info(f"Deleted black-box incident {oldest} to stay within the disk budget")
+
+
+def _directory_size(path: str) -> int:
+    if not os.path.isdir(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, names in os.walk(path) for name in names)
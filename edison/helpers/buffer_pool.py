@@ -0,0 +1,106 @@
+import threading
+import numpy as np
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+Allocator = Callable[[Tuple[int, ...], np.dtype], np.ndarray]
+
+
+def _numpy_allocator(shape: Tuple[int, ...], dtype: np.dtype) -> np.ndarray:
+    return np.empty(shape, dtype=dtype)
+
+
+def pinned_allocator(shape: Tuple[int, ...], dtype: np.dtype) -> np.ndarray:
+    """
+    NumPy view of a preallocated torch tensor, so `torch.from_numpy` on it never copies.
+
+    The memory is page-locked when CUDA is available; on CPU-only builds pinning is not
+    supported and a regular tensor is used.
+    """
+    import torch
+    tensor = torch.empty(shape, dtype=torch.from_numpy(np.empty(0, dtype=dtype)).dtype,
+                         pin_memory=torch.cuda.is_available())
+    return tensor.numpy()
+
+
+class BufferPool:
+    """
+    Reusable arrays for the per-frame hot loop.
+
+    Two kinds of buffers are handed out:
+
+    - `get(name, ...)`: a named scratch buffer owned by one stage (e.g. the letterbox output).
+      The same array is returned every frame until the requested shape or dtype changes, so
+      it must not be kept past the next call with that name.
+    - `acquire(...)` / `release(array)`: a free list for buffers that travel between threads
+      (e.g. captured frames). Whoever holds the buffer last releases it; a buffer that is
+      never released is simply garbage collected.
+
+    `allocations` counts every array the pool had to create; in steady state it stops growing.
+    With `enabled=False` every request allocates, which is useful for comparing the two.
+    """
+
+    def __init__(self, enabled: bool = True, max_free: int = 8):
+        self.enabled = enabled
+        self.max_free = max_free
+        self.allocations = 0
+        self.reuses = 0
+        self._named: Dict[str, np.ndarray] = {}
+        self._free: Dict[Tuple[Tuple[int, ...], str], List[np.ndarray]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def _allocate(self, shape: Tuple[int, ...], dtype: np.dtype, allocator: Optional[Allocator]) -> np.ndarray:
+        with self._lock:
+            self.allocations += 1
+        return (allocator or _numpy_allocator)(shape, dtype)
+
+    def get(self, name: str, shape: Tuple[int, ...], dtype=np.uint8,
+            allocator: Optional[Allocator] = None) -> np.ndarray:
+        """Named scratch buffer of the given shape, reused across calls."""
+        shape, dtype = tuple(shape), np.dtype(dtype)
+        if self.enabled:
+            with self._lock:
+                buffer = self._named.get(name)
+                if buffer is not None and buffer.shape == shape and buffer.dtype == dtype:
+                    self.reuses += 1
+                    return buffer
+        buffer = self._allocate(shape, dtype, allocator)
+        if self.enabled:
+            with self._lock:
+                self._named[name] = buffer
+        return buffer
+
+    def acquire(self, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        """Take a buffer from the free list, allocating one if none is available."""
+        shape, dtype = tuple(shape), np.dtype(dtype)
+        if self.enabled:
+            with self._lock:
+                free = self._free.get((shape, dtype.str))
+                if free:
+                    self.reuses += 1
+                    return free.pop()
+        return self._allocate(shape, dtype, None)
+
+    def release(self, buffer: Optional[np.ndarray]) -> None:
+        """Return a buffer obtained from acquire() once nothing references it anymore."""
+        if not self.enabled or not isinstance(buffer, np.ndarray):
+            return
+        with self._lock:
+            free = self._free[(buffer.shape, buffer.dtype.str)]
+            if len(free) < self.max_free and not any(b is buffer for b in free):
+                free.append(buffer)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._named.clear()
+            self._free.clear()
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes currently held by the pool."""
+        with self._lock:
+            return (sum(b.nbytes for b in self._named.values())
+                    + sum(b.nbytes for free in self._free.values() for b in free))
+
+    def stats(self) -> Dict[str, int]:
+        return {'allocations': self.allocations, 'reuses': self.reuses, 'pooled_bytes': self.nbytes}
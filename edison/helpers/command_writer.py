@@ -0,0 +1,109 @@
+import time
+import logging
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+from edison.helpers.resource_plan import configure_thread
+
+logger = logging.getLogger("CommandWriter")
+
+
+class CommandWriter:
+    """
+    Sends the newest desired (direction, speed) to the car from one dedicated thread.
+
+    `submit()` only overwrites a single-slot mailbox and returns, so callers never wait for
+    the serial port. The writer thread sends at most one packet per `interval` seconds,
+    always built from the newest values; commands superseded before they were sent are
+    dropped and counted as coalesced.
+    """
+
+    def __init__(self, send: Callable[[bytes], None], build: Callable[[int, int], bytes],
+                 interval: float = 0.02, name: str = "serial"):
+        self.send = send
+        self.build = build
+        self.interval = interval
+        self.name = name
+
+        self.commands_submitted = 0
+        self.packets_sent = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.last_latency = 0.0   # seconds from submit() of the sent command until written
+        self.max_latency = 0.0
+        self._latency_total = 0.0
+
+        self._cond = threading.Condition()
+        self._pending: Optional[Tuple[int, int]] = None
+        self._submitted_at = 0.0
+        self._sending = False
+        self._running = True
+        self._thread = threading.Thread(target=self._write_loop, name=f"{name}-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, direction: int, speed: int) -> None:
+        """Replace the command waiting to be sent with this one."""
+        with self._cond:
+            if self._pending is not None:
+                self.coalesced += 1
+            self._pending = (direction, speed)
+            self._submitted_at = time.perf_counter()
+            self.commands_submitted += 1
+            self._cond.notify()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the pending command has been written; True if it was."""
+        with self._cond:
+            return self._cond.wait_for(lambda: (self._pending is None and not self._sending) or not self._running,
+                                       timeout)
+
+    def stop(self) -> None:
+        """Send the pending command, if any, and stop the writer thread."""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        self._thread.join(timeout=1.0)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            'submitted': self.commands_submitted,
+            'sent': self.packets_sent,
+            'coalesced': self.coalesced,
+            'errors': self.errors,
+            'latency_ms': self.last_latency * 1000,
+            'mean_latency_ms': self._latency_total / max(self.packets_sent, 1) * 1000,
+            'max_latency_ms': self.max_latency * 1000,
+        }
+
+    def _write_loop(self) -> None:
+        configure_thread('control')
+        next_send = 0.0
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending is not None or not self._running)
+                if self._pending is None:
+                    return
+            # Rate limit outside the lock so submit() never waits; commands arriving
+            # meanwhile replace the pending one
+            delay = next_send - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+            with self._cond:
+                (direction, speed), submitted_at = self._pending, self._submitted_at
+                self._pending = None
+                self._sending = True
+            try:
+                self.send(self.build(direction, speed))
+                now = time.perf_counter()
+                self.packets_sent += 1
+                self.last_latency = now - submitted_at
+                self.max_latency = max(self.max_latency, self.last_latency)
+                self._latency_total += self.last_latency
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"{self.name}: sending direction={direction} speed={speed} failed: {str(e)}")
+            next_send = time.perf_counter() + self.interval
+            with self._cond:
+                self._sending = False
+                self._cond.notify_all()
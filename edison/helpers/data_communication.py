@@ -1,9 +1,27 @@
-from typing import List, ByteString
+from typing import Callable, Dict, List, ByteString, NamedTuple, Optional, Union
+from dataclasses import dataclass
 import os
+import struct
 from dotenv import load_dotenv
 
 load_dotenv()
 
+
+def start_byte_from_env() -> int:
+    """Read the PACKET_START_BYTE environment variable shared by commands and responses."""
+    start_byte = os.getenv("PACKET_START_BYTE")
+    if not start_byte:
+        raise EnvironmentError("PACKET_START_BYTE environment variable not set")
+
+    try:
+        # Handle hex format (0xXX) or decimal format
+        return int(start_byte, 0) & 0xFF
+    except ValueError:
+        raise ValueError(
+            f"Invalid PACKET_START_BYTE format: {start_byte}. "
+            "Use decimal (255) or hex (0xff) format."
+        ) from None
+
 class DataPacketBuilder:
     """Constructs binary data packets with sequence tracking and checksum validation."""
     
@@ -22,18 +40,7 @@ class DataPacketBuilder:
         
     def _validate_start_byte(self) -> int:
         """Validate and convert PACKET_START_BYTE environment variable to integer."""
-        start_byte = os.getenv("PACKET_START_BYTE")
-        if not start_byte:
-            raise EnvironmentError("PACKET_START_BYTE environment variable not set")
-        
-        try:
-            # Handle hex format (0xXX) or decimal format
-            return int(start_byte, 0) & self._BYTE_MASK
-        except ValueError:
-            raise ValueError(
-                f"Invalid PACKET_START_BYTE format: {start_byte}. "
-                "Use decimal (255) or hex (0xff) format."
-            ) from None
+        return start_byte_from_env()
 
     def calculate_checksum(self, data: List[int]) -> int:
         """
@@ -97,6 +104,117 @@ class DataPacketBuilder:
                 f"{field_name} must be between 0-255. Got: {value}"
             )
 
+@dataclass(frozen=True)
+class AckFrame:
+    """The Arduino applied the command packet with this sequence number."""
+    seq: int
+
+
+@dataclass(frozen=True)
+class StatusFrame:
+    """Speed and direction the Arduino is currently driving with, plus status flags."""
+    speed: int
+    direction: int
+    flags: int
+
+
+@dataclass(frozen=True)
+class SensorFrame:
+    """One signed 16-bit sensor reading."""
+    sensor_id: int
+    value: int
+
+
+ResponseFrame = Union[AckFrame, StatusFrame, SensorFrame]
+
+
+class _ResponseType(NamedTuple):
+    layout: struct.Struct
+    frame: Callable[..., ResponseFrame]
+
+
+# Frame type byte -> payload layout (big-endian) and the frame it decodes to
+RESPONSE_TYPES: Dict[int, _ResponseType] = {
+    0x01: _ResponseType(struct.Struct('>B'), AckFrame),
+    0x02: _ResponseType(struct.Struct('>BBB'), StatusFrame),
+    0x03: _ResponseType(struct.Struct('>Bh'), SensorFrame),
+}
+
+
+class ResponsePacketParser:
+    """
+    Incremental decoder for the frames the Arduino sends back.
+
+    Frame Structure:
+    [Start Byte][Type][Payload Length][Payload...][Checksum]
+
+    The checksum is the 8-bit sum of every byte before it, as for command packets. Bytes are
+    accumulated in one reusable bytearray; the parser resynchronizes on the next start byte
+    after garbage, unknown types, wrong lengths or checksum errors, and scans with
+    bytearray.find and struct instead of a Python loop per byte.
+    """
+
+    _HEADER_SIZE = 3
+
+    def __init__(self, start_byte: Optional[int] = None, types: Optional[Dict[int, _ResponseType]] = None):
+        self.start_byte = start_byte_from_env() if start_byte is None else start_byte & 0xFF
+        self.types = RESPONSE_TYPES if types is None else types
+        self.buffer = bytearray()
+
+        self.frames_decoded = 0
+        self.checksum_errors = 0
+        self.bytes_discarded = 0  # skipped while resynchronizing
+
+    def feed(self, data: ByteString) -> List[ResponseFrame]:
+        """
+        Append received bytes and decode every complete frame in the buffer.
+
+        Returns:
+            The decoded frames in arrival order; an incomplete trailing frame is kept for
+            the next call
+        """
+        buffer = self.buffer
+        buffer += data
+        frames = []
+        position = 0
+        while True:
+            start = buffer.find(self.start_byte, position)
+            if start < 0:
+                self.bytes_discarded += len(buffer) - position
+                position = len(buffer)
+                break
+            self.bytes_discarded += start - position
+            if len(buffer) - start < self._HEADER_SIZE:
+                position = start
+                break
+
+            response_type = self.types.get(buffer[start + 1])
+            length = buffer[start + 2]
+            if response_type is None or length != response_type.layout.size:
+                # A start byte inside other data; try the next one
+                self.bytes_discarded += 1
+                position = start + 1
+                continue
+
+            end = start + self._HEADER_SIZE + length + 1
+            if len(buffer) < end:
+                position = start
+                break
+            if sum(buffer[start:end - 1]) & 0xFF != buffer[end - 1]:
+                self.checksum_errors += 1
+                self.bytes_discarded += 1
+                position = start + 1
+                continue
+
+            frames.append(response_type.frame(*response_type.layout.unpack_from(buffer, start + self._HEADER_SIZE)))
+            position = end
+
+        # What is left is at most one partial frame
+        del buffer[:position]
+        self.frames_decoded += len(frames)
+        return frames
+
+
 if __name__ == "__main__":
     try:
         builder = DataPacketBuilder()
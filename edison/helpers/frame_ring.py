@@ -0,0 +1,223 @@
+import time
+import numpy as np
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Tuple
+
+# Per-slot integer metadata fields (e.g. width, height, source id, flags)
+META_FIELDS = 4
+_HEADER_FIELDS = 8  # latest seq, slots, ndim, shape[0..3], dtype code
+_WRITING = -1
+_EMPTY = -2
+_ALIGN = 64
+
+
+def _aligned(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def _dtype_code(dtype: np.dtype) -> int:
+    """Pack a dtype's array-protocol string (e.g. '|u1', '<f4') into one header field."""
+    return int.from_bytes(dtype.str.encode('ascii').ljust(8, b'\0'), 'little')
+
+
+def _code_dtype(code: int) -> np.dtype:
+    return np.dtype(int(code).to_bytes(8, 'little').rstrip(b'\0').decode('ascii'))
+
+
+@dataclass
+class FrameView:
+    """Zero-copy view of one frame in the ring."""
+    ring: "SharedFrameRing"
+    slot: int
+    seq: int
+    timestamp: float
+    meta: np.ndarray
+    array: np.ndarray
+
+    def is_valid(self) -> bool:
+        """False once the producer has started overwriting this slot (torn or stale frame)."""
+        return int(self.ring._state[self.slot]) == self.seq
+
+    def copy(self) -> Optional[np.ndarray]:
+        """Copy the frame out, or None if it was overwritten while copying."""
+        frame = self.array.copy()
+        return frame if self.is_valid() else None
+
+
+class SharedFrameRing:
+    """
+    Fixed ring of preallocated frame slots in `multiprocessing.shared_memory`.
+
+    Frame number `seq` lives in slot `seq % slots`. Each slot has a state word that is set to
+    WRITING before the producer touches the pixels and to `seq` once the frame is complete,
+    so consumers can take NumPy views without copying and afterwards call
+    `FrameView.is_valid()` to detect frames that were torn or overwritten.
+
+    Only one producer per ring is supported. Consumers in other processes attach by name
+    with `SharedFrameRing.attach(name)`; shape and dtype are read from the header.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, slots: int, shape: Tuple[int, ...],
+                 dtype: np.dtype, owner: bool):
+        self._shm = shm
+        self.slots = slots
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.owner = owner
+        self._views(shm.buf)
+
+    @classmethod
+    def create(cls, slots: int, shape: Tuple[int, ...], dtype=np.uint8, name: Optional[str] = None) -> "SharedFrameRing":
+        """Allocate a new ring; the creating process owns it and should call unlink()."""
+        if slots < 2:
+            raise ValueError(f"A frame ring needs at least 2 slots. Got: {slots}")
+        if len(shape) > 4:
+            raise ValueError(f"Frames can have at most 4 dimensions. Got shape: {shape}")
+        dtype = np.dtype(dtype)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=cls._size(slots, shape, dtype))
+        ring = cls(shm, slots, shape, dtype, owner=True)
+
+        ring._header[:] = 0
+        ring._header[0] = -1
+        ring._header[1] = slots
+        ring._header[2] = len(shape)
+        ring._header[3:3 + len(shape)] = shape
+        ring._header[7] = _dtype_code(dtype)
+        ring._state[:] = _EMPTY
+        return ring
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedFrameRing":
+        """Attach to a ring created by another process."""
+        shm = shared_memory.SharedMemory(name=name)
+        _untrack(shm)
+        header = np.ndarray((_HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf)
+        slots, ndim = int(header[1]), int(header[2])
+        shape = tuple(int(v) for v in header[3:3 + ndim])
+        dtype = _code_dtype(header[7])
+        del header
+        return cls(shm, slots, shape, dtype, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def spec(self) -> Dict:
+        """Picklable description for handing the ring to another process."""
+        return {'name': self.name}
+
+    @staticmethod
+    def _size(slots: int, shape: Tuple[int, ...], dtype: np.dtype) -> int:
+        offset = _aligned(_HEADER_FIELDS * 8)
+        offset = _aligned(offset + slots * 8)  # state
+        offset = _aligned(offset + slots * 8)  # timestamps
+        offset = _aligned(offset + slots * META_FIELDS * 8)
+        frame_bytes = int(np.prod(shape)) * dtype.itemsize
+        return offset + slots * _aligned(frame_bytes)
+
+    def _views(self, buf) -> None:
+        offset = 0
+        self._header = np.ndarray((_HEADER_FIELDS,), dtype=np.int64, buffer=buf, offset=offset)
+        offset = _aligned(_HEADER_FIELDS * 8)
+        self._state = np.ndarray((self.slots,), dtype=np.int64, buffer=buf, offset=offset)
+        offset = _aligned(offset + self.slots * 8)
+        self._timestamps = np.ndarray((self.slots,), dtype=np.float64, buffer=buf, offset=offset)
+        offset = _aligned(offset + self.slots * 8)
+        self._meta = np.ndarray((self.slots, META_FIELDS), dtype=np.int64, buffer=buf, offset=offset)
+        offset = _aligned(offset + self.slots * META_FIELDS * 8)
+
+        frame_bytes = int(np.prod(self.shape)) * self.dtype.itemsize
+        self._frame_stride = _aligned(frame_bytes)
+        self._frames = [
+            np.ndarray(self.shape, dtype=self.dtype, buffer=buf, offset=offset + i * self._frame_stride)
+            for i in range(self.slots)
+        ]
+
+    @property
+    def latest_seq(self) -> int:
+        """Sequence number of the newest committed frame, -1 if none yet."""
+        return int(self._header[0])
+
+    def begin_write(self) -> Tuple[int, np.ndarray]:
+        """
+        Reserve the next slot for in-place writing.
+
+        Returns:
+            (seq, writable view of the slot); call commit(seq) when the frame is complete
+        """
+        seq = self.latest_seq + 1
+        slot = seq % self.slots
+        self._state[slot] = _WRITING
+        return seq, self._frames[slot]
+
+    def commit(self, seq: int, timestamp: Optional[float] = None, meta: Tuple[int, ...] = ()) -> None:
+        slot = seq % self.slots
+        self._timestamps[slot] = time.time() if timestamp is None else timestamp
+        self._meta[slot, :] = 0
+        self._meta[slot, :len(meta)] = meta
+        self._state[slot] = seq
+        self._header[0] = seq
+
+    def write(self, frame: np.ndarray, timestamp: Optional[float] = None, meta: Tuple[int, ...] = ()) -> int:
+        """Copy a frame into the next slot (the one copy on the producer side)."""
+        if frame.shape != self.shape:
+            raise ValueError(f"Frame shape {frame.shape} does not match ring shape {self.shape}")
+        seq, target = self.begin_write()
+        np.copyto(target, frame, casting='unsafe')
+        self.commit(seq, timestamp, meta)
+        return seq
+
+    def get(self, seq: int) -> Optional[FrameView]:
+        """View of a specific frame, or None if it is not (or no longer) in the ring."""
+        if seq < 0:
+            return None
+        slot = seq % self.slots
+        if int(self._state[slot]) != seq:
+            return None
+        view = FrameView(self, slot, seq, float(self._timestamps[slot]),
+                         self._meta[slot].copy(), self._frames[slot])
+        return view if view.is_valid() else None
+
+    def latest(self) -> Optional[FrameView]:
+        """View of the newest committed frame."""
+        return self.get(self.latest_seq)
+
+    def wait_newer(self, after_seq: int, timeout: Optional[float] = None,
+                   poll_interval: float = 0.002) -> Optional[FrameView]:
+        """Poll until a frame newer than `after_seq` is committed, then return a view of the newest one."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self.latest_seq > after_seq:
+                view = self.latest()
+                if view is not None:
+                    return view
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            time.sleep(poll_interval)
+
+    def close(self) -> None:
+        # Views must be released before the buffer can be closed
+        self._header = self._state = self._timestamps = self._meta = None
+        self._frames = []
+        self._shm.close()
+
+    def unlink(self) -> None:
+        if self.owner:
+            self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        self.unlink()
+
+
+def _untrack(shm: shared_memory.SharedMemory) -> None:
+    """Stop the resource tracker from unlinking a segment this process only attached to."""
+    try:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
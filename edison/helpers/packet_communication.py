@@ -1,6 +1,12 @@
-from serial import Serial
-from typing import ByteString, Optional
-from edison.helpers.data_communication import DataPacketBuilder
+import logging
+import threading
+from collections import defaultdict
+from serial import Serial, SerialException
+from typing import ByteString, Callable, Dict, List, Optional, Type
+from edison.helpers.data_communication import DataPacketBuilder, ResponseFrame, ResponsePacketParser
+from edison.helpers.resource_plan import configure_thread
+
+logger = logging.getLogger("PacketCommunication")
 
 class PacketCommuncation:
     def __init__(self, port: str, baud_rate: int = 9600, timeout: Optional[float] = 1.0):
@@ -15,6 +21,10 @@ class PacketCommuncation:
         self.baud_rate = baud_rate
         self.timeout = timeout
         self.ser: Serial = None
+        self.parser = ResponsePacketParser()
+        self._subscribers: Dict[Optional[Type], List[Callable[[ResponseFrame], None]]] = defaultdict(list)
+        self._reader: Optional[threading.Thread] = None
+        self._reading = False
 
         try: 
             self.open_connection()
@@ -29,6 +39,7 @@ class PacketCommuncation:
         
     def close_connection(self):
         """Closes the serial connection."""
+        self.stop_recieving()
         if self.ser and self.ser.is_open:
             self.ser.close()
     
@@ -39,27 +50,57 @@ class PacketCommuncation:
         
         self.ser.write(data_packet)
 
-    def recieve_packet(self) -> str:
-        # must initialize as a separate process to completely for it to work maybe run it in a different thread
+    def recieve_packet(self) -> List[ResponseFrame]:
+        """
+        Decode the response frames that have arrived, without waiting for more.
+
+        Use either this or the reader thread started by init_recieving_packet_process(), not both.
+        """
         if not self.ser or not self.ser.is_open:
-            raise RuntimeError("Serial port is not established, Error recieving the packegt")   
+            raise RuntimeError("Serial port is not established, Error recieving the packegt")
 
-        try:
-            data = self.ser.readline()
-            return data if data else None
-        except Exception as e:
-            print(f"Error recieving the packet")
+        waiting = self.ser.in_waiting
+        return self.parser.feed(self.ser.read(waiting)) if waiting else []
 
+    def subscribe(self, callback: Callable[[ResponseFrame], None], frame_type: Optional[Type] = None) -> None:
+        """
+        Call `callback` with every decoded frame of `frame_type` (e.g. AckFrame), or with all
+        frames when it is None. Callbacks run on the reader thread and should return quickly.
+        """
+        self._subscribers[frame_type].append(callback)
+
+    def init_recieving_packet_process(self) -> None:
+        """Start the reader thread that decodes responses and dispatches them to subscribers."""
+        if self._reader is not None and self._reader.is_alive():
+            return
+        self._reading = True
+        self._reader = threading.Thread(target=self._read_loop, name="serial-reader", daemon=True)
+        self._reader.start()
 
-    def init_recieving_packet_process(self):
-        while True:
+    def stop_recieving(self) -> None:
+        self._reading = False
+        if self._reader is not None:
+            self._reader.join(timeout=(self.timeout or 0) + 1)
+
+    def _read_loop(self) -> None:
+        configure_thread('control')
+        while self._reading:
             try:
-                data = self.recieve_packet()
-                if data is not None:
-                    print(f"[+] Arduino: {data}")
-            except Exception as e:
-                raise RuntimeError(f"Error initializing the packet recieving process: {e}")
+                # Whatever has arrived, or wait for one byte for at most the port timeout
+                data = self.ser.read(self.ser.in_waiting or 1)
+            except SerialException as e:
+                logger.error(f"Serial reader stopped: {str(e)}")
                 break
+            if data:
+                self._dispatch(self.parser.feed(data))
+
+    def _dispatch(self, frames: List[ResponseFrame]) -> None:
+        for frame in frames:
+            for callback in self._subscribers[type(frame)] + self._subscribers[None]:
+                try:
+                    callback(frame)
+                except Exception as e:
+                    logger.error(f"Subscriber for {type(frame).__name__} failed: {str(e)}")
 
     def __enter__(self):
         """Allows usage of the class in a context manager."""
@@ -0,0 +1,154 @@
+import os
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Set
+
+import config
+
+logger = logging.getLogger("ResourcePlan")
+
+ROLES = ('capture', 'inference', 'control', 'streaming')
+
+
+def _plan(plan: Optional[Dict]) -> Dict:
+    return config.RESOURCE_PLAN if plan is None else plan
+
+
+def _available_cores() -> Set[int]:
+    try:
+        return os.sched_getaffinity(0)
+    except AttributeError:
+        return set(range(os.cpu_count() or 1))
+
+
+def apply_library_threads(plan: Optional[Dict] = None) -> Dict[str, int]:
+    """
+    Size the torch and OpenCV thread pools from the plan.
+
+    Call once per process before the first inference: torch only accepts a new inter-op
+    thread count before any inter-op work has run.
+
+    Returns:
+        The thread counts that were applied
+    """
+    plan = _plan(plan)
+    applied = {}
+    if not plan['enabled']:
+        return applied
+
+    try:
+        import torch
+        torch.set_num_threads(plan['torch_intra_op_threads'])
+        applied['torch_intra_op'] = plan['torch_intra_op_threads']
+        try:
+            torch.set_num_interop_threads(plan['torch_inter_op_threads'])
+            applied['torch_inter_op'] = plan['torch_inter_op_threads']
+        except RuntimeError as e:
+            logger.warning(f"torch inter-op threads already started, keeping them: {str(e)}")
+    except ImportError:
+        pass
+
+    try:
+        import cv2
+        cv2.setNumThreads(plan['opencv_threads'])
+        applied['opencv'] = plan['opencv_threads']
+    except ImportError:
+        pass
+
+    logger.info(f"Library thread pools: {applied}")
+    return applied
+
+
+def pin_current_thread(role: str, plan: Optional[Dict] = None) -> Optional[List[int]]:
+    """
+    Restrict the calling thread to the cores the plan gives `role`.
+
+    Threads inherit the affinity of the thread that starts them, so torch and OpenCV worker
+    pools created from a pinned inference thread stay on the inference cores.
+
+    Returns:
+        The cores the thread now runs on, or None if nothing was changed
+    """
+    plan = _plan(plan)
+    if not plan['enabled'] or not hasattr(os, 'sched_setaffinity'):
+        return None
+    cores = set(plan['cores'].get(role, ())) & _available_cores()
+    if not cores:
+        return None
+    try:
+        # On Linux, pid 0 is the calling thread, not the whole process
+        os.sched_setaffinity(0, cores)
+    except OSError as e:
+        logger.warning(f"Could not pin {role} thread to cores {sorted(cores)}: {str(e)}")
+        return None
+    return sorted(cores)
+
+
+@contextmanager
+def pinned_as(role: str, plan: Optional[Dict] = None) -> Iterator[Optional[List[int]]]:
+    """
+    Run a block on the cores of `role`, then restore the calling thread's affinity.
+
+    For work such as model warm-up on a thread that has another job afterwards: worker
+    threads started inside the block (torch and OpenMP pools) keep the role's cores, while
+    threads the caller starts later do not inherit them.
+
+    Yields:
+        The cores the block runs on, or None if nothing was changed
+    """
+    previous = os.sched_getaffinity(0) if hasattr(os, 'sched_getaffinity') else None
+    cores = pin_current_thread(role, plan)
+    try:
+        yield cores
+    finally:
+        if cores is not None and previous is not None:
+            try:
+                os.sched_setaffinity(0, previous)
+            except OSError as e:
+                logger.warning(f"Could not restore affinity {sorted(previous)} after {role} work: {str(e)}")
+
+
+def raise_thread_priority(role: str, plan: Optional[Dict] = None) -> Optional[str]:
+    """
+    Raise the calling thread's scheduling priority if the plan asks for it.
+
+    Tries SCHED_FIFO first (needs root or CAP_SYS_NICE), then a negative nice value for the
+    thread, and leaves the thread alone if neither is permitted.
+
+    Returns:
+        A description of the applied policy, or None
+    """
+    plan = _plan(plan)
+    priority = plan['priorities'].get(role) if plan['enabled'] else None
+    if not priority:
+        return None
+    thread_id = threading.get_native_id()
+
+    realtime = priority.get('realtime')
+    if realtime and hasattr(os, 'sched_setscheduler'):
+        try:
+            os.sched_setscheduler(thread_id, os.SCHED_FIFO, os.sched_param(realtime))
+            return f"SCHED_FIFO {realtime}"
+        except OSError as e:
+            logger.warning(f"SCHED_FIFO for the {role} thread not permitted ({str(e)}), trying nice")
+
+    nice = priority.get('nice')
+    if nice is not None and hasattr(os, 'setpriority'):
+        try:
+            # With a thread id, setpriority only affects that thread on Linux
+            os.setpriority(os.PRIO_PROCESS, thread_id, nice)
+            return f"nice {nice}"
+        except OSError as e:
+            logger.warning(f"nice {nice} for the {role} thread not permitted: {str(e)}")
+    return None
+
+
+def configure_thread(role: str, plan: Optional[Dict] = None) -> None:
+    """Pin the calling thread and adjust its priority for `role`; call first thing in a thread's target."""
+    if role not in ROLES:
+        raise ValueError(f"Unknown thread role: {role}. Expected one of {ROLES}")
+    cores = pin_current_thread(role, plan)
+    policy = raise_thread_priority(role, plan)
+    if cores is not None or policy is not None:
+        logger.info(f"{threading.current_thread().name}: {role} thread on cores {cores}, priority {policy}")
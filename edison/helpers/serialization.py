@@ -0,0 +1,21 @@
+import math
+
+
+def to_json(value):
+    """`default` hook for json.dumps: numpy scalars and arrays in detection results and telemetry"""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def json_safe(value):
+    """Copy of `value` with numpy values converted and infinite or NaN floats replaced by None (null)"""
+    if isinstance(value, dict):
+        return {key: json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [json_safe(item) for item in value]
+    if hasattr(value, 'tolist'):
+        return json_safe(value.tolist())
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
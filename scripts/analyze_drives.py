@@ -0,0 +1,29 @@
+"""
+Re-run the perception stack over a directory of recorded drives.
+
+    python -m scripts.analyze_drives recordings/ results/ --workers 3
+
+Each clip is written as columnar .npz chunks under the output directory. Interrupted runs
+resume where they stopped; finished clips are skipped.
+"""
+import argparse
+import logging
+
+from edison.components.vision_processor.batch_analysis import analyze_directory
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('input_dir')
+    parser.add_argument('output_dir')
+    parser.add_argument('--workers', type=int, help="Worker processes (default: half the cores)")
+    parser.add_argument('--chunk-frames', type=int, default=500)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s", datefmt="%H:%M:%S")
+    processed = analyze_directory(args.input_dir, args.output_dir, args.workers, args.chunk_frames)
+    print(f"Analyzed {len(processed)} clips, {sum(processed.values())} frames")
+
+
+if __name__ == "__main__":
+    main()
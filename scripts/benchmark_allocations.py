@@ -0,0 +1,95 @@
+"""
+Count steady-state allocations per frame of VisionProcessor.process_frame on a recorded clip.
+
+    python -m scripts.benchmark_allocations drive1.mp4 --frames 300
+    python -m scripts.benchmark_allocations drive1.mp4 --compare
+
+Per frame, after the warmup frames, it reports:
+
+    pool allocations   arrays the BufferPool had to create (0 once every buffer exists)
+    transient MB       peak Python/NumPy memory above the frame's starting usage (tracemalloc)
+    net blocks         change in live Python memory blocks
+    gc collections     garbage collector runs, all generations
+
+With --compare the clip is processed with the pool enabled and disabled.
+"""
+import argparse
+import gc
+import sys
+import tracemalloc
+
+import numpy as np
+
+from edison.components.vision_processor.vision_processor import VisionProcessor
+
+
+def gc_collections():
+    return sum(generation['collections'] for generation in gc.get_stats())
+
+
+def measure(path, frames, warmup_frames, pooled):
+    # Pooled and unpooled runs must do the same work: synchronous depth, no governor
+    processor = VisionProcessor(camera_index=path, asynchronous_depth=False)
+    processor.governor = None
+    processor.buffers.enabled = pooled
+    samples = {'pool_allocations': [], 'transient_mb': [], 'net_blocks': [], 'gc_collections': []}
+
+    tracemalloc.start()
+    frame = None
+    frame_index = 0
+    while processor.cap.isOpened() and len(samples['net_blocks']) < frames:
+        ret, frame = processor.cap.read(frame)
+        if not ret:
+            break
+
+        allocations = processor.buffers.allocations
+        collections = gc_collections()
+        blocks = sys.getallocatedblocks()
+        tracemalloc.reset_peak()
+        start_usage, _ = tracemalloc.get_traced_memory()
+
+        processor.process_frame(frame)
+
+        _, peak = tracemalloc.get_traced_memory()
+        frame_index += 1
+        if frame_index <= warmup_frames:
+            continue
+        samples['pool_allocations'].append(processor.buffers.allocations - allocations)
+        samples['transient_mb'].append((peak - start_usage) / 2 ** 20)
+        samples['net_blocks'].append(sys.getallocatedblocks() - blocks)
+        samples['gc_collections'].append(gc_collections() - collections)
+
+    tracemalloc.stop()
+    pool_stats = processor.buffers.stats()
+    processor.release()
+    summary = {name: float(np.mean(values)) if values else 0.0 for name, values in samples.items()}
+    summary['frames'] = len(samples['net_blocks'])
+    summary['pooled_mb'] = pool_stats['pooled_bytes'] / 2 ** 20
+    return summary
+
+
+def report(label, summary):
+    print(f"{label}: {summary['frames']} frames, per frame: "
+          f"pool allocations {summary['pool_allocations']:.2f}, "
+          f"transient {summary['transient_mb']:.2f} MB, "
+          f"net blocks {summary['net_blocks']:+.1f}, "
+          f"gc collections {summary['gc_collections']:.2f} "
+          f"(pool holds {summary['pooled_mb']:.1f} MB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('clip')
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--warmup-frames', type=int, default=10)
+    parser.add_argument('--no-pool', action='store_true', help="Allocate fresh buffers every frame")
+    parser.add_argument('--compare', action='store_true', help="Run with and without the pool")
+    args = parser.parse_args()
+
+    runs = [True, False] if args.compare else [not args.no_pool]
+    for pooled in runs:
+        report("pooled" if pooled else "unpooled", measure(args.clip, args.frames, args.warmup_frames, pooled))
+
+
+if __name__ == "__main__":
+    main()
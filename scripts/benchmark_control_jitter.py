@@ -0,0 +1,132 @@
+"""
+Measure control-loop period jitter while inference runs, with and without RESOURCE_PLAN.
+
+    python -m scripts.benchmark_control_jitter --compare
+    python -m scripts.benchmark_control_jitter --compare --clip drive1.mp4 --seconds 30
+
+A control thread ticks at --rate Hz against absolute deadlines while a load thread runs
+either the full VisionProcessor on --clip or, without a clip, a synthetic torch + OpenCV
+load. Reports the mean/std of the measured period and p99/max lateness.
+
+Thread pool sizes can only be set once per process, so --compare runs each mode in its
+own subprocess.
+"""
+import argparse
+import json
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+
+import config
+from edison.helpers.resource_plan import apply_library_threads, configure_thread
+
+
+def synthetic_load(stop):
+    import cv2
+    import torch
+
+    configure_thread('inference')
+    a = torch.randn(512, 512)
+    image = np.random.randint(0, 255, (720, 1280, 3), dtype=np.uint8)
+    while not stop.is_set():
+        torch.mm(a, a)
+        cv2.GaussianBlur(image, (9, 9), 0)
+
+
+def vision_load(stop, clip):
+    from edison.components.vision_processor.vision_processor import VisionProcessor
+
+    configure_thread('inference')
+    # A steady load: depth on this thread and a fixed quality level
+    processor = VisionProcessor(camera_index=clip, asynchronous_depth=False)
+    processor.governor = None
+    frame = None
+    while not stop.is_set():
+        ret, frame = processor.cap.read(frame)
+        if not ret:
+            processor.open_source(clip)
+            continue
+        processor.process_frame(frame)
+    processor.release()
+
+
+def control_loop(stop, rate, ticks):
+    configure_thread('control')
+    period = 1.0 / rate
+    deadline = time.perf_counter() + period
+    while not stop.is_set():
+        delay = deadline - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        ticks.append(time.perf_counter())
+        deadline += period
+
+
+def run(use_plan, seconds, rate, clip):
+    if not use_plan:
+        config.RESOURCE_PLAN['enabled'] = False
+    apply_library_threads()
+
+    stop = threading.Event()
+    ticks = []
+    load = threading.Thread(target=vision_load if clip else synthetic_load,
+                            args=(stop, clip) if clip else (stop,), daemon=True)
+    control = threading.Thread(target=control_loop, args=(stop, rate, ticks), daemon=True)
+    load.start()
+    time.sleep(1.0)  # let the load reach steady state
+    control.start()
+    time.sleep(seconds)
+    stop.set()
+    control.join()
+    load.join(timeout=5)
+
+    periods_ms = np.diff(ticks) * 1000
+    lateness_ms = periods_ms - 1000.0 / rate
+    return {
+        'plan': use_plan,
+        'ticks': len(ticks),
+        'period_mean_ms': float(periods_ms.mean()),
+        'period_std_ms': float(periods_ms.std()),
+        'lateness_p99_ms': float(np.percentile(lateness_ms, 99)),
+        'lateness_max_ms': float(lateness_ms.max()),
+    }
+
+
+def report(result):
+    print(f"{'with plan' if result['plan'] else 'no plan':>10}: {result['ticks']} ticks, "
+          f"period {result['period_mean_ms']:.2f} ± {result['period_std_ms']:.2f} ms, "
+          f"lateness p99 {result['lateness_p99_ms']:.2f} ms, max {result['lateness_max_ms']:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clip', help="Run the vision stack on this clip as the load")
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--rate', type=float, default=50.0, help="Control loop rate in Hz")
+    parser.add_argument('--no-plan', action='store_true', help="Leave thread pools and affinity at their defaults")
+    parser.add_argument('--compare', action='store_true', help="Run with and without the plan")
+    parser.add_argument('--json', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if not args.compare:
+        result = run(not args.no_plan, args.seconds, args.rate, args.clip)
+        if args.json:
+            print(json.dumps(result))
+        else:
+            report(result)
+        return
+
+    for extra in (['--no-plan'], []):
+        command = [sys.executable, '-m', 'scripts.benchmark_control_jitter', '--json',
+                   '--seconds', str(args.seconds), '--rate', str(args.rate), *extra]
+        if args.clip:
+            command += ['--clip', args.clip]
+        output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+        report(json.loads(output.strip().splitlines()[-1]))
+
+
+if __name__ == "__main__":
+    main()
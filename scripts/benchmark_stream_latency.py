@@ -0,0 +1,128 @@
+"""
+Measure glass-to-browser latency of the /video_feed MJPEG stream.
+
+    python -m scripts.benchmark_stream_latency --compare
+    python -m scripts.benchmark_stream_latency --fps 30 --seconds 20
+
+Synthetic frames are published to a StreamManager at --fps and read back by an HTTP
+client like a browser would. Each multipart chunk carries the time its frame was
+published (X-Timestamp), so the latency covers encoding, delivery to the client
+generator and the socket. --compare also runs a replica of the old delivery loop that
+polled for new frames every 50 ms.
+"""
+import argparse
+import http.client
+import threading
+import time
+
+import numpy as np
+
+from edison.components.streaming_server.streamer import StreamManager
+from edison.components.vision_processor.profiling import summarize
+
+
+class PollingStreamManager(StreamManager):
+    """StreamManager with the previous sleep-poll delivery loop, as the baseline"""
+
+    def _generate_frames(self, client, variant):
+        last_seq = 0
+        while self._running:
+            encoded = variant.broadcasters[0].latest()
+            if encoded is not None and encoded.seq > last_seq:
+                last_seq = encoded.seq
+                yield encoded.data
+            time.sleep(0.05)
+
+
+def publish_frames(streamer, stop, fps, width, height):
+    base = np.random.randint(0, 255, (height, width, 3), dtype=np.uint8)
+    period = 1.0 / fps
+    deadline = time.perf_counter()
+    shift = 0
+    while not stop.is_set():
+        shift = (shift + 8) % width
+        # A new array every time: published frames must not be modified afterwards
+        streamer.update_frame(np.roll(base, shift, axis=1), time.time())
+        deadline += period
+        delay = deadline - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def read_parts(response):
+    """Yield (receive time, publish time) for every multipart chunk of an MJPEG response"""
+    while True:
+        line = response.readline()
+        if not line:
+            return
+        if not line.startswith(b'--frame'):
+            continue
+        headers = {}
+        while True:
+            line = response.readline().strip()
+            if not line:
+                break
+            name, _, value = line.partition(b':')
+            headers[name.strip().lower()] = value.strip()
+        response.read(int(headers[b'content-length']))
+        yield time.time(), float(headers[b'x-timestamp'])
+
+
+def run(manager_class, port, fps, seconds, width, height):
+    streamer = manager_class()
+    streamer.start_stream(port=port, use_internal_capture=False)
+    stop = threading.Event()
+    publisher = threading.Thread(target=publish_frames, args=(streamer, stop, fps, width, height), daemon=True)
+    publisher.start()
+
+    deadline = time.monotonic() + 10
+    while True:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            connection.request('GET', '/video_feed')
+            response = connection.getresponse()
+            break
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.2)
+
+    latencies = []
+    end = time.monotonic() + seconds
+    for received, published in read_parts(response):
+        latencies.append((received - published) * 1000)
+        if time.monotonic() > end:
+            break
+    connection.close()
+    stop.set()
+    streamer.stop()
+
+    result = summarize(latencies[int(fps):])  # skip the first second while things warm up
+    result['fps'] = len(latencies) / seconds
+    return result
+
+
+def report(label, result):
+    print(f"{label:>8}: {result['fps']:.1f} FPS delivered, latency mean {result['mean_ms']:.1f} ms, "
+          f"p50 {result['p50_ms']:.1f}, p95 {result['p95_ms']:.1f}, max {result['max_ms']:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--fps', type=float, default=30.0, help="Rate frames are published at")
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--width', type=int, default=640)
+    parser.add_argument('--height', type=int, default=360)
+    parser.add_argument('--port', type=int, default=5055)
+    parser.add_argument('--compare', action='store_true', help="Also measure the old 50 ms polling loop")
+    args = parser.parse_args()
+
+    runs = [('event', StreamManager)]
+    if args.compare:
+        runs.insert(0, ('polling', PollingStreamManager))
+    for label, manager_class in runs:
+        report(label, run(manager_class, args.port, args.fps, args.seconds, args.width, args.height))
+
+
+if __name__ == "__main__":
+    main()
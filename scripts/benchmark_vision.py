@@ -0,0 +1,139 @@
+"""
+Benchmark VisionProcessor.process_frame on recorded clips.
+
+    python -m scripts.benchmark_vision drive1.mp4 drive2.mp4 --output bench/vision.json
+    python -m scripts.benchmark_vision drive1.mp4 --baseline bench/vision.json
+
+Reports per-stage timings, end-to-end p50/p95/p99 latency, throughput and peak RSS.
+With --baseline, exits with status 1 if p95 latency or throughput regressed by more than
+--tolerance compared to the saved results.
+"""
+import argparse
+import json
+import platform
+import resource
+import sys
+import time
+from collections import defaultdict
+
+import cv2
+import torch
+
+import config
+from edison.components.vision_processor.profiling import summarize
+from edison.components.vision_processor.vision_processor import VisionProcessor
+
+
+def peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def benchmark_clip(path, max_frames=None, warmup_frames=5, overlay=False):
+    # Measure every stage on this thread at a fixed quality level, like batch_analysis workers
+    processor = VisionProcessor(camera_index=path, asynchronous_depth=False)
+    processor.governor = None
+    # Overlays are only drawn for viewers; --overlay measures as if the debug window were open
+    processor.display_active = overlay
+    stages = defaultdict(list)
+    totals = []
+
+    frame_index = 0
+    start = None
+    frame = None
+    while processor.cap.isOpened():
+        ret, frame = processor.cap.read(frame)
+        if not ret:
+            break
+        frame_start = time.perf_counter()
+        processor.process_frame(frame)
+        elapsed = (time.perf_counter() - frame_start) * 1000
+
+        frame_index += 1
+        if frame_index <= warmup_frames:
+            continue
+        if start is None:
+            start = frame_start
+        totals.append(elapsed)
+        for stage, ms in processor.stage_timer.last.items():
+            stages[stage].append(ms)
+        if max_frames and len(totals) >= max_frames:
+            break
+
+    wall = time.perf_counter() - start if start is not None else 0.0
+    result = {
+        'resolution': [processor.frame_width, processor.frame_height],
+        'frames': len(totals),
+        'throughput_fps': len(totals) / wall if wall else 0.0,
+        'latency': summarize(totals),
+        'stages': {stage: summarize(samples) for stage, samples in stages.items()},
+    }
+    processor.release()
+    return result
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'torch': torch.__version__,
+        'torch_threads': torch.get_num_threads(),
+        'opencv': cv2.__version__,
+        'opencv_threads': cv2.getNumThreads(),
+        'model_config': config.MODEL_CONFIG,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Return human-readable regressions between two result files."""
+    regressions = []
+    for clip, current in results['clips'].items():
+        previous = baseline.get('clips', {}).get(clip)
+        if previous is None or not current['frames']:
+            continue
+        if current['latency']['p95_ms'] > previous['latency']['p95_ms'] * (1 + tolerance):
+            regressions.append(f"{clip}: p95 latency {previous['latency']['p95_ms']:.1f} -> "
+                               f"{current['latency']['p95_ms']:.1f} ms")
+        if current['throughput_fps'] < previous['throughput_fps'] * (1 - tolerance):
+            regressions.append(f"{clip}: throughput {previous['throughput_fps']:.1f} -> "
+                               f"{current['throughput_fps']:.1f} FPS")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('clips', nargs='+')
+    parser.add_argument('--max-frames', type=int)
+    parser.add_argument('--output', help="Write results JSON here (use as the next baseline)")
+    parser.add_argument('--baseline', help="Compare against a previous results JSON")
+    parser.add_argument('--tolerance', type=float, default=0.10)
+    parser.add_argument('--overlay', action='store_true', help="Include overlay rendering at camera resolution")
+    args = parser.parse_args()
+
+    results = {'environment': environment(), 'clips': {}}
+    for clip in args.clips:
+        results['clips'][clip] = benchmark_clip(clip, args.max_frames, overlay=args.overlay)
+        current = results['clips'][clip]
+        print(f"{clip}: {current['frames']} frames, {current['throughput_fps']:.1f} FPS, "
+              f"p50/p95/p99 {current['latency'].get('p50_ms', 0):.1f}/"
+              f"{current['latency'].get('p95_ms', 0):.1f}/{current['latency'].get('p99_ms', 0):.1f} ms")
+        for stage, summary in current['stages'].items():
+            print(f"    {stage:<14} mean {summary['mean_ms']:7.2f} ms  p95 {summary['p95_ms']:7.2f} ms")
+    results['peak_rss_mb'] = peak_rss_mb()
+    print(f"Peak RSS: {results['peak_rss_mb']:.1f} MB")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
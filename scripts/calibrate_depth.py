@@ -0,0 +1,116 @@
+"""
+Fit the MiDaS relative-depth to meters calibration table from recorded frames.
+
+The annotation CSV lists objects whose distance was measured while recording:
+
+    clip,frame,x1,y1,x2,y2,distance_m
+    drive1.mp4,120,512,300,640,520,4.5
+
+Boxes are in full-frame pixel coordinates of the recorded (distorted) video. MiDaS
+output is relative to the image it sees, so every frame goes through a VisionProcessor
+exactly like at runtime: the ROI band is undistorted and scaled to the full-quality
+governor level, YOLO runs on it, and depth comes from its DepthScheduler cropped to the
+union of the detections and the annotated boxes. The annotated boxes are undistorted and
+scaled the same way before they are looked up. Frames the governor would process at a
+lower scale are not represented. Run:
+
+    python -m scripts.calibrate_depth annotations.csv
+"""
+import argparse
+import csv
+from collections import defaultdict
+
+import cv2
+import numpy as np
+
+import config
+from edison.components.vision_processor.depth_calibration import DistanceCalibration, box_features
+from edison.components.vision_processor.vision_processor import VisionProcessor
+
+
+def read_annotations(path):
+    """Group annotated boxes by clip and frame index."""
+    grouped = defaultdict(lambda: defaultdict(list))
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f):
+            box = tuple(float(row[k]) for k in ('x1', 'y1', 'x2', 'y2'))
+            grouped[row['clip']][int(row['frame'])].append((box, float(row['distance_m'])))
+    return grouped
+
+
+def roi_and_boxes(processor, frame, boxes):
+    """
+    The ROI the processor runs its models on, and the full-frame boxes mapped into it.
+
+    Returns:
+        (undistorted and scaled ROI, (N, 4) boxes in ROI coordinates)
+    """
+    height, width = frame.shape[:2]
+    top, bottom = processor._roi_rows(height)
+    roi = processor.undistorter.undistort_rows(frame, top, bottom)
+
+    # Undistort all four corners and keep their bounding box
+    corners = boxes[:, [0, 1, 2, 1, 0, 3, 2, 3]].reshape(-1, 2)
+    corners = processor.undistorter.undistort_points(corners, (width, height)).reshape(-1, 4, 2)
+    boxes = np.concatenate([corners.min(axis=1), corners.max(axis=1)], axis=1)
+    boxes[:, [1, 3]] -= top
+
+    scale = processor.processing_scale
+    if scale != 1.0:
+        size = (int(round(roi.shape[1] * scale)), int(round(roi.shape[0] * scale)))
+        roi = cv2.resize(roi, size, interpolation=cv2.INTER_AREA)
+        boxes = boxes * scale
+    return roi, boxes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('annotations')
+    parser.add_argument('--output', default=config.DEPTH_CONFIG['calibration_path'])
+    parser.add_argument('--bins', type=int, default=6)
+    args = parser.parse_args()
+
+    processor = VisionProcessor(camera_index=None, asynchronous_depth=False)
+    # Stay at the full-quality level the governor starts at
+    processor.governor = None
+
+    samples = defaultdict(list)
+    for clip, frames in read_annotations(args.annotations).items():
+        cap = cv2.VideoCapture(clip)
+        for frame_index in sorted(frames):
+            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
+            ret, frame = cap.read()
+            if not ret:
+                print(f"Skipping {clip}:{frame_index}, frame could not be read")
+                continue
+
+            annotated = np.array([box for box, _ in frames[frame_index]], dtype=np.float32)
+            roi, boxes = roi_and_boxes(processor, frame, annotated)
+            # A fresh scheduler refreshes on the first frame it sees
+            processor.reset_state()
+            detections = processor._detect_obstacles(roi)
+            obstacles = [{'bbox': tuple(box)} for box in boxes] + detections
+            inverse_depth = processor.depth_scheduler.update(roi, obstacles)[:len(boxes)]
+
+            bottom_rows, box_heights = box_features(boxes, roi.shape[0])
+            samples['inverse_depth'].extend(inverse_depth)
+            samples['bottom_rows'].extend(bottom_rows)
+            samples['box_heights'].extend(box_heights)
+            samples['distances'].extend(distance for _, distance in frames[frame_index])
+        cap.release()
+
+    calibration = DistanceCalibration.fit(
+        np.array(samples['inverse_depth']), np.array(samples['bottom_rows']),
+        np.array(samples['box_heights']), np.array(samples['distances']), n_bins=args.bins
+    )
+    predicted = calibration.to_meters(np.array(samples['inverse_depth']), np.array(samples['bottom_rows']),
+                                      np.array(samples['box_heights']))
+    errors = np.abs(predicted - np.array(samples['distances'])) / np.array(samples['distances'])
+    print(f"{len(errors)} samples, median relative error {np.median(errors):.1%}, p90 {np.percentile(errors, 90):.1%}")
+
+    calibration.save(args.output)
+    print(f"Saved calibration to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
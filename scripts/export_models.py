@@ -0,0 +1,82 @@
+"""
+Export the vision models to local TorchScript artifacts and compare startup cost.
+
+Run once on a machine with network access, then copy the model directory to the car:
+
+    python -m scripts.export_models            # export only
+    python -m scripts.export_models --compare  # also time torch.hub vs local artifacts
+
+int8 variants are exported next to the fp32 artifacts:
+
+    python -m scripts.export_models --precision int8_static --calibration-clips drive1.mp4 drive2.mp4
+"""
+import argparse
+import time
+import torch
+
+import config
+from edison.components.vision_processor.model_registry import ModelRegistry, default_specs
+from edison.components.vision_processor.quantization import PRECISIONS
+
+
+def time_hub_load(spec):
+    """Cold-start and first-inference time of the old torch.hub path."""
+    kwargs = {k: v for k, v in spec.hub_kwargs.items() if k != 'autoshape'}
+    start = time.perf_counter()
+    model = torch.hub.load(spec.hub_repo, spec.hub_name, **kwargs).eval()
+    load_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with torch.inference_mode():
+        model(torch.zeros(spec.input_shape))
+    return load_time, time.perf_counter() - start
+
+
+def time_registry_load(registry, name):
+    """Cold-start (load + warm-up) and first post-warm-up inference of the local artifact."""
+    start = time.perf_counter()
+    module = registry.load(name)
+    load_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with torch.inference_mode():
+        module(torch.zeros(registry.specs[name].input_shape))
+    return load_time, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model-dir', default=config.MODEL_CONFIG['model_dir'])
+    parser.add_argument('--force', action='store_true', help="Re-export even if artifacts exist")
+    parser.add_argument('--compare', action='store_true', help="Report cold-start and first-frame latency")
+    parser.add_argument('--precision', default='fp32', choices=PRECISIONS)
+    parser.add_argument('--calibration-clips', nargs='*', default=[],
+                        help="Recorded videos used to calibrate int8_static")
+    parser.add_argument('--calibration-frames', type=int, default=200)
+    args = parser.parse_args()
+
+    specs = default_specs(config.MODEL_CONFIG['yolo_input_size'], config.MODEL_CONFIG['depth_input_size'])
+    registry = ModelRegistry(args.model_dir, specs=specs,
+                             mmap_weights=config.MODEL_CONFIG['mmap_weights'],
+                             warmup_runs=config.MODEL_CONFIG['warmup_runs'],
+                             quantized_engine=config.MODEL_CONFIG['quantized_engine'])
+
+    for name in specs:
+        path = registry.export(name, force=args.force, precision=args.precision,
+                               calibration_clips=args.calibration_clips,
+                               calibration_frames=args.calibration_frames)
+        print(f"{name}: {path}")
+
+    if not args.compare:
+        return
+
+    print(f"\n{'model':<12} {'path':<10} {'cold start ms':>14} {'first frame ms':>15}")
+    for name, spec in specs.items():
+        hub_load, hub_first = time_hub_load(spec)
+        local_load, local_first = time_registry_load(registry, name)
+        print(f"{name:<12} {'hub':<10} {hub_load * 1000:>14.1f} {hub_first * 1000:>15.1f}")
+        print(f"{name:<12} {'local':<10} {local_load * 1000:>14.1f} {local_first * 1000:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
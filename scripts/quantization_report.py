@@ -0,0 +1,111 @@
+"""
+Compare int8 model artifacts against fp32 on the same recorded clips.
+
+    python -m scripts.quantization_report --precision int8_static drive1.mp4 drive2.mp4
+
+For detections, every int8 box is matched to an fp32 box of the same class (IoU >= 0.5).
+For depth, the median-aligned mean absolute relative error against fp32 is reported.
+Latency is the per-frame forward time of each model.
+"""
+import argparse
+import json
+import time
+import numpy as np
+import torch
+
+import config
+from edison.components.vision_processor.detection import OBSTACLE_LABELS, decode_yolo_output, letterbox, to_yolo_input
+from edison.components.vision_processor.model_registry import ModelRegistry, default_specs
+from edison.components.vision_processor.quantization import (
+    PRECISIONS, depth_error, detection_agreement, iter_clip_rois, model_input
+)
+
+
+def timed(module, tensor):
+    start = time.perf_counter()
+    with torch.inference_mode():
+        out = module(tensor)
+    return out, time.perf_counter() - start
+
+
+def detect(module, roi, input_size):
+    image, scale, pad = letterbox(roi, input_size)
+    pred, elapsed = timed(module, torch.from_numpy(to_yolo_input(image)))
+    if isinstance(pred, (tuple, list)):
+        pred = pred[0]
+    obstacles = decode_yolo_output(pred[0].numpy(), scale, pad, roi.shape,
+                                   conf_thresh=config.YOLO_CONF_THRESH, classes=OBSTACLE_LABELS)
+    return obstacles, elapsed
+
+
+def latency_summary(samples):
+    samples_ms = np.array(samples) * 1000
+    return {'mean_ms': float(samples_ms.mean()), 'p95_ms': float(np.percentile(samples_ms, 95))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('clips', nargs='+')
+    parser.add_argument('--precision', default='int8_static', choices=[p for p in PRECISIONS if p != 'fp32'])
+    parser.add_argument('--model-dir', default=config.MODEL_CONFIG['model_dir'])
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--stride', type=int, default=5)
+    parser.add_argument('--output', help="Write the report as JSON to this path")
+    args = parser.parse_args()
+
+    model_config = config.MODEL_CONFIG
+    specs = default_specs(model_config['yolo_input_size'], model_config['depth_input_size'])
+    registry = ModelRegistry(args.model_dir, specs=specs, quantized_engine=model_config['quantized_engine'])
+    models = {
+        (name, precision): registry.load(name, precision=precision)
+        for name in specs for precision in ('fp32', args.precision)
+    }
+
+    latencies = {key: [] for key in models}
+    matched = reference_count = candidate_count = 0
+    depth_errors = []
+
+    for roi in iter_clip_rois(args.clips, (0.4, 0.8), args.frames, args.stride):
+        ref_obstacles, elapsed = detect(models['yolov5n', 'fp32'], roi, model_config['yolo_input_size'])
+        latencies['yolov5n', 'fp32'].append(elapsed)
+        q_obstacles, elapsed = detect(models['yolov5n', args.precision], roi, model_config['yolo_input_size'])
+        latencies['yolov5n', args.precision].append(elapsed)
+
+        m, r, c = detection_agreement(ref_obstacles, q_obstacles)
+        matched, reference_count, candidate_count = matched + m, reference_count + r, candidate_count + c
+
+        depth_input = model_input('midas_small', roi, specs['midas_small'].input_shape)
+        ref_depth, elapsed = timed(models['midas_small', 'fp32'], depth_input)
+        latencies['midas_small', 'fp32'].append(elapsed)
+        q_depth, elapsed = timed(models['midas_small', args.precision], depth_input)
+        latencies['midas_small', args.precision].append(elapsed)
+        depth_errors.append(depth_error(ref_depth.numpy(), q_depth.numpy()))
+
+    if not depth_errors:
+        raise SystemExit("No frames could be read from the given clips")
+
+    report = {
+        'precision': args.precision,
+        'frames': len(depth_errors),
+        'detection': {
+            'recall_vs_fp32': matched / reference_count if reference_count else 1.0,
+            'precision_vs_fp32': matched / candidate_count if candidate_count else 1.0,
+            'fp32_detections': reference_count,
+            'quantized_detections': candidate_count,
+        },
+        'depth': {
+            'abs_rel_error_mean': float(np.mean(depth_errors)),
+            'abs_rel_error_p95': float(np.percentile(depth_errors, 95)),
+        },
+        'latency': {f"{name}/{precision}": latency_summary(samples)
+                    for (name, precision), samples in latencies.items()},
+    }
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
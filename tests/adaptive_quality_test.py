@@ -0,0 +1,30 @@
+import unittest
+
+from edison.components.streaming_server.adaptive_quality import AdaptiveQuality
+
+
+class TestAdaptiveQuality(unittest.TestCase):
+    """Test suite for per-client stream quality adaptation."""
+
+    def test_slow_client_steps_down_to_the_lowest_level(self):
+        adaptive = AdaptiveQuality(levels=3)
+        for _ in range(5):
+            level = adaptive.update(send_seconds=0.09, cycle_seconds=0.1)
+        self.assertEqual(level, 2)
+
+    def test_fast_client_recovers_only_after_patience(self):
+        adaptive = AdaptiveQuality(levels=3, patience=10)
+        adaptive.update(send_seconds=0.1, cycle_seconds=0.1)
+        self.assertEqual(adaptive.level, 1)
+
+        levels = [adaptive.update(send_seconds=0.001, cycle_seconds=0.033) for _ in range(10)]
+        self.assertEqual(levels[:9], [1] * 9)
+        self.assertEqual(levels[9], 0)
+
+    def test_single_level_never_changes(self):
+        adaptive = AdaptiveQuality(levels=1)
+        self.assertEqual(adaptive.update(send_seconds=1.0, cycle_seconds=1.0), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from edison.components.vision_processor.batch_analysis import ChunkWriter, clip_id, load_results
+
+
+class TestChunkWriter(unittest.TestCase):
+    """Test suite for the resumable columnar result writer."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.output = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_frames(self, frames, chunk_frames=4):
+        writer = ChunkWriter(self.output, "drive1", chunk_frames)
+        for i in frames:
+            obstacles = [{'bbox': (i, 0, i + 10, 10), 'class_id': 2, 'track_id': 1, 'distance': 5.0}] * (i % 2)
+            writer.add(i, i * 33.3, obstacles, {'center': 0.1, 'confidence': 0.8}, 12.0, {'detection': 8.0})
+        return writer
+
+    def test_flushes_full_chunks_and_resumes(self):
+        self.write_frames(range(10))  # interrupted before the last partial chunk was flushed
+        self.assertEqual(len(ChunkWriter.chunk_paths(self.output, "drive1")), 2)
+        self.assertEqual(ChunkWriter.resume_frame(self.output, "drive1"), 8)
+
+        writer = self.write_frames(range(8, 12))
+        writer.flush()
+        results = load_results(self.output, "drive1")
+        np.testing.assert_array_equal(results['frame_index'], np.arange(12))
+        self.assertEqual(results['obstacle_bbox'].shape, (6, 4))
+        np.testing.assert_array_equal(results['obstacle_frame'], [1, 3, 5, 7, 9, 11])
+        self.assertTrue(np.isnan(results['stage_lanes_ms']).all())
+
+    def test_resume_without_chunks_starts_at_zero(self):
+        self.assertEqual(ChunkWriter.resume_frame(self.output, "missing"), 0)
+
+    def test_clip_id_is_unique_per_relative_path(self):
+        root = Path("/data/drives")
+        self.assertRegex(clip_id(root / "day1" / "front.mp4", root), r"^day1_front-[0-9a-f]{8}$")
+        self.assertEqual(clip_id(root / "day1" / "front.mp4", root), clip_id(root / "day1" / "front.mp4", root))
+        # Paths that flatten to the same readable name
+        for a, b in [("day1/front.mp4", "day2/front.mp4"), ("a_b/c.mp4", "a/b_c.mp4"), ("c.mp4", "c.avi")]:
+            self.assertNotEqual(clip_id(root / a, root), clip_id(root / b, root))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import json
+import time
+import shutil
+import tempfile
+import unittest
+
+from edison.helpers.blackbox import BlackBoxRecorder
+
+
+class TestBlackBoxRecorder(unittest.TestCase):
+    """Test suite for the black-box ring recorder."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.recorder = self.make_recorder()
+
+    def tearDown(self):
+        self.recorder.stop()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def make_recorder(self, ring_bytes=4096, disk_budget_bytes=1 << 20):
+        return BlackBoxRecorder(ring_bytes=ring_bytes, window_seconds=10.0,
+                                output_dir=os.path.join(self.directory, "incidents"),
+                                disk_budget_bytes=disk_budget_bytes,
+                                path=os.path.join(self.directory, "blackbox.ring"))
+
+    def read_incident(self, path):
+        with open(os.path.join(path, "index.jsonl")) as index:
+            lines = [json.loads(line) for line in index]
+        with open(os.path.join(path, "frames.mjpeg"), 'rb') as frames:
+            return lines, frames.read()
+
+    def test_ring_keeps_only_the_newest_records(self):
+        for i in range(100):
+            self.recorder.record_jpeg(bytes([i]) * 200, timestamp=1000.0 + i * 0.01)
+
+        stats = self.recorder.stats()
+        self.assertEqual(stats['ring_used_bytes'], 4096)
+        self.assertLess(stats['records'], 20)
+
+        lines, frames = self.read_incident(self.recorder.flush("test", until=1001.0))
+        self.assertEqual(lines[-1]['seq'], 100)
+        self.assertEqual(frames[-200:], bytes([99]) * 200)
+        self.assertEqual(len(frames), 200 * len(lines))
+
+    def test_incident_covers_the_window_with_telemetry(self):
+        self.recorder.record_jpeg(b'old', timestamp=980.0)
+        self.recorder.record_jpeg(b'jpeg', timestamp=995.0, seq=7)
+        self.recorder.record_telemetry(timestamp=995.5, seq=7, speed=120, direction=90)
+
+        lines, frames = self.read_incident(self.recorder.flush("estop", until=1000.0))
+        self.assertEqual(frames, b'jpeg')
+        self.assertEqual(lines[0], {'seq': 7, 'timestamp': 995.0, 'kind': 'frame', 'offset': 0, 'length': 4})
+        self.assertEqual(lines[1]['data'], {'speed': 120, 'direction': 90})
+
+    def test_trigger_saves_in_the_background_within_the_disk_budget(self):
+        self.recorder.stop()
+        self.recorder = self.make_recorder(ring_bytes=1 << 16, disk_budget_bytes=3000)
+        now = time.time()
+        for i in range(5):
+            self.recorder.record_jpeg(b'x' * 500, timestamp=now - 1 + i * 0.1)
+
+        self.recorder.trigger("first")
+        self.recorder.trigger("second")
+        deadline = time.monotonic() + 5
+        while len(self.recorder.incidents) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        # Both incidents do not fit in the budget, so the first one was deleted
+        remaining = os.listdir(os.path.join(self.directory, "incidents"))
+        self.assertEqual(len(remaining), 1)
+        self.assertTrue(remaining[0].endswith("_second"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+import numpy as np
+
+from edison.helpers.buffer_pool import BufferPool
+
+
+class TestBufferPool(unittest.TestCase):
+    """Test suite for the hot-loop buffer pool."""
+
+    def test_named_buffer_is_reused_until_shape_changes(self):
+        pool = BufferPool()
+        first = pool.get('roi', (4, 6, 3))
+        self.assertIs(pool.get('roi', (4, 6, 3)), first)
+        self.assertIsNot(pool.get('roi', (2, 3, 3)), first)
+        self.assertEqual(pool.allocations, 2)
+
+    def test_released_buffers_are_handed_out_again(self):
+        pool = BufferPool(max_free=1)
+        a, b = pool.acquire((4, 4)), pool.acquire((4, 4))
+        pool.release(a)
+        pool.release(a)
+        pool.release(b)  # free list is full, b is left to the garbage collector
+        self.assertIs(pool.acquire((4, 4)), a)
+        self.assertIsNot(pool.acquire((4, 4)), b)
+        self.assertEqual(pool.allocations, 3)
+
+    def test_disabled_pool_always_allocates(self):
+        pool = BufferPool(enabled=False)
+        self.assertIsNot(pool.get('roi', (2, 2)), pool.get('roi', (2, 2)))
+        buffer = pool.acquire((2, 2), np.float32)
+        pool.release(buffer)
+        self.assertIsNot(pool.acquire((2, 2), np.float32), buffer)
+        self.assertEqual(pool.allocations, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
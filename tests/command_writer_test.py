@@ -0,0 +1,45 @@
+import time
+import unittest
+
+from edison.helpers.command_writer import CommandWriter
+
+
+class TestCommandWriter(unittest.TestCase):
+    """Test suite for the coalescing serial command writer."""
+
+    def setUp(self):
+        self.sent = []
+        self.writer = CommandWriter(send=self.slow_send, build=lambda direction, speed: bytes([direction, speed]),
+                                    interval=0.01)
+
+    def tearDown(self):
+        self.writer.stop()
+
+    def slow_send(self, packet):
+        # Roughly a 5-byte packet at 9600 baud
+        time.sleep(0.005)
+        self.sent.append(packet)
+
+    def test_burst_is_coalesced_to_the_newest_command(self):
+        for speed in range(100, 150):
+            self.writer.submit(90, speed)
+        self.assertTrue(self.writer.flush(timeout=2.0))
+
+        stats = self.writer.stats()
+        self.assertEqual(self.sent[-1], bytes([90, 149]))
+        self.assertLess(len(self.sent), 10)
+        self.assertEqual(stats['sent'] + stats['coalesced'], 50)
+        self.assertGreater(stats['max_latency_ms'], 0)
+
+    def test_failed_send_is_counted_and_the_writer_keeps_going(self):
+        # bytes() rejects 300, like the packet builder does
+        self.writer.submit(300, 0)
+        self.writer.flush(timeout=2.0)
+        self.writer.submit(90, 120)
+        self.writer.flush(timeout=2.0)
+        self.assertEqual(self.writer.errors, 1)
+        self.assertEqual(self.sent, [bytes([90, 120])])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+
+from edison.components.control.Control import EdisonCar
+from edison.helpers.blackbox import BlackBoxRecorder
+from edison.helpers.command_writer import CommandWriter
+from edison.models.Car import Car
+from edison._lib.device_location import DeviceLocationReader
+
+
+def make_car(sent):
+    """EdisonCar without its serial port, adb location reader and webcam."""
+    car = EdisonCar.__new__(EdisonCar)
+    car._lock = threading.Lock()
+    car.car = Car(MIN_SPEED=100, MAX_SPEED=200, ACCELERATION_DELAY=0.01, DECELERATION_DELAY=0.01,
+                  ACCELERATION_INCREMENT=5, DECELERATION_INCREMENT=5, LEFT_ANGLE=120, RIGHT_ANGLE=60,
+                  FRONT_ANGLE=90, car_states={'current_speed': 0, 'current_direction': 90})
+    car.writer = CommandWriter(send=sent.append, build=lambda direction, speed: (direction, speed), interval=0.0)
+    car.device_location = DeviceLocationReader(location_shared_state={'location': (52.5, 13.4)})
+    car.recorder = None
+    car.stream = None
+    car.accelerating = car.decelerating = False
+    return car
+
+
+class TestEdisonCarControl(unittest.TestCase):
+    """Test suite for commanding the car through the serial writer."""
+
+    def setUp(self):
+        self.sent = []
+        self.car = make_car(self.sent)
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self.car.writer.stop()
+        if self.car.recorder is not None:
+            self.car.recorder.stop()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_commands_are_recorded_with_the_location(self):
+        self.car.recorder = BlackBoxRecorder(ring_bytes=1 << 16, window_seconds=60.0,
+                                             output_dir=os.path.join(self.directory, "incidents"),
+                                             disk_budget_bytes=1 << 20)
+        self.car.accelerate()
+        self.car.turn_left()
+        self.car.stop()
+        self.assertTrue(self.car.writer.flush(timeout=2.0))
+        self.assertEqual(self.sent[-1], (120, 0))
+
+        with open(os.path.join(self.car.recorder.flush("test"), "index.jsonl")) as index:
+            records = [json.loads(line)['data'] for line in index]
+        self.assertEqual(records, [
+            {'speed': 100, 'direction': 90, 'location': [52.5, 13.4]},
+            {'speed': 100, 'direction': 120, 'location': [52.5, 13.4]},
+            {'speed': 0, 'direction': 120, 'location': [52.5, 13.4]},
+        ])
+
+    def test_commands_reach_the_writer_in_state_order(self):
+        submitted = []
+        submit = self.car.writer.submit
+
+        def checked_submit(direction, speed):
+            # Still holding the state lock: no other command can slip in between
+            self.assertTrue(self.car._lock.locked())
+            submitted.append(speed)
+            submit(direction, speed)
+
+        self.car.writer.submit = checked_submit
+        self.car.accelerate()
+        self.car.emergency_stop()
+        self.assertEqual(submitted, [100, 0])
+        self.assertTrue(self.car.writer.flush(timeout=2.0))
+        self.assertEqual(self.sent[-1], (90, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+
+from edison.components.vision_processor.depth_calibration import DistanceCalibration, box_features
+
+
+class TestDistanceCalibration(unittest.TestCase):
+    """Test suite for the relative-depth to meters calibration table."""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.rows = rng.uniform(0.2, 1.0, 400)
+        self.heights = rng.uniform(0.05, 0.5, 400)
+        self.distances = rng.uniform(1.0, 20.0, 400)
+        # Relative inverse depth whose affine mapping drifts with the image row
+        scale = 0.02 + 0.01 * self.rows
+        self.inverse_depth = (1.0 / self.distances - 0.01) / scale
+
+    def test_fit_recovers_distances(self):
+        calibration = DistanceCalibration.fit(self.inverse_depth, self.rows, self.heights, self.distances)
+        predicted = calibration.to_meters(self.inverse_depth, self.rows, self.heights)
+        relative_error = np.abs(predicted - self.distances) / self.distances
+        self.assertLess(np.median(relative_error), 0.1)
+
+    def test_outliers_do_not_break_fit(self):
+        distances = self.distances.copy()
+        distances[:20] = 0.3  # mislabelled samples
+        calibration = DistanceCalibration.fit(self.inverse_depth, self.rows, self.heights, distances)
+        predicted = calibration.to_meters(self.inverse_depth[20:], self.rows[20:], self.heights[20:])
+        relative_error = np.abs(predicted - self.distances[20:]) / self.distances[20:]
+        self.assertLess(np.median(relative_error), 0.1)
+
+    def test_unknown_depth_is_infinite(self):
+        calibration = DistanceCalibration(np.array([0.5]), np.array([[0.1, 0.0, 0.0]]))
+        meters = calibration.to_meters(np.array([np.nan, 5.0]), np.array([0.5, 0.5]), np.array([0.1, 0.1]))
+        self.assertTrue(np.isinf(meters[0]))
+        self.assertAlmostEqual(meters[1], 2.0, places=5)
+
+    def test_save_and_load_round_trip(self):
+        calibration = DistanceCalibration.fit(self.inverse_depth, self.rows, self.heights, self.distances)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "calibration.npz")
+            calibration.save(path)
+            loaded = DistanceCalibration.load(path)
+        np.testing.assert_allclose(loaded.coeffs, calibration.coeffs)
+        self.assertIsNone(DistanceCalibration.load(os.path.join(tmp, "missing.npz")))
+
+    def test_box_features(self):
+        bottom_rows, heights = box_features([(0, 50, 10, 100)], roi_height=200)
+        self.assertAlmostEqual(bottom_rows[0], 0.5)
+        self.assertAlmostEqual(heights[0], 0.25)
+
+
+if __name__ == "__main__":
+    unittest.main()
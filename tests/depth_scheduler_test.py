@@ -0,0 +1,106 @@
+import threading
+import unittest
+import numpy as np
+
+from edison.components.vision_processor.depth_scheduler import DepthScheduler, boxes_inverse_depth
+
+
+class CountingEstimator:
+    """Depth model stand-in returning a constant inverse depth map."""
+
+    def __init__(self, value=2.0):
+        self.value = value
+        self.calls = []
+
+    def __call__(self, crop):
+        self.calls.append(crop.shape)
+        return np.full(crop.shape[:2], self.value, dtype=np.float32)
+
+
+def obstacle(x1, y1, x2, y2):
+    return {'bbox': (x1, y1, x2, y2)}
+
+
+class TestDepthScheduler(unittest.TestCase):
+    """Test suite for the rate-decimated depth scheduler."""
+
+    def setUp(self):
+        self.roi = np.zeros((200, 400, 3), dtype=np.uint8)
+        self.estimator = CountingEstimator()
+
+    def test_refreshes_every_interval(self):
+        scheduler = DepthScheduler(self.estimator, interval=3)
+        obstacles = [obstacle(100, 50, 150, 150)]
+        for _ in range(7):
+            values = scheduler.update(self.roi, obstacles)
+            self.assertAlmostEqual(values[0], 2.0)
+        self.assertEqual(len(self.estimator.calls), 3)  # frames 1, 4 and 7
+
+    def test_new_detection_triggers_refresh(self):
+        scheduler = DepthScheduler(self.estimator, interval=10)
+        scheduler.update(self.roi, [obstacle(100, 50, 150, 150)])
+        scheduler.update(self.roi, [obstacle(100, 50, 150, 150), obstacle(300, 20, 350, 120)])
+        self.assertEqual(len(self.estimator.calls), 2)
+
+    def test_crops_to_detected_boxes(self):
+        scheduler = DepthScheduler(self.estimator, crop_to_boxes=True, crop_margin=0.0)
+        scheduler.update(self.roi, [obstacle(100, 50, 150, 150)])
+        self.assertEqual(self.estimator.calls[0], (100, 50, 3))
+
+    def test_matched_box_scales_with_apparent_size(self):
+        scheduler = DepthScheduler(self.estimator, interval=10)
+        scheduler.update(self.roi, [obstacle(100, 50, 150, 150)])
+        # Same object, box grew by 10% -> closer -> larger inverse depth, no new model run
+        values = scheduler.update(self.roi, [obstacle(100, 45, 150, 155)])
+        self.assertEqual(len(self.estimator.calls), 1)
+        self.assertAlmostEqual(values[0], 2.2, places=5)
+
+    def test_no_obstacles_skips_depth(self):
+        scheduler = DepthScheduler(self.estimator)
+        self.assertEqual(len(scheduler.update(self.roi, [])), 0)
+        self.assertEqual(self.estimator.calls, [])
+
+    def test_asynchronous_update_does_not_block(self):
+        scheduler = DepthScheduler(self.estimator, asynchronous=True)
+        values = scheduler.update(self.roi, [obstacle(100, 50, 150, 150)])
+        scheduler.stop()
+        self.assertEqual(len(values), 1)
+
+    def test_asynchronous_keeps_one_refresh_in_flight(self):
+        release = threading.Event()
+
+        def blocking_estimator(crop):
+            release.wait(timeout=5)
+            return self.estimator(crop)
+
+        scheduler = DepthScheduler(blocking_estimator, interval=1, asynchronous=True)
+        for _ in range(5):
+            values = scheduler.update(self.roi, [obstacle(100, 50, 150, 150)])
+            self.assertTrue(np.isnan(values[0]))
+        release.set()
+        scheduler.stop()
+        self.assertEqual(len(self.estimator.calls), 1)
+
+    def test_refresh_requested_before_invalidate_is_discarded(self):
+        scheduler = DepthScheduler(self.estimator)
+        scheduler.update(self.roi, [obstacle(100, 50, 150, 150)])
+        scheduler.invalidate()
+        scheduler._refresh(1, self.roi, np.array([[100, 50, 150, 150]], dtype=np.float32))
+        self.assertIsNone(scheduler.snapshot)
+
+    def test_boxes_inverse_depth_outside_map_is_nan(self):
+        depth = np.ones((10, 10), dtype=np.float32)
+        values = boxes_inverse_depth(depth, np.array([[50, 50, 60, 60], [2, 2, 5, 5]]))
+        self.assertTrue(np.isnan(values[0]))
+        self.assertEqual(values[1], 1.0)
+
+    def test_boxes_inverse_depth_ignores_box_border(self):
+        # Near object in the middle of the box, far background around it
+        depth = np.full((100, 100), 1.0, dtype=np.float32)
+        depth[30:70, 30:70] = 5.0
+        values = boxes_inverse_depth(depth, np.array([[20, 20, 80, 80]]))
+        self.assertEqual(values[0], 5.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
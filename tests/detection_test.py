@@ -0,0 +1,82 @@
+import unittest
+import numpy as np
+
+from edison.components.vision_processor.detection import decode_yolo_output, letterbox
+
+CAR, PERSON, TRAFFIC_LIGHT = 2, 0, 9
+
+
+def prediction(*rows):
+    """yolov5 output rows (cx, cy, w, h, objectness) with one class score set."""
+    pred = np.zeros((len(rows), 85), dtype=np.float32)
+    for i, (cx, cy, w, h, obj, class_id, score) in enumerate(rows):
+        pred[i, :5] = (cx, cy, w, h, obj)
+        pred[i, 5 + class_id] = score
+    return pred
+
+
+class TestLetterbox(unittest.TestCase):
+    """Test suite for letterbox resizing."""
+
+    def test_wide_image_is_padded_top_and_bottom(self):
+        image = np.full((200, 400, 3), 7, dtype=np.uint8)
+        padded, scale, pad = letterbox(image, 320)
+        self.assertEqual(padded.shape, (320, 320, 3))
+        self.assertAlmostEqual(scale, 0.8)
+        self.assertEqual(pad, (0, 80))
+        self.assertTrue((padded[:80] == 114).all())
+        self.assertTrue((padded[80:240] == 7).all())
+        self.assertTrue((padded[240:] == 114).all())
+
+    def test_reused_output_gets_its_borders_refilled(self):
+        out = np.zeros((320, 320, 3), dtype=np.uint8)
+        padded, _, _ = letterbox(np.full((400, 200, 3), 7, dtype=np.uint8), 320, out=out)
+        self.assertIs(padded, out)
+        self.assertTrue((out[:, :80] == 114).all())
+        self.assertTrue((out[:, 80:240] == 7).all())
+
+
+class TestDecodeYoloOutput(unittest.TestCase):
+    """Test suite for turning raw yolov5 rows into obstacles."""
+
+    # A 200x400 ROI letterboxed to 320: scale 0.8, 80 rows of padding on top
+    scale, pad, shape = 0.8, (0, 80), (200, 400, 3)
+
+    def decode(self, pred, conf_thresh=0.25):
+        return decode_yolo_output(pred, self.scale, self.pad, self.shape, conf_thresh=conf_thresh,
+                                  classes=[PERSON, CAR])
+
+    def test_boxes_are_mapped_back_through_padding_and_scale(self):
+        # (100, 50)-(200, 150) in the ROI is (80, 120)-(160, 200) in the letterbox
+        obstacles = self.decode(prediction((120, 160, 80, 80, 0.9, CAR, 0.8)))
+        self.assertEqual(len(obstacles), 1)
+        np.testing.assert_allclose(obstacles[0]['bbox'], (100, 50, 200, 150), atol=1e-4)
+        self.assertEqual(obstacles[0]['label'], 'car')
+        self.assertAlmostEqual(obstacles[0]['confidence'], 0.72, places=5)
+        self.assertAlmostEqual(obstacles[0]['position'], -0.25, places=5)
+
+    def test_boxes_in_the_padding_are_clipped_to_the_image(self):
+        obstacles = self.decode(prediction((40, 90, 80, 40, 0.9, CAR, 0.9)))
+        x1, y1, _, _ = obstacles[0]['bbox']
+        self.assertEqual((x1, y1), (0.0, 0.0))
+
+    def test_low_confidence_and_other_classes_are_dropped(self):
+        pred = prediction((120, 160, 80, 80, 0.9, CAR, 0.2),          # 0.18 < 0.25
+                          (200, 160, 40, 40, 0.9, TRAFFIC_LIGHT, 0.9))  # not an obstacle class
+        self.assertEqual(self.decode(pred), [])
+
+    def test_nms_keeps_the_best_box_per_class(self):
+        pred = prediction((120, 160, 80, 80, 0.9, CAR, 0.6),
+                          (122, 161, 80, 80, 0.9, CAR, 0.9),
+                          (121, 160, 80, 80, 0.9, PERSON, 0.7))
+        obstacles = self.decode(pred)
+        self.assertEqual(sorted(o['class_id'] for o in obstacles), [PERSON, CAR])
+        car = next(o for o in obstacles if o['class_id'] == CAR)
+        self.assertAlmostEqual(car['confidence'], 0.81, places=5)
+
+    def test_empty_output(self):
+        self.assertEqual(self.decode(np.zeros((0, 85), dtype=np.float32)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import numpy as np
+from multiprocessing import get_context
+
+from edison.helpers.frame_ring import SharedFrameRing
+
+
+def _consume(spec, result_queue):
+    ring = SharedFrameRing.attach(spec['name'])
+    view = ring.wait_newer(-1, timeout=5)
+    result_queue.put((view.seq, int(view.array[0, 0, 0]), view.is_valid()))
+    del view
+    ring.close()
+
+
+class TestSharedFrameRing(unittest.TestCase):
+    """Test suite for the shared-memory frame ring."""
+
+    def setUp(self):
+        self.ring = SharedFrameRing.create(slots=3, shape=(4, 6, 3))
+
+    def tearDown(self):
+        self.ring.close()
+        self.ring.unlink()
+
+    def frame(self, value):
+        return np.full((4, 6, 3), value, dtype=np.uint8)
+
+    def test_latest_is_zero_copy_view(self):
+        seq = self.ring.write(self.frame(7), timestamp=1.5, meta=(640, 480))
+        view = self.ring.latest()
+        self.assertEqual(view.seq, seq)
+        self.assertEqual(view.timestamp, 1.5)
+        self.assertEqual(list(view.meta[:2]), [640, 480])
+        self.assertTrue(np.shares_memory(view.array, self.ring._frames[view.slot]))
+        self.assertTrue((view.array == 7).all())
+
+    def test_overwritten_frame_is_detected(self):
+        first = self.ring.write(self.frame(1))
+        view = self.ring.get(first)
+        for value in range(2, 5):
+            self.ring.write(self.frame(value))
+        self.assertFalse(view.is_valid())
+        self.assertIsNone(view.copy())
+        self.assertIsNone(self.ring.get(first))
+
+    def test_in_progress_write_is_detected(self):
+        for value in range(3):
+            self.ring.write(self.frame(value))
+        view = self.ring.get(0)
+        seq, _ = self.ring.begin_write()  # seq 3 reuses the slot of seq 0
+        self.assertEqual(seq, 3)
+        self.assertFalse(view.is_valid())
+        self.assertEqual(self.ring.latest().seq, 2)
+
+    def test_rejects_wrong_shape(self):
+        with self.assertRaises(ValueError):
+            self.ring.write(np.zeros((2, 2, 3), dtype=np.uint8))
+
+    def test_wait_newer_times_out(self):
+        self.assertIsNone(self.ring.wait_newer(-1, timeout=0.01))
+
+    def test_attach_reads_shape_and_dtype_from_the_header(self):
+        with SharedFrameRing.create(slots=2, shape=(3, 5), dtype=np.float32) as ring:
+            ring.write(np.full((3, 5), 0.5, dtype=np.float32))
+            attached = SharedFrameRing.attach(ring.name)
+            self.assertEqual((attached.shape, attached.dtype), ((3, 5), np.dtype(np.float32)))
+            view = attached.latest()
+            self.assertEqual(float(view.array[2, 4]), 0.5)
+            del view
+            attached.close()
+
+    def test_attach_from_another_process(self):
+        self.ring.write(self.frame(42))
+        ctx = get_context("spawn")
+        results = ctx.Queue()
+        process = ctx.Process(target=_consume, args=(self.ring.spec(), results))
+        process.start()
+        seq, value, valid = results.get(timeout=20)
+        process.join(10)
+        self.assertEqual((seq, value, valid), (0, 42, True))
+
+
+if __name__ == "__main__":
+    unittest.main()
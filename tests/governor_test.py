@@ -0,0 +1,84 @@
+import unittest
+
+from edison.components.vision_processor.governor import PerformanceGovernor, QualityLevel
+
+
+class Readings:
+    """Injected CPU and temperature readers the tests can change between windows."""
+
+    def __init__(self, cpu=10.0, temperature=50.0):
+        self.cpu = cpu
+        self.temperature = temperature
+
+
+class TestPerformanceGovernor(unittest.TestCase):
+    """Test suite for the latency/thermal quality governor."""
+
+    def setUp(self):
+        self.levels = [QualityLevel(1.0, 1, 3), QualityLevel(0.75, 2, 4), QualityLevel(0.5, 3, 6)]
+        self.applied = []
+        self.readings = Readings()
+
+    def make_governor(self, **kwargs):
+        return PerformanceGovernor(self.levels, apply=self.applied.append, target_latency_ms=100.0,
+                                   window=5, cooldown=10,
+                                   read_cpu=lambda: self.readings.cpu,
+                                   read_temperature=lambda: self.readings.temperature, **kwargs)
+
+    def run_window(self, governor, latency_ms):
+        for _ in range(governor.window):
+            governor.observe(latency_ms)
+
+    def test_slow_frames_degrade_one_level_per_window(self):
+        governor = self.make_governor()
+        self.run_window(governor, 200.0)
+        self.assertEqual(governor.level, 1)
+        self.run_window(governor, 200.0)
+        self.run_window(governor, 200.0)
+        # Already at the cheapest level
+        self.assertEqual(governor.level, 2)
+        self.assertEqual(self.applied, self.levels)
+
+    def test_upgrade_waits_for_the_cooldown(self):
+        governor = self.make_governor(start_level=2)
+        self.run_window(governor, 20.0)
+        self.assertEqual(governor.level, 2)
+        self.run_window(governor, 20.0)
+        self.assertEqual(governor.level, 1)
+        self.assertEqual(governor.decisions[-1]['action'], 'upgrade')
+
+    def test_load_between_the_marks_holds_the_level(self):
+        governor = self.make_governor(start_level=1)
+        # Below the degrade ratio but above the upgrade ratio, and CPU between its marks
+        self.readings.cpu = 80.0
+        for _ in range(6):
+            self.run_window(governor, 90.0)
+        self.assertEqual(governor.level, 1)
+        self.assertEqual({d['action'] for d in governor.decisions}, {'hold'})
+
+    def test_hot_soc_degrades_despite_fast_frames(self):
+        governor = self.make_governor()
+        self.readings.temperature = 78.0
+        self.run_window(governor, 20.0)
+        self.assertEqual(governor.level, 1)
+        self.assertIn("soc", governor.decisions[-1]['reasons'][0])
+
+        # Cooled below the high mark but not the low one: no upgrade yet
+        self.readings.temperature = 70.0
+        for _ in range(4):
+            self.run_window(governor, 20.0)
+        self.assertEqual(governor.level, 1)
+        self.readings.temperature = 60.0
+        self.run_window(governor, 20.0)
+        self.assertEqual(governor.level, 0)
+
+    def test_missing_temperature_sensor_is_ignored(self):
+        self.readings.temperature = None
+        governor = self.make_governor(start_level=1)
+        for _ in range(2):
+            self.run_window(governor, 20.0)
+        self.assertEqual(governor.level, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
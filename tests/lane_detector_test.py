@@ -0,0 +1,72 @@
+import unittest
+import cv2
+import numpy as np
+
+from edison.components.vision_processor.lane_detector import LaneDetector
+
+
+def lane_image(left_x=(150, 250), right_x=(650, 550), size=(200, 800)):
+    """Two straight lane lines on black; each pair is the x at the bottom and top row."""
+    height, width = size
+    image = np.zeros((height, width, 3), dtype=np.uint8)
+    cv2.line(image, (left_x[0], height - 1), (left_x[1], 0), (255, 255, 255), 6)
+    cv2.line(image, (right_x[0], height - 1), (right_x[1], 0), (255, 255, 255), 6)
+    return image
+
+
+class TestLaneDetector(unittest.TestCase):
+    """Test suite for the band-tracking lane detector."""
+
+    def setUp(self):
+        self.detector = LaneDetector(smoothing=0.0)
+
+    def test_locks_then_tracks_in_the_band(self):
+        image = lane_image()
+        first = self.detector.detect(image)
+        self.assertEqual(first['mode'], 'full')
+        self.assertTrue(self.detector.locked)
+        self.assertAlmostEqual(first['center'], 0.0, delta=0.05)
+
+        second = self.detector.detect(image)
+        self.assertEqual(second['mode'], 'band')
+        self.assertAlmostEqual(second['center'], first['center'], delta=0.02)
+
+    def test_falls_back_to_full_search_when_lanes_leave_the_band(self):
+        self.detector.detect(lane_image())
+        # Both lines moved far outside the +-40 px band
+        shifted = self.detector.detect(lane_image(left_x=(40, 140), right_x=(540, 440)))
+        self.assertEqual(shifted['mode'], 'full')
+        self.assertLess(shifted['center'], -0.2)
+
+    def test_infers_a_missing_side_from_the_lane_width(self):
+        self.detector.lane_width_px = 400.0
+        result = self.detector._update_state(np.array([0.0, 0.0, 200.0]), None, 0.8, 0.0, height=200, width=800)
+        # Right side placed one lane width away, with half the confidence
+        self.assertAlmostEqual(result['right_boundary'], 0.5)
+        self.assertAlmostEqual(result['confidence'], 0.6)
+
+    def test_curvature_sign_follows_the_bend(self):
+        y_eval = 199.0
+        self.assertGreater(self.detector._curvature(np.array([1e-3, 0.0, 400.0]), y_eval), 0)
+        self.assertLess(self.detector._curvature(np.array([-1e-3, 0.0, 400.0]), y_eval), 0)
+        self.assertEqual(self.detector._curvature(np.array([0.0, 0.5, 400.0]), y_eval), 0)
+
+    def test_losing_the_lanes_drops_the_old_fits(self):
+        self.detector.detect(lane_image())
+        self.assertIsNotNone(self.detector.left_fit)
+
+        result = self.detector.detect(np.zeros((200, 800, 3), dtype=np.uint8))
+        self.assertEqual(result['confidence'], 0.0)
+        self.assertFalse(self.detector.locked)
+        self.assertIsNone(self.detector.left_fit)
+        self.assertIsNone(self.detector.right_fit)
+
+    def test_low_confidence_fits_are_not_kept(self):
+        left, right = np.array([0.0, 0.0, 200.0]), np.array([0.0, 0.0, 600.0])
+        self.detector._update_state(left, right, 0.1, 0.1, height=200, width=800)
+        self.assertIsNone(self.detector.left_fit)
+        self.assertFalse(self.detector.locked)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import threading
+import unittest
+import numpy as np
+
+from edison.components.vision_processor.micro_batch import MicroBatcher
+
+
+class TestMicroBatcher(unittest.TestCase):
+    """Test suite for cross-camera micro-batching."""
+
+    def run_concurrently(self, batcher, count):
+        results = [None] * count
+        start = threading.Barrier(count)
+
+        def submit(i):
+            start.wait()
+            results[i] = batcher.infer(np.full((1, 2), i, dtype=np.float32), timeout=5)
+
+        threads = [threading.Thread(target=submit, args=(i,)) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_concurrent_requests_share_one_forward(self):
+        calls = []
+        batcher = MicroBatcher(lambda batch: calls.append(len(batch)) or batch * 10, max_batch=3, max_wait=1.0)
+        results = self.run_concurrently(batcher, 3)
+        batcher.stop()
+
+        self.assertEqual(calls, [3])
+        for i, result in enumerate(results):
+            np.testing.assert_array_equal(result, np.full((1, 2), i * 10))
+
+    def test_falls_back_to_single_items_when_batching_fails(self):
+        def forward(batch):
+            if len(batch) > 1:
+                raise RuntimeError("traced with batch size 1")
+            return batch + 1
+
+        batcher = MicroBatcher(forward, max_batch=2, max_wait=1.0)
+        results = self.run_concurrently(batcher, 2)
+        batcher.stop()
+
+        self.assertFalse(batcher.batching)
+        self.assertEqual(sorted(float(r[0, 0]) for r in results), [1.0, 2.0])
+        self.assertEqual(batcher.stats()['batch_sizes'], {1: 2})
+
+    def test_falls_back_when_the_output_ignores_the_batch_size(self):
+        # Like a graph traced with batch size 1: only the first item comes back, without an error
+        batcher = MicroBatcher(lambda batch: batch[:1] + 1, max_batch=2, max_wait=1.0)
+        results = self.run_concurrently(batcher, 2)
+        batcher.stop()
+
+        self.assertFalse(batcher.batching)
+        self.assertEqual(sorted(float(r[0, 0]) for r in results), [1.0, 2.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import time
+import threading
+import unittest
+import numpy as np
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from edison.components.vision_processor.mjpeg_capture import JPEGFrameParser, MJPEGCapture
+
+
+def fake_jpeg(value, size=300):
+    """SOI + payload + EOI; the payload never contains 0xFF, like entropy-coded JPEG data."""
+    return b'\xff\xd8' + bytes([value % 200]) * size + b'\xff\xd9'
+
+
+def mjpeg_part(jpeg):
+    return (b'--dcmjpeg\r\nContent-Type: image/jpeg\r\n'
+            b'Content-Length: ' + str(len(jpeg)).encode() + b'\r\n\r\n' + jpeg + b'\r\n')
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    """Stand-in for DroidCam: replays a recorded MJPEG stream at a fixed frame rate."""
+    frames = []
+    interval = 0.005
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'multipart/x-mixed-replace; boundary=dcmjpeg')
+        self.end_headers()
+        try:
+            for part in self.frames:
+                self.wfile.write(part)
+                self.wfile.flush()
+                time.sleep(self.interval)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+def decode_first_byte(data):
+    """Decoder stand-in: a 1x1 'image' holding the payload value."""
+    return np.full((1, 1, 3), data[2], dtype=np.uint8)
+
+
+class TestJPEGFrameParser(unittest.TestCase):
+    """Test suite for the incremental MJPEG boundary parser."""
+
+    def test_frames_split_across_tiny_chunks(self):
+        stream = b''.join(mjpeg_part(fake_jpeg(i)) for i in range(5))
+        parser, out = JPEGFrameParser(), bytearray()
+        seen = []
+        for i in range(0, len(stream), 7):
+            if parser.feed(stream[i:i + 7], out):
+                seen.append(out[2])
+        self.assertEqual(seen, [0, 1, 2, 3, 4])
+        self.assertLess(len(parser.buffer), 16)
+
+    def test_only_newest_of_several_frames_is_copied(self):
+        parser, out = JPEGFrameParser(), bytearray()
+        stream = b''.join(mjpeg_part(fake_jpeg(i)) for i in range(3)) + mjpeg_part(fake_jpeg(9))[:40]
+        self.assertEqual(parser.feed(stream, out), 3)
+        self.assertEqual(bytes(out), fake_jpeg(2))
+
+
+class TestMJPEGCapture(unittest.TestCase):
+    """Test suite for MJPEG-over-HTTP capture against a local replay server."""
+
+    def setUp(self):
+        ReplayHandler.frames = [mjpeg_part(fake_jpeg(i)) for i in range(60)]
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), ReplayHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/video"
+
+    def tearDown(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+
+    def test_slow_reader_gets_newest_frames_and_skips_the_rest(self):
+        cap = MJPEGCapture(self.url, timeout=2.0, reconnect_delay=10.0, decode=decode_first_byte)
+        self.assertTrue(cap.isOpened())
+        self.assertEqual((cap.frame_width, cap.frame_height), (1, 1))
+
+        values = []
+        while True:
+            ret, frame = cap.read(timeout=0.5)
+            if not ret:
+                break
+            values.append(int(frame[0, 0, 0]))
+            time.sleep(0.03)  # inference is slower than the stream
+        cap.release()
+
+        self.assertEqual(values, sorted(set(values)))
+        self.assertEqual(values[-1], 59)
+        self.assertGreater(cap.frames_skipped, 0)
+        self.assertEqual(cap.frames_decoded, len(values))
+
+    def test_unreachable_stream_is_not_opened(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.server = None
+        cap = MJPEGCapture(self.url, timeout=0.3, reconnect_delay=0.05, decode=decode_first_byte)
+        self.assertFalse(cap.isOpened())
+        self.assertGreater(cap.reconnects, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
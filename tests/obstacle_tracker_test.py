@@ -0,0 +1,69 @@
+import unittest
+
+from edison.components.vision_processor.tracker import ObstacleTracker
+
+
+def detection(x1, y1, x2, y2, class_id=2, confidence=0.9):
+    return {'bbox': (x1, y1, x2, y2), 'class_id': class_id, 'label': 'car', 'confidence': confidence}
+
+
+class TestObstacleTracker(unittest.TestCase):
+    """Test suite for keyframe detection with tracking in between."""
+
+    def test_track_ids_are_stable(self):
+        tracker = ObstacleTracker()
+        first = tracker.update([detection(100, 100, 200, 200)], now=0.0, frame_width=640)
+        second = tracker.update([detection(105, 100, 205, 200)], now=0.1)
+        self.assertEqual(first[0]['track_id'], second[0]['track_id'])
+
+    def test_different_class_starts_new_track(self):
+        tracker = ObstacleTracker()
+        tracker.update([detection(100, 100, 200, 200, class_id=2)], now=0.0)
+        obstacles = tracker.update([detection(100, 100, 200, 200, class_id=0)], now=0.1)
+        self.assertEqual(sorted(o['track_id'] for o in obstacles), [1, 2])
+
+    def test_prediction_follows_velocity(self):
+        tracker = ObstacleTracker()
+        for i in range(6):
+            tracker.update([detection(100 + 10 * i, 100, 200 + 10 * i, 200)], now=i * 0.1, frame_width=640)
+        predicted = tracker.predict(now=0.6)[0]
+        center_x = (predicted['bbox'][0] + predicted['bbox'][2]) / 2
+        self.assertGreater(center_x, 205)
+        self.assertGreater(predicted['velocity'][0], 0)
+
+    def test_lost_track_is_dropped(self):
+        tracker = ObstacleTracker(max_keyframe_misses=1)
+        tracker.update([detection(100, 100, 200, 200)], now=0.0)
+        tracker.update([], now=0.1)
+        self.assertEqual(len(tracker.tracks), 1)
+        tracker.update([], now=0.2)
+        self.assertEqual(tracker.tracks, [])
+
+    def test_interval_grows_for_static_scene_and_resets_on_change(self):
+        tracker = ObstacleTracker(min_interval=1, max_interval=4)
+        now = 0.0
+        for _ in range(10):
+            if tracker.needs_detection():
+                tracker.update([detection(100, 100, 200, 200)], now=now)
+            else:
+                tracker.predict(now=now)
+            now += 0.05
+        self.assertEqual(tracker.interval, 4)
+
+        tracker.update([detection(100, 100, 200, 200), detection(400, 100, 500, 200)], now=now)
+        self.assertEqual(tracker.interval, 2)
+
+    def test_time_to_collision_from_distance(self):
+        tracker = ObstacleTracker()
+        obstacles = tracker.update([detection(100, 100, 200, 200)], now=0.0)
+        obstacles[0]['distance'] = 10.0
+        tracker.observe_distances(obstacles, now=0.0)
+        obstacles = tracker.predict(now=1.0)
+        obstacles[0]['distance'] = 8.0
+        tracker.observe_distances(obstacles, now=1.0)
+        # Closing at 1 m/s after smoothing, 8 m away
+        self.assertAlmostEqual(obstacles[0]['ttc'], 8.0, places=5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+
+from edison.helpers.data_communication import AckFrame, SensorFrame, StatusFrame, ResponsePacketParser
+
+START = 0x02
+
+
+def frame(frame_type, payload, checksum=None):
+    data = bytes([START, frame_type, len(payload)]) + bytes(payload)
+    return data + bytes([sum(data) & 0xFF if checksum is None else checksum])
+
+
+class TestResponsePacketParser(unittest.TestCase):
+    """Test suite for the incremental Arduino response parser."""
+
+    def setUp(self):
+        self.parser = ResponsePacketParser(start_byte=START)
+
+    def test_frames_split_across_reads(self):
+        data = frame(0x01, [42]) + frame(0x02, [120, 90, 1]) + frame(0x03, [5, 0xFF, 0x38])
+        frames = []
+        for i in range(0, len(data), 3):
+            frames += self.parser.feed(data[i:i + 3])
+        self.assertEqual(frames, [AckFrame(42), StatusFrame(120, 90, 1), SensorFrame(5, -200)])
+        self.assertEqual(len(self.parser.buffer), 0)
+
+    def test_resynchronizes_after_garbage_and_bad_checksums(self):
+        data = b'\x00\x02\x7f' + frame(0x01, [1], checksum=0) + frame(0x01, [2])
+        self.assertEqual(self.parser.feed(data), [AckFrame(2)])
+        self.assertEqual(self.parser.checksum_errors, 1)
+        self.assertGreater(self.parser.bytes_discarded, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import sys
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from edison.helpers.resource_plan import (
+    apply_library_threads, configure_thread, pin_current_thread, pinned_as, raise_thread_priority
+)
+
+
+def make_plan(**overrides):
+    plan = {
+        'enabled': True,
+        'torch_intra_op_threads': 3,
+        'torch_inter_op_threads': 1,
+        'opencv_threads': 2,
+        'cores': {},
+        'priorities': {}
+    }
+    plan.update(overrides)
+    return plan
+
+
+def run_in_thread(target):
+    """Run `target` on a new thread so affinity changes never leak into the test runner."""
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(value=target()))
+    thread.start()
+    thread.join()
+    return result['value']
+
+
+class TestResourcePlan(unittest.TestCase):
+    """Test suite for thread pool sizing and core pinning from an explicit plan."""
+
+    def test_library_threads_follow_the_plan(self):
+        calls = []
+        torch = SimpleNamespace(set_num_threads=lambda n: calls.append(('intra', n)),
+                                set_num_interop_threads=lambda n: calls.append(('inter', n)))
+        cv2 = SimpleNamespace(setNumThreads=lambda n: calls.append(('opencv', n)))
+        with mock.patch.dict(sys.modules, {'torch': torch, 'cv2': cv2}):
+            applied = apply_library_threads(make_plan())
+        self.assertEqual(applied, {'torch_intra_op': 3, 'torch_inter_op': 1, 'opencv': 2})
+        self.assertEqual(calls, [('intra', 3), ('inter', 1), ('opencv', 2)])
+
+    def test_disabled_plan_changes_nothing(self):
+        plan = make_plan(enabled=False, cores={'inference': [0]}, priorities={'control': {'nice': 5}})
+        self.assertEqual(apply_library_threads(plan), {})
+        self.assertIsNone(pin_current_thread('inference', plan))
+        self.assertIsNone(raise_thread_priority('control', plan))
+
+    @unittest.skipUnless(hasattr(os, 'sched_setaffinity'), "needs sched_setaffinity")
+    def test_pins_to_the_available_cores_of_the_role(self):
+        core = min(os.sched_getaffinity(0))
+        plan = make_plan(cores={'inference': [core, 4096]})
+
+        def pin():
+            return pin_current_thread('inference', plan), os.sched_getaffinity(0)
+
+        cores, affinity = run_in_thread(pin)
+        # Cores the machine does not have are left out
+        self.assertEqual(cores, [core])
+        self.assertEqual(affinity, {core})
+
+    @unittest.skipUnless(hasattr(os, 'sched_setaffinity'), "needs sched_setaffinity")
+    def test_role_without_available_cores_is_not_pinned(self):
+        plan = make_plan(cores={'inference': [4096]})
+        self.assertIsNone(run_in_thread(lambda: pin_current_thread('control', plan)))
+        self.assertIsNone(run_in_thread(lambda: pin_current_thread('inference', plan)))
+
+    @unittest.skipUnless(hasattr(os, 'sched_setaffinity'), "needs sched_setaffinity")
+    def test_pinned_block_restores_the_callers_affinity(self):
+        core = min(os.sched_getaffinity(0))
+        plan = make_plan(cores={'inference': [core]})
+
+        def warm_up():
+            before = os.sched_getaffinity(0)
+            with pinned_as('inference', plan) as cores:
+                inside = os.sched_getaffinity(0)
+                # Threads started in the block, like torch workers, keep the role's cores
+                started = run_in_thread(lambda: os.sched_getaffinity(0))
+            return before, cores, inside, started, os.sched_getaffinity(0)
+
+        before, cores, inside, started, after = run_in_thread(warm_up)
+        self.assertEqual(cores, [core])
+        self.assertEqual(inside, {core})
+        self.assertEqual(started, {core})
+        self.assertEqual(after, before)
+
+    def test_unknown_role_is_rejected(self):
+        with self.assertRaises(ValueError):
+            configure_thread('display', make_plan())
+
+
+if __name__ == "__main__":
+    unittest.main()
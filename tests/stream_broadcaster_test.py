@@ -0,0 +1,59 @@
+import time
+import threading
+import unittest
+
+from edison.components.streaming_server.broadcaster import FrameBroadcaster
+
+
+def wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return predicate()
+
+
+class TestFrameBroadcaster(unittest.TestCase):
+    """Test suite for the encode-once stream broadcaster."""
+
+    def setUp(self):
+        self.encodes = []
+        self.broadcaster = FrameBroadcaster(lambda frame, timestamp: self.encodes.append(frame) or f"jpeg{frame}".encode())
+
+    def tearDown(self):
+        self.broadcaster.stop()
+
+    def test_nothing_is_encoded_without_subscribers(self):
+        for i in range(5):
+            self.broadcaster.publish(i)
+        time.sleep(0.05)
+        self.assertEqual(self.encodes, [])
+        self.assertIsNone(self.broadcaster.latest())
+
+    def test_clients_share_one_encode_per_frame(self):
+        self.broadcaster.subscribe()
+        self.broadcaster.subscribe()
+        seq = self.broadcaster.publish(7)
+        self.assertTrue(wait_until(lambda: self.broadcaster.latest() is not None))
+
+        # Both clients read the same buffer and neither consumes it
+        first, second = self.broadcaster.latest(), self.broadcaster.latest()
+        self.assertIs(first, second)
+        self.assertEqual((first.seq, first.data), (seq, b"jpeg7"))
+        self.assertEqual(self.encodes, [7])
+
+    def test_waiting_client_wakes_on_the_next_frame(self):
+        self.broadcaster.subscribe()
+        received = []
+        waiter = threading.Thread(target=lambda: received.append(self.broadcaster.wait_newer(0, timeout=2.0)))
+        waiter.start()
+        time.sleep(0.05)
+        seq = self.broadcaster.publish(3, timestamp=12.5)
+        waiter.join(timeout=2.0)
+        self.assertEqual((received[0].seq, received[0].timestamp), (seq, 12.5))
+
+        # Nothing newer than what the client already has: the keepalive timeout expires
+        self.assertIsNone(self.broadcaster.wait_newer(seq, timeout=0.05))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import json
+import unittest
+import numpy as np
+
+from edison.components.streaming_server.streamer import StreamManager
+
+
+def parse_event(data):
+    fields = dict(line.split(': ', 1) for line in data.decode().strip().split('\n'))
+    return int(fields['id']), fields['event'], json.loads(fields['data'])
+
+
+class TestStreamTelemetry(unittest.TestCase):
+    """Test suite for the /telemetry server-sent event stream."""
+
+    def setUp(self):
+        self.stream = StreamManager()
+        self.stream.telemetry.subscribe()
+        self.last_seq = 0
+
+    def tearDown(self):
+        self.stream.stop()
+
+    def next_event(self):
+        encoded = self.stream.telemetry.wait_newer(self.last_seq, timeout=2.0)
+        self.assertIsNotNone(encoded)
+        self.last_seq = encoded.seq
+        return parse_event(encoded.data)
+
+    def test_encode_event_converts_numpy_values(self):
+        data = StreamManager._encode_event({'seq': 7, 'distance': np.float32(2.5), 'box': np.arange(2)}, 123.0)
+        self.assertTrue(data.endswith(b'\n\n'))
+        self.assertEqual(parse_event(data), (7, 'telemetry', {'seq': 7, 'distance': 2.5, 'box': [0, 1],
+                                                              'timestamp': 123.0}))
+
+    def test_infinite_values_are_sent_as_null(self):
+        state = {'seq': 1, 'obstacles': [{'ttc': float('inf'), 'distance': np.float32(np.nan)}]}
+        _, _, data = parse_event(StreamManager._encode_event(state, 5.0))
+        self.assertEqual(data['obstacles'], [{'ttc': None, 'distance': None}])
+
+    def test_event_id_is_the_frame_sequence_number(self):
+        frame = np.zeros((4, 4, 3), dtype=np.uint8)
+        self.stream.update_frame(frame, timestamp=10.0)
+        seq = self.stream.update_frame(frame, timestamp=11.0)
+
+        self.stream.update_telemetry(obstacles=[{'distance': 3.0}])
+        event_id, _, data = self.next_event()
+        self.assertEqual(event_id, seq)
+        self.assertEqual(data['timestamp'], 11.0)
+
+        # Fields describing an older frame keep that frame's id and publish time
+        self.stream.update_telemetry(seq - 1, lanes={'center': 0.1})
+        event_id, _, data = self.next_event()
+        self.assertEqual(event_id, seq - 1)
+        self.assertEqual(data['timestamp'], 10.0)
+
+    def test_fields_keep_their_last_value(self):
+        self.stream.update_telemetry(obstacles=[], lanes={'center': 0.0})
+        self.next_event()
+        self.stream.update_telemetry(speed=120, direction=90)
+        _, _, data = self.next_event()
+        self.assertEqual(data['speed'], 120)
+        self.assertEqual(data['lanes'], {'center': 0.0})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import time
+import threading
+import unittest
+import numpy as np
+
+from edison.components.vision_processor.pipeline import DropQueue, VisionPipeline
+
+
+class FakeCapture:
+    """Capture stand-in that yields an increasing frame counter."""
+
+    def __init__(self, frames=50):
+        self.remaining = frames
+        self.counter = 0
+
+    def isOpened(self):
+        return self.remaining > 0
+
+    def read(self, image=None):
+        self.remaining -= 1
+        self.counter += 1
+        time.sleep(0.001)
+        if image is None:
+            image = np.empty((4, 4, 3), dtype=np.uint8)
+        image[:] = self.counter % 256
+        return True, image
+
+
+class SlowProcessor:
+    """Processor stand-in whose inference is slower than capture."""
+
+    def __init__(self, frames=50):
+        self.cap = FakeCapture(frames)
+
+    def analyze_frame(self, frame):
+        time.sleep(0.01)
+        return frame, [{'frame': frame}], {}
+
+    def render_overlay(self, frame, obstacles, lanes, pool):
+        out = pool.acquire(frame.shape, frame.dtype)
+        out[:] = frame
+        return out
+
+
+class TestDropQueue(unittest.TestCase):
+    """Test suite for the DropQueue hand-off."""
+
+    def test_drops_oldest_when_full(self):
+        queue = DropQueue(maxsize=2)
+        for i in range(5):
+            queue.put(i)
+        self.assertEqual(queue.dropped, 3)
+        self.assertEqual(queue.get(timeout=0), 3)
+        self.assertEqual(queue.get(timeout=0), 4)
+
+    def test_get_times_out(self):
+        self.assertIsNone(DropQueue().get(timeout=0.01))
+
+    def test_close_wakes_consumer(self):
+        queue = DropQueue()
+        results = []
+        consumer = threading.Thread(target=lambda: results.append(queue.get(timeout=5)))
+        consumer.start()
+        queue.close()
+        consumer.join(1)
+        self.assertFalse(consumer.is_alive())
+        self.assertEqual(results, [None])
+
+
+class TestVisionPipeline(unittest.TestCase):
+    """Test suite for the capture/inference/post pipeline."""
+
+    def test_slow_inference_drops_stale_frames(self):
+        completed = []
+        pipeline = VisionPipeline(SlowProcessor(frames=50), on_result=completed.append)
+        pipeline.start()
+        deadline = time.monotonic() + 5
+        while pipeline.running and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.05)
+        pipeline.stop()
+
+        stats = pipeline.stats()
+        self.assertEqual(stats["captured"], 50)
+        self.assertGreater(stats["dropped_before_inference"], 0)
+        self.assertLess(len(completed), 50)
+        # Results come out in capture order and never go backwards
+        seqs = [result.seq for result in completed]
+        self.assertEqual(seqs, sorted(seqs))
+        self.assertTrue(all(result.latency >= 0 for result in completed))
+        # Dropped frames go back to the pool, so capture mostly reads into recycled buffers
+        self.assertGreater(pipeline.buffers.reuses, 0)
+        self.assertLess(pipeline.buffers.allocations, stats["captured"])
+
+
+if __name__ == "__main__":
+    unittest.main()